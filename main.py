@@ -5,6 +5,10 @@ Executive Assistant with Calendar Management, Email Management, Weather, and Str
 CLEANED: OAuth2 authentication only, ALL functions preserved, ORIGINAL variable names kept
 """
 
+import time
+_import_started = time.perf_counter()
+
+import sys
 import pytz
 import discord
 from discord.ext import commands
@@ -12,30 +16,139 @@ import os
 import asyncio
 import aiohttp
 import json
-import time
+import hashlib
+import sqlite3
+import threading
+import functools
+import contextlib
+import concurrent.futures
+import importlib
+import subprocess
 import re
+import difflib
+import unicodedata
 import base64
+import codecs
+import shutil
+import tempfile
 import email
-import requests
+import email.policy
+from email.message import EmailMessage
+from email.parser import BytesHeaderParser
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.utils import parsedate_to_datetime
+from email.utils import getaddresses, parsedate_to_datetime, parseaddr
+from html.parser import HTMLParser
 from dotenv import load_dotenv
-from openai import OpenAI
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials as OAuthCredentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import traceback
 import random
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, namedtuple
+from types import MappingProxyType
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.events import EVENT_JOB_EXECUTED
+
+# ============================================================================
+# LAZY IMPORTS & IMPORT-TIME AUDIT
+# ============================================================================
+
+class LazyModule:
+    """Module stand-in that imports the real module on first attribute access"""
+    
+    _lock = threading.Lock()
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            # Startup phases touch these from worker threads - import exactly once
+            with LazyModule._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+class LazyObject:
+    """Builds an object with factory() on first attribute access, then delegates to it"""
+    
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, attr):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return getattr(self._instance, attr)
+
+@functools.lru_cache(maxsize=None)
+def optional_import(name):
+    """Import an optional dependency once; None when it isn't installed"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+# Not needed for the gateway connection - loaded by the startup phases or first use
+openai_sdk = LazyModule('openai')
+google_discovery = LazyModule('googleapiclient.discovery')
+google_discovery_cache = LazyModule('googleapiclient.discovery_cache')
+google_http = LazyModule('googleapiclient.http')
+google_oauth_credentials = LazyModule('google.oauth2.credentials')
+google_auth_requests = LazyModule('google.auth.transport.requests')
+requests = LazyModule('requests')
+apscheduler_sqlalchemy = LazyModule('apscheduler.jobstores.sqlalchemy')
+
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+def run_import_audit(top=20):
+    """Re-import this module under -X importtime and print where startup time goes"""
+    module_dir, module_file = os.path.split(os.path.abspath(__file__))
+    # The import validates these and exits without them; placeholders are enough to time it
+    env = dict(os.environ)
+    for name in ('DISCORD_TOKEN', 'OPENAI_API_KEY', 'ROSE_ASSISTANT_ID'):
+        env.setdefault(name, 'import-audit')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {os.path.splitext(module_file)[0]}'],
+        cwd=module_dir, capture_output=True, text=True, env=env
+    )
+    
+    timings = []
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        # Only this module's direct imports - deeper ones are inside their parent's cumulative time
+        if depth == 1:
+            timings.append((int(cumulative_us), int(self_us), name.strip()))
+        elif depth == 0 and name.strip() == os.path.splitext(module_file)[0]:
+            total = int(cumulative_us)
+    
+    print(f"📦 Import-time audit: {len(timings)} direct imports, {total / 1e6:.2f}s total")
+    for cumulative, self_time, name in sorted(timings, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  (self {self_time / 1000:6.1f} ms)  {name}")
+    print(f"⏱️ Budget: {IMPORT_TIME_BUDGET_SECONDS:.2f}s")
 
 # Load environment variables
 load_dotenv()
 
+# Module imports above this line should fit in this budget on the production worker
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv('IMPORT_TIME_BUDGET_SECONDS', '1.5'))
+
+if '--import-audit' in sys.argv:
+    run_import_audit()
+    sys.exit(0)
+
+if IMPORT_SECONDS > IMPORT_TIME_BUDGET_SECONDS:
+    print(f"⚠️ Module imports took {IMPORT_SECONDS:.2f}s (budget {IMPORT_TIME_BUDGET_SECONDS:.2f}s) - run: python main.py --import-audit")
+
 # ============================================================================
 # ROSE CONFIGURATION (ORIGINAL VARIABLE NAMES PRESERVED)
 # ============================================================================
@@ -126,6 +239,10 @@ GMAIL_OAUTH_JSON = os.getenv('GMAIL_OAUTH_JSON')
 GMAIL_TOKEN_JSON = os.getenv('GMAIL_TOKEN_JSON')
 GMAIL_TOKEN_FILE = os.getenv('GMAIL_TOKEN_FILE', 'gmail_token.json')
 
+# Scheduler persistence - jobs and their last successful runs survive restarts
+SCHEDULER_DB_PATH = os.getenv('SCHEDULER_DB_PATH', 'rose_scheduler.sqlite')
+BRIEFING_MISFIRE_GRACE_SECONDS = int(os.getenv('BRIEFING_MISFIRE_GRACE_SECONDS', '1800'))
+
 # Calendar IDs (ORIGINAL NAMES)
 GOOGLE_CALENDAR_ID = os.getenv('GOOGLE_CALENDAR_ID')
 GOOGLE_TASKS_CALENDAR_ID = os.getenv('GOOGLE_TASKS_CALENDAR_ID')
@@ -163,11 +280,20 @@ try:
     intents.message_content = True
     bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
     
-    # Scheduler for automated tasks
-    scheduler = AsyncIOScheduler(timezone=pytz.timezone('America/Toronto'))
+    # Scheduler for automated tasks - persistent store so a restart at 7:14 still
+    # delivers the 7:15 briefing once (coalesced) when the bot comes back
+    # (its SQLite job store is attached in start_briefing_scheduler, after the gateway connects)
+    scheduler = AsyncIOScheduler(
+        job_defaults={
+            'coalesce': True,
+            'max_instances': 1,
+            'misfire_grace_time': BRIEFING_MISFIRE_GRACE_SECONDS
+        },
+        timezone=pytz.timezone('America/Toronto')
+    )
     
-    # OpenAI client
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    # OpenAI client - built on first use; the SDK alone costs ~0.5s to import
+    client = LazyObject(lambda: openai_sdk.OpenAI(api_key=OPENAI_API_KEY))
     
     # Conversation tracking (ORIGINAL VARIABLE NAMES)
     active_runs = {}
@@ -189,59 +315,283 @@ except Exception as e:
 # GOOGLE SERVICES - OAUTH2 ONLY (BUT ORIGINAL VARIABLE NAMES)
 # ============================================================================
 
+# Worker threads for blocking Google API calls - each ends up with its own clients
+GOOGLE_API_POOL_SIZE = int(os.getenv('GOOGLE_API_POOL_SIZE', '4'))
+GOOGLE_HTTP_TIMEOUT_SECONDS = int(os.getenv('GOOGLE_HTTP_TIMEOUT_SECONDS', '30'))
+google_api_executor = concurrent.futures.ThreadPoolExecutor(max_workers=GOOGLE_API_POOL_SIZE, thread_name_prefix='google-api')
+
+google_auth_httplib2 = LazyModule('google_auth_httplib2')
+httplib2 = LazyModule('httplib2')
+
+class GoogleServicePool:
+    """One Google API client per thread, each on its own keep-alive connection
+    
+    httplib2.Http is not thread-safe, so a single build() object can't be shared
+    by worker threads. Every thread gets its own client (built from a discovery
+    document parsed once), all authorized by the shared oauth_credentials.
+    Attribute access goes to the calling thread's client, so existing
+    gmail_service.users()... code works unchanged; it is falsy until connected.
+    """
+    
+    def __init__(self, api, version):
+        self.api = api
+        self.version = version
+        self._document = None
+        self._generation = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def connect(self):
+        """Load the bundled discovery document and invalidate every thread's client"""
+        document = json.loads(google_discovery_cache.get_static_doc(self.api, self.version))
+        with self._lock:
+            self._document = document
+            self._generation += 1
+        # Build the calling thread's client now so a bad document fails here, not mid-briefing
+        return self.client()
+    
+    def disconnect(self):
+        """Mark the service unavailable; threads drop their clients on next use"""
+        with self._lock:
+            self._document = None
+            self._generation += 1
+    
+    def client(self):
+        """This thread's client, built on first use or after a reconnect"""
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            if self._document is None:
+                raise RuntimeError(f"Google {self.api} service is not connected")
+            http = google_auth_httplib2.AuthorizedHttp(
+                oauth_credentials, http=httplib2.Http(timeout=GOOGLE_HTTP_TIMEOUT_SECONDS)
+            )
+            local.service = google_discovery.build_from_document(self._document, http=http)
+            local.generation = self._generation
+        return local.service
+    
+    def __getattr__(self, name):
+        return getattr(self.client(), name)
+    
+    def __bool__(self):
+        return self._document is not None
+
+def run_google_call(func, *args, **kwargs):
+    """Run a blocking Google helper on the Google API pool; returns an awaitable"""
+    return asyncio.get_running_loop().run_in_executor(
+        google_api_executor, functools.partial(func, *args, **kwargs)
+    )
+
 # Google services (ORIGINAL VARIABLE NAMES)
-calendar_service = None
-gmail_service = None
+calendar_service = GoogleServicePool('calendar', 'v3')
+gmail_service = GoogleServicePool('gmail', 'v1')
 accessible_calendars = []
 
+# Degraded-mode flags - the bot answers Discord before these services are up.
+# Each is 'starting', 'ready' or 'unavailable'
+service_readiness = {
+    'google': 'starting',
+    'calendars': 'starting',
+    'weather': 'starting' if WEATHER_API_KEY else 'unavailable',
+    'openai': 'starting'
+}
+
+# ============================================================================
+# OAUTH CREDENTIAL MANAGER (ONE SHARED CREDENTIAL, REFRESHED AHEAD OF EXPIRY)
+# ============================================================================
+
+# Refresh this long before expiry - comfortably ahead of google-auth's own
+# refresh-on-request threshold, so no API call ever waits on the token endpoint
+OAUTH_REFRESH_MARGIN_SECONDS = int(os.getenv('OAUTH_REFRESH_MARGIN_SECONDS', '600'))
+
+# The one credential object every Google client authorizes with
+oauth_credentials = None
+oauth_refresh_lock = threading.Lock()
+oauth_refresh_task = None
+
+# reauthorize_oauth.py replaces GMAIL_TOKEN_FILE atomically; a running bot polls
+# its mtime and swaps the new token in without a restart
+OAUTH_TOKEN_WATCH_SECONDS = int(os.getenv('OAUTH_TOKEN_WATCH_SECONDS', '10'))
+oauth_token_file_mtime = None
+oauth_token_watch_task = None
+
+def _token_file_mtime():
+    try:
+        return os.path.getmtime(GMAIL_TOKEN_FILE)
+    except OSError:
+        return None
+
+def load_oauth_token_info():
+    """Newest token first: GMAIL_TOKEN_FILE (kept current by refreshes), then GMAIL_TOKEN_JSON"""
+    global oauth_token_file_mtime
+    if os.path.exists(GMAIL_TOKEN_FILE):
+        try:
+            oauth_token_file_mtime = _token_file_mtime()
+            with open(GMAIL_TOKEN_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f), GMAIL_TOKEN_FILE
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Could not read {GMAIL_TOKEN_FILE}: {e} - falling back to GMAIL_TOKEN_JSON")
+    
+    if GMAIL_TOKEN_JSON:
+        return json.loads(GMAIL_TOKEN_JSON), 'GMAIL_TOKEN_JSON'
+    return None, None
+
+def persist_oauth_credentials(credentials):
+    """Write the token to GMAIL_TOKEN_FILE atomically - a crash never leaves half a token"""
+    global oauth_token_file_mtime
+    token_dir = os.path.dirname(os.path.abspath(GMAIL_TOKEN_FILE))
+    temp_path = os.path.join(token_dir, f".{os.path.basename(GMAIL_TOKEN_FILE)}.{os.getpid()}.tmp")
+    try:
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(credentials.to_json())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, GMAIL_TOKEN_FILE)
+        # Our own write - not a new token for the watcher to reload
+        oauth_token_file_mtime = _token_file_mtime()
+        return True
+    except OSError as e:
+        print(f"⚠️ Could not persist OAuth token to {GMAIL_TOKEN_FILE}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+def oauth_seconds_until_refresh(credentials=None):
+    """Seconds until a credential (default: the shared one) is due for its proactive refresh"""
+    credentials = credentials or oauth_credentials
+    if not credentials or not credentials.expiry:
+        return None
+    # google-auth keeps expiry as naive UTC
+    remaining = (credentials.expiry - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()
+    return remaining - OAUTH_REFRESH_MARGIN_SECONDS
+
+def refresh_oauth_credentials(force=False):
+    """Refresh the shared credential in place if it is due (or forced), then persist it"""
+    with oauth_refresh_lock:
+        if not oauth_credentials or not oauth_credentials.refresh_token:
+            return False
+        
+        due_in = oauth_seconds_until_refresh()
+        if not force and oauth_credentials.valid and due_in is not None and due_in > 0:
+            return True
+        
+        print("🔄 Refreshing OAuth token...")
+        oauth_credentials.refresh(google_auth_requests.Request())
+        persist_oauth_credentials(oauth_credentials)
+        print(f"✅ OAuth token refreshed (valid until {oauth_credentials.expiry:%H:%M} UTC)")
+        return True
+
+async def oauth_refresh_loop():
+    """Background task - keep the shared credential ahead of expiry for the life of the bot"""
+    failures = 0
+    while True:
+        due_in = oauth_seconds_until_refresh()
+        if failures:
+            delay = min(60 * 2 ** (failures - 1), 900)
+        elif due_in is None:
+            delay = 3600
+        else:
+            delay = min(max(due_in, 0), 3600)
+        await asyncio.sleep(delay)
+        
+        try:
+            await asyncio.to_thread(refresh_oauth_credentials)
+            failures = 0
+        except Exception as e:
+            failures += 1
+            print(f"❌ Background OAuth refresh failed (attempt {failures}): {e}")
+            if failures >= 3:
+                print("⚠️ Please re-authorize: python3 reauthorize_oauth.py")
+
+def start_oauth_refresh_loop():
+    """Start the background refresher once (called from the Google startup phase)"""
+    global oauth_refresh_task
+    if oauth_refresh_task is None or oauth_refresh_task.done():
+        oauth_refresh_task = asyncio.create_task(oauth_refresh_loop())
+
+async def oauth_token_watch_loop():
+    """Background task - reload Google services when a new token file lands"""
+    global oauth_token_file_mtime
+    while True:
+        await asyncio.sleep(OAUTH_TOKEN_WATCH_SECONDS)
+        mtime = _token_file_mtime()
+        if mtime is None or mtime == oauth_token_file_mtime:
+            continue
+        
+        # Remember it even if the reload fails - a bad file is retried only when replaced again
+        oauth_token_file_mtime = mtime
+        print(f"🔄 {GMAIL_TOKEN_FILE} changed - reloading OAuth token")
+        try:
+            await start_google_services()
+        except Exception as e:
+            print(f"❌ OAuth token reload failed: {e}")
+
+def start_oauth_token_watch():
+    """Start the token file watcher once"""
+    global oauth_token_watch_task
+    if oauth_token_watch_task is None or oauth_token_watch_task.done():
+        oauth_token_watch_task = asyncio.create_task(oauth_token_watch_loop())
+
 def initialize_google_services():
     """Initialize Google services using OAuth2 credentials ONLY"""
-    global calendar_service, gmail_service, accessible_calendars
+    global oauth_credentials
     
     print("🔧 Initializing Google services with OAuth2...")
     
-    if not GMAIL_TOKEN_JSON:
-        print("❌ No OAuth token found - Google services disabled")
-        print("   Run: python3 reauthorize_oauth.py")
-        return False
-    
     try:
         # Parse OAuth token
-        token_info = json.loads(GMAIL_TOKEN_JSON)
+        token_info, token_source = load_oauth_token_info()
+        if not token_info:
+            print("❌ No OAuth token found - Google services disabled")
+            print("   Run: python3 reauthorize_oauth.py")
+            return False
         
         # Create OAuth credentials (using ORIGINAL scope variable name)
-        oauth_credentials = OAuthCredentials.from_authorized_user_info(
+        credentials = google_oauth_credentials.Credentials.from_authorized_user_info(
             token_info, GMAIL_SCOPES
         )
+        print(f"🔑 OAuth token loaded from {token_source}")
         
-        if not oauth_credentials:
+        if not credentials:
             print("❌ Failed to create OAuth credentials")
             return False
         
-        # Handle token refresh if needed
-        if oauth_credentials.expired and oauth_credentials.refresh_token:
+        missing_scopes = [scope for scope in GMAIL_SCOPES if scope not in (token_info.get('scopes') or GMAIL_SCOPES)]
+        if missing_scopes:
+            print(f"⚠️ OAuth token is missing scopes: {', '.join(missing_scopes)}")
+        
+        # Refresh now if expired or about to be - the background loop takes over from here
+        due_in = oauth_seconds_until_refresh(credentials)
+        if credentials.refresh_token and (not credentials.valid or (due_in is not None and due_in <= 0)):
             try:
                 print("🔄 Refreshing OAuth token...")
-                oauth_credentials.refresh(Request())
+                credentials.refresh(google_auth_requests.Request())
+                persist_oauth_credentials(credentials)
                 print("✅ OAuth token refreshed successfully")
             except Exception as refresh_error:
                 print(f"❌ Token refresh failed: {refresh_error}")
-                print("⚠️ Please re-authorize: python3 reauthorize_oauth.py")
-                return False
+                # A token that is merely close to expiry still works; the loop retries
+                if not credentials.valid:
+                    print("⚠️ Please re-authorize: python3 reauthorize_oauth.py")
+                    return False
         
-        if not oauth_credentials.valid:
+        if not credentials.valid:
             print("❌ OAuth credentials are invalid")
             print("⚠️ Please re-authorize: python3 reauthorize_oauth.py")
             return False
         
-        # Initialize both services with same OAuth credentials
-        gmail_service = build('gmail', 'v1', credentials=oauth_credentials)
-        calendar_service = build('calendar', 'v3', credentials=oauth_credentials)
+        # Only a working token replaces the shared one (this also runs on hot reload)
+        with oauth_refresh_lock:
+            oauth_credentials = credentials
         
-        print("✅ OAuth Gmail and Calendar services initialized")
+        # Initialize both services with same OAuth credentials, from the discovery
+        # documents bundled with googleapiclient - no network round trip per client
+        gmail_service.connect()
+        calendar_service.connect()
         
-        # Test calendar access
-        test_calendar_access()
+        print("✅ OAuth Gmail and Calendar services initialized")
         
         return True
         
@@ -253,7 +603,7 @@ def initialize_google_services():
         return False
 
 def test_calendar_access():
-    """Test access to all configured calendars"""
+    """Test access to all configured calendars in one batched request"""
     global accessible_calendars
     
     if not calendar_service:
@@ -266,29 +616,46 @@ def test_calendar_access():
         ('💼 BG Work', GMAIL_WORK_CALENDAR_ID)
     ]
     
-    accessible_calendars = []
+    probe_errors = {}
+    
+    def record_probe(request_id, response, exception):
+        if exception is not None:
+            probe_errors[request_id] = exception
     
+    batch = calendar_service.new_batch_http_request(callback=record_probe)
+    probed = []
     for calendar_name, calendar_id in calendars_to_test:
         if not calendar_id:
             print(f"⚠️ {calendar_name}: No calendar ID configured")
             continue
-            
+        batch.add(calendar_service.calendars().get(calendarId=calendar_id, fields='id'), request_id=str(len(probed)))
+        probed.append((calendar_name, calendar_id))
+    
+    if probed:
         try:
-            # Test calendar access
-            calendar_info = calendar_service.calendars().get(calendarId=calendar_id).execute()
-            accessible_calendars.append((calendar_name, calendar_id))
+            batch.execute()
+        except Exception as e:
+            print(f"❌ Calendar access probe failed: {e}")
+            probe_errors = {str(index): e for index in range(len(probed))}
+    
+    # Rebuilt in configured order, then swapped in so readers never see a partial list
+    calendars = []
+    for index, (calendar_name, calendar_id) in enumerate(probed):
+        error = probe_errors.get(str(index))
+        if error is None:
+            calendars.append((calendar_name, calendar_id))
             print(f"✅ {calendar_name} accessible: {calendar_name}")
-            
-        except HttpError as e:
-            if e.resp.status == 404:
+        elif isinstance(error, HttpError):
+            if error.resp.status == 404:
                 print(f"❌ {calendar_name}: Calendar not found (404)")
-            elif e.resp.status == 403:
+            elif error.resp.status == 403:
                 print(f"❌ {calendar_name}: Access forbidden (403)")
             else:
-                print(f"❌ {calendar_name}: HTTP error {e.resp.status}")
-        except Exception as e:
-            print(f"❌ {calendar_name}: Error testing access - {e}")
+                print(f"❌ {calendar_name}: HTTP error {error.resp.status}")
+        else:
+            print(f"❌ {calendar_name}: Error testing access - {error}")
     
+    accessible_calendars = calendars
     print(f"📅 Total accessible calendars: {len(accessible_calendars)}")
 
 # ============================================================================
@@ -441,6 +808,150 @@ def get_weather_data():
         print(f"❌ Weather data error: {e}")
         return None
 
+# ============================================================================
+# STRUCTURED RECORDS & RENDERERS
+# ============================================================================
+
+# Helpers fetch these once; the renderers below turn the same records into Discord
+# text, embeds or tool output without refetching or re-parsing strings
+
+class CalendarEvent:
+    """One calendar entry; start is an aware datetime, or None for all-day/undated events"""
+    __slots__ = ('summary', 'start', 'date', 'calendar_name')
+    
+    def __init__(self, summary, start, date, calendar_name=''):
+        self.summary = summary
+        self.start = start
+        self.date = date
+        self.calendar_name = calendar_name
+    
+    @classmethod
+    def from_api(cls, event, calendar_name='', default_summary='Untitled Event'):
+        start = event.get('start', {})
+        if 'dateTime' in start:
+            start_dt = datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00')).astimezone(pytz.timezone('America/Toronto'))
+            return cls(event.get('summary', default_summary), start_dt, start_dt.strftime('%Y-%m-%d'), calendar_name)
+        return cls(event.get('summary', default_summary), None, start.get('date'), calendar_name)
+    
+    @property
+    def time_str(self):
+        if self.start:
+            return self.start.strftime('%-I:%M %p')
+        return 'All day' if self.date else 'Time TBD'
+
+class MailItem:
+    """One email as listed in previews; body is None unless it was asked for"""
+    __slots__ = ('id', 'subject', 'sender', 'date', 'body')
+    
+    def __init__(self, id, subject, sender, date, body=None):
+        self.id = id
+        self.subject = subject
+        self.sender = sender
+        self.date = date
+        self.body = body
+    
+    @classmethod
+    def from_api(cls, message, body=None):
+        headers = message['payload'].get('headers', [])
+        return cls(
+            message['id'],
+            next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject'),
+            next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown Sender'),
+            next((h['value'] for h in headers if h['name'] == 'Date'), 'No Date'),
+            body
+        )
+    
+    @property
+    def date_str(self):
+        try:
+            return parsedate_to_datetime(self.date).strftime('%m/%d at %-I:%M %p')
+        except:
+            return self.date
+
+class MailStats:
+    """Mailbox counts over the last `days` days (Gmail's result size estimates)"""
+    __slots__ = ('days', 'total_received', 'unread', 'today')
+    
+    def __init__(self, days, total_received, unread, today):
+        self.days = days
+        self.total_received = total_received
+        self.unread = unread
+        self.today = today
+    
+    @property
+    def daily_average(self):
+        return self.total_received // self.days
+
+def render_schedule(events, title, empty_text, show_calendar=True):
+    """Schedule list as Discord text, e.g. '📅 **Personal Schedule (3 items):**'"""
+    if not events:
+        return empty_text
+    lines = []
+    for event in events:
+        calendar_note = f" ({event.calendar_name})" if show_calendar else ""
+        lines.append(f"• {event.time_str} - {event.summary}{calendar_note}")
+    return f"{title} ({len(lines)} items):**\n" + "\n".join(lines)
+
+def render_upcoming_events(events, days):
+    """Events grouped under a heading per day"""
+    if not events:
+        return f"📅 **Upcoming Events ({days} days):** No events scheduled."
+    
+    events_by_date = defaultdict(list)
+    for event in events:
+        events_by_date[event.date or 'Unknown'].append(f"  • {event.time_str} - {event.summary} ({event.calendar_name})")
+    
+    formatted_output = [f"📅 **Upcoming Events (Next {days} days):**\n"]
+    for date_key in sorted(events_by_date.keys()):
+        try:
+            date_obj = datetime.strptime(date_key, '%Y-%m-%d')
+            date_display = date_obj.strftime('%A, %B %-d')
+        except:
+            date_display = date_key
+        
+        formatted_output.append(f"**{date_display}:**")
+        formatted_output.extend(events_by_date[date_key])
+        formatted_output.append("")
+    
+    return "\n".join(formatted_output)
+
+def render_emails(items, unread_only=False):
+    """Email previews as Discord text"""
+    if not items:
+        return f"📧 No {'unread' if unread_only else 'recent'} emails found."
+    
+    email_list = []
+    for item in items:
+        email_info = f"📧 **{item.subject}**\n👤 From: {item.sender}\n📅 {item.date_str}"
+        if item.body:
+            email_info += f"\n📄 {item.body[:200]}{'...' if len(item.body) > 200 else ''}"
+        email_list.append(email_info)
+    
+    header = f"📧 **{'Unread' if unread_only else 'Recent'} Emails ({len(email_list)}):**\n\n"
+    return header + "\n\n".join(email_list)
+
+def render_email_stats(stats):
+    return f"""📊 **Email Statistics (Last {stats.days} days):**
+📥 **Total Received:** {stats.total_received:,}
+📬 **Unread:** {stats.unread:,}
+📅 **Today:** {stats.today:,}
+📈 **Daily Average:** {stats.daily_average:,}"""
+
+def render_email_counts(stats):
+    """Just the count lines, for !emailcount"""
+    return f"📥 **Total Received:** {stats.total_received:,}\n📬 **Unread:** {stats.unread:,}\n📅 **Today:** {stats.today:,}"
+
+def email_stats_embed(stats):
+    embed = discord.Embed(
+        title=f"📊 Email Statistics (Last {stats.days} days)",
+        color=ASSISTANT_CONFIG['color']
+    )
+    embed.add_field(name="📥 Received", value=f"{stats.total_received:,}", inline=True)
+    embed.add_field(name="📬 Unread", value=f"{stats.unread:,}", inline=True)
+    embed.add_field(name="📅 Today", value=f"{stats.today:,}", inline=True)
+    embed.add_field(name="📈 Daily Average", value=f"{stats.daily_average:,}", inline=True)
+    return embed
+
 # ============================================================================
 # GOOGLE CALENDAR FUNCTIONS (ALL PRESERVED)
 # ============================================================================
@@ -821,63 +1332,575 @@ def list_gcal_calendars():
         return f"❌ Error listing calendars: {str(e)}"
 
 # ============================================================================
-# GMAIL FUNCTIONS (ALL PRESERVED)
+# LOCAL MAIL INDEX (SQLITE FTS5 OVER CACHED HEADERS)
 # ============================================================================
 
-def get_recent_emails(count=10, unread_only=False, include_body=False):
-    """Get recent emails from Gmail"""
-    if not gmail_service:
-        return "❌ Gmail service not available"
+# Local copy of recent mail metadata, kept current from Gmail's history feed
+MAIL_INDEX_DB = os.getenv('MAIL_INDEX_DB', 'rose_mail_index.sqlite')
+MAIL_INDEX_SYNC_SECONDS = int(os.getenv('MAIL_INDEX_SYNC_SECONDS', '120'))
+MAIL_INDEX_MAX_STALENESS_SECONDS = int(os.getenv('MAIL_INDEX_MAX_STALENESS_SECONDS', '600'))
+MAIL_INDEX_BACKFILL_DAYS = int(os.getenv('MAIL_INDEX_BACKFILL_DAYS', '30'))
+MAIL_INDEX_BACKFILL_MAX = int(os.getenv('MAIL_INDEX_BACKFILL_MAX', '2000'))
+# Plain-text bodies make the index several times larger - off unless asked for
+MAIL_INDEX_BODIES = os.getenv('MAIL_INDEX_BODIES', 'false').lower() == 'true'
+MAIL_INDEX_BODY_CHARS = 20000
+MAIL_INDEX_FETCH_BATCH = 50
+
+mail_index_sync_lock = threading.Lock()
+mail_index_ready = None
+mail_index_task = None
+
+@contextlib.contextmanager
+def mail_index_db():
+    """Short-lived connection to the mail index (callers run on different threads)"""
+    conn = sqlite3.connect(MAIL_INDEX_DB, timeout=10)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+def init_mail_index():
+    """Create the index tables once; False when this SQLite build has no FTS5"""
+    global mail_index_ready
+    if mail_index_ready is not None:
+        return mail_index_ready
     
     try:
-        # Build query
-        query = 'is:unread' if unread_only else 'in:inbox'
-        
-        # Get message list
+        with mail_index_db() as conn:
+            # WAL lets searches read while a sync is writing
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS messages (
+                    doc_id INTEGER PRIMARY KEY,
+                    id TEXT UNIQUE NOT NULL,
+                    thread_id TEXT,
+                    internal_date INTEGER,
+                    sender TEXT,
+                    sender_address TEXT,
+                    sender_name TEXT,
+                    sender_domain TEXT,
+                    subject TEXT,
+                    snippet TEXT,
+                    date_header TEXT,
+                    labels TEXT
+                )"""
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS messages_by_date ON messages (internal_date)')
+            conn.execute('CREATE INDEX IF NOT EXISTS messages_by_sender ON messages (sender_address)')
+            conn.execute(
+                """CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                    subject, sender, snippet, body, tokenize='unicode61 remove_diacritics 2'
+                )"""
+            )
+            conn.execute('CREATE TABLE IF NOT EXISTS mail_index_state (key TEXT PRIMARY KEY, value TEXT)')
+        mail_index_ready = True
+    except sqlite3.OperationalError as e:
+        print(f"⚠️ Local mail index disabled: {e}")
+        mail_index_ready = False
+    return mail_index_ready
+
+def _mail_index_state(key):
+    with mail_index_db() as conn:
+        row = conn.execute('SELECT value FROM mail_index_state WHERE key = ?', (key,)).fetchone()
+    return row['value'] if row else None
+
+def _set_mail_index_state(conn, key, value):
+    conn.execute(
+        'INSERT INTO mail_index_state (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+        (key, str(value))
+    )
+
+def _mail_record(message):
+    """Flatten a Gmail message (metadata or full format) into an index row"""
+    headers = {h['name'].lower(): h['value'] for h in message.get('payload', {}).get('headers', [])}
+    sender = headers.get('from', '')
+    sender_name, sender_address = parseaddr(sender)
+    sender_address = sender_address.lower()
+    body = ''
+    if MAIL_INDEX_BODIES:
+        body = get_email_body(message, max_chars=MAIL_INDEX_BODY_CHARS)
+        if body in ("Body not available", "Error reading body"):
+            body = ''
+    return {
+        'id': message['id'],
+        'thread_id': message.get('threadId'),
+        'internal_date': int(message.get('internalDate', 0)),
+        'sender': sender,
+        'sender_address': sender_address,
+        'sender_name': sender_name,
+        'sender_domain': sender_address.rsplit('@', 1)[-1] if '@' in sender_address else '',
+        'subject': headers.get('subject', ''),
+        'snippet': message.get('snippet', ''),
+        'date_header': headers.get('date', ''),
+        'labels': f" {' '.join(message.get('labelIds', []))} ",
+        'body': body
+    }
+
+def _store_mail_records(conn, records):
+    """Insert or replace rows, keeping the FTS table on the same doc_id"""
+    for record in records:
+        existing = conn.execute('SELECT doc_id FROM messages WHERE id = ?', (record['id'],)).fetchone()
+        if existing:
+            doc_id = existing['doc_id']
+            conn.execute('DELETE FROM messages_fts WHERE rowid = ?', (doc_id,))
+            conn.execute(
+                """UPDATE messages SET thread_id = ?, internal_date = ?, sender = ?, sender_address = ?,
+                   sender_name = ?, sender_domain = ?, subject = ?, snippet = ?, date_header = ?, labels = ?
+                   WHERE doc_id = ?""",
+                (record['thread_id'], record['internal_date'], record['sender'], record['sender_address'],
+                 record['sender_name'], record['sender_domain'], record['subject'], record['snippet'],
+                 record['date_header'], record['labels'], doc_id)
+            )
+        else:
+            doc_id = conn.execute(
+                """INSERT INTO messages (id, thread_id, internal_date, sender, sender_address, sender_name,
+                   sender_domain, subject, snippet, date_header, labels) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (record['id'], record['thread_id'], record['internal_date'], record['sender'], record['sender_address'],
+                 record['sender_name'], record['sender_domain'], record['subject'], record['snippet'],
+                 record['date_header'], record['labels'])
+            ).lastrowid
+        conn.execute(
+            'INSERT INTO messages_fts (rowid, subject, sender, snippet, body) VALUES (?, ?, ?, ?, ?)',
+            (doc_id, record['subject'], record['sender'], record['snippet'], record['body'])
+        )
+
+def forget_indexed_messages(message_ids):
+    """Drop messages from the index right away (deletes would otherwise linger until the next sync)"""
+    if not message_ids or not mail_index_ready:
+        return
+    try:
+        with mail_index_db() as conn:
+            for message_id in message_ids:
+                row = conn.execute('SELECT doc_id FROM messages WHERE id = ?', (message_id,)).fetchone()
+                if row:
+                    conn.execute('DELETE FROM messages_fts WHERE rowid = ?', (row['doc_id'],))
+                    conn.execute('DELETE FROM messages WHERE doc_id = ?', (row['doc_id'],))
+    except sqlite3.Error as e:
+        print(f"⚠️ Mail index update failed: {e}")
+
+def _fetch_mail_records(message_ids):
+    """Fetch index rows for message IDs, MAIL_INDEX_FETCH_BATCH per batched HTTP request"""
+    records = []
+    
+    def collect(request_id, response, exception):
+        # 404s are messages deleted since they were listed - nothing to index
+        if exception is None:
+            records.append(_mail_record(response))
+    
+    if MAIL_INDEX_BODIES:
+        fetch_kwargs = {'format': 'full'}
+    else:
+        fetch_kwargs = {'format': 'metadata', 'metadataHeaders': ['From', 'Subject', 'Date']}
+    
+    for start in range(0, len(message_ids), MAIL_INDEX_FETCH_BATCH):
+        batch = gmail_service.new_batch_http_request(callback=collect)
+        for message_id in message_ids[start:start + MAIL_INDEX_FETCH_BATCH]:
+            batch.add(gmail_service.users().messages().get(userId='me', id=message_id, **fetch_kwargs))
+        batch.execute()
+    return records
+
+def _backfill_mail_index():
+    """Rebuild the index from the last MAIL_INDEX_BACKFILL_DAYS of mail"""
+    # History is read from this point on, so take it before listing
+    history_id = gmail_service.users().getProfile(userId='me', fields='historyId').execute()['historyId']
+    covered_since = int((time.time() - MAIL_INDEX_BACKFILL_DAYS * 86400) * 1000)
+    
+    message_ids = []
+    page_token = None
+    while len(message_ids) < MAIL_INDEX_BACKFILL_MAX:
         results = gmail_service.users().messages().list(
-            userId='me', 
-            q=query, 
-            maxResults=count
+            userId='me',
+            q=f'newer_than:{MAIL_INDEX_BACKFILL_DAYS}d',
+            maxResults=min(500, MAIL_INDEX_BACKFILL_MAX - len(message_ids)),
+            pageToken=page_token
         ).execute()
+        message_ids.extend(msg['id'] for msg in results.get('messages', []))
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            break
+    
+    records = _fetch_mail_records(message_ids)
+    if page_token and records:
+        # Hit the cap - the index only covers back to the oldest message we kept
+        covered_since = min(record['internal_date'] for record in records)
+    
+    with mail_index_db() as conn:
+        conn.execute('DELETE FROM messages')
+        conn.execute('DELETE FROM messages_fts')
+        _store_mail_records(conn, records)
+        _set_mail_index_state(conn, 'covered_since', covered_since)
+        _set_mail_index_state(conn, 'history_id', history_id)
+    
+    print(f"📇 Mail index rebuilt: {len(records)} messages from the last {MAIL_INDEX_BACKFILL_DAYS} days")
+    return {'added': [], 'removed': [], 'backfilled': len(records)}
+
+def _apply_mail_history(start_history_id):
+    """Apply Gmail history since start_history_id; returns the IDs added and removed"""
+    added, removed, relabeled = {}, set(), {}
+    latest_history_id = start_history_id
+    page_token = None
+    while True:
+        results = gmail_service.users().history().list(
+            userId='me',
+            startHistoryId=start_history_id,
+            historyTypes=['messageAdded', 'messageDeleted', 'labelAdded', 'labelRemoved'],
+            pageToken=page_token
+        ).execute()
+        for record in results.get('history', []):
+            for item in record.get('messagesAdded', []):
+                added[item['message']['id']] = True
+                removed.discard(item['message']['id'])
+            for item in record.get('messagesDeleted', []):
+                added.pop(item['message']['id'], None)
+                removed.add(item['message']['id'])
+            for key in ('labelsAdded', 'labelsRemoved'):
+                for item in record.get(key, []):
+                    relabeled[item['message']['id']] = item['message'].get('labelIds', [])
+        latest_history_id = results.get('historyId', latest_history_id)
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            break
+    
+    records = _fetch_mail_records(list(added))
+    with mail_index_db() as conn:
+        _store_mail_records(conn, records)
+        for message_id, label_ids in relabeled.items():
+            if message_id not in added and message_id not in removed:
+                conn.execute('UPDATE messages SET labels = ? WHERE id = ?', (f" {' '.join(label_ids)} ", message_id))
+        # New arrivals wait here for the mail rules, committed with the history position
+        # so a failed rules pass is retried rather than skipped
+        pending = set(_pending_rule_ids(conn)) | {record['id'] for record in records}
+        _set_mail_index_state(conn, 'rules_pending', json.dumps(sorted(pending)))
+        _set_mail_index_state(conn, 'history_id', latest_history_id)
+    forget_indexed_messages(list(removed))
+    
+    return {'added': [record['id'] for record in records], 'removed': list(removed), 'records': records}
+
+def _pending_rule_ids(conn):
+    row = conn.execute("SELECT value FROM mail_index_state WHERE key = 'rules_pending'").fetchone()
+    return json.loads(row['value']) if row and row['value'] else []
+
+def _apply_pending_mail_rules():
+    """Run the rules over arrivals not yet triaged; they stay pending if the rules fail"""
+    with mail_index_db() as conn:
+        pending = _pending_rule_ids(conn)
+        if not pending:
+            return None
+        records = []
+        for start in range(0, len(pending), 500):
+            chunk = pending[start:start + 500]
+            records.extend(dict(row) for row in conn.execute(
+                f"SELECT * FROM messages WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ))
+    
+    hits = apply_mail_rules(records)
+    with mail_index_db() as conn:
+        # Only clear what was just handled - nothing else can add to the list mid-sync
+        remaining = set(_pending_rule_ids(conn)) - set(pending)
+        _set_mail_index_state(conn, 'rules_pending', json.dumps(sorted(remaining)))
+    return hits
+
+def sync_mail_index():
+    """Bring the index up to date - full backfill the first time, Gmail history after that"""
+    if not gmail_service or not init_mail_index():
+        return None
+    # One sync at a time; a caller arriving mid-sync just uses what's there
+    if not mail_index_sync_lock.acquire(blocking=False):
+        return None
+    
+    try:
+        history_id = _mail_index_state('history_id')
+        if not history_id:
+            changes = _backfill_mail_index()
+        else:
+            try:
+                changes = _apply_mail_history(history_id)
+            except HttpError as e:
+                # Gmail only keeps about a week of history
+                if e.resp.status != 404:
+                    raise
+                print("⚠️ Mail index history expired - rebuilding")
+                changes = _backfill_mail_index()
+        
+        # Triage only new arrivals - a backfill is old mail the rules never saw arrive
+        try:
+            changes['rules'] = _apply_pending_mail_rules()
+        except Exception as e:
+            print(f"❌ Mail rules failed (will retry next sync): {e}")
         
-        messages = results.get('messages', [])
-        
-        if not messages:
-            return f"📧 No {'unread' if unread_only else 'recent'} emails found."
-        
-        # Get email details
-        email_list = []
-        for msg in messages:
+        with mail_index_db() as conn:
+            _set_mail_index_state(conn, 'last_sync_at', time.time())
+        return changes
+    finally:
+        mail_index_sync_lock.release()
+
+def mail_index_age():
+    """Seconds since the last completed sync, or None if the index has never synced"""
+    if not mail_index_ready:
+        return None
+    last_sync_at = _mail_index_state('last_sync_at')
+    return time.time() - float(last_sync_at) if last_sync_at else None
+
+async def mail_index_sync_loop():
+    """Background task - keep the index within MAIL_INDEX_SYNC_SECONDS of Gmail"""
+    while True:
+        try:
+            await run_google_call(sync_mail_index)
+        except Exception as e:
+            print(f"❌ Mail index sync failed: {e}")
+        await asyncio.sleep(MAIL_INDEX_SYNC_SECONDS)
+
+def start_mail_index_sync():
+    """Start the background sync once (called when Google services come up)"""
+    global mail_index_task
+    if mail_index_task is None or mail_index_task.done():
+        mail_index_task = asyncio.create_task(mail_index_sync_loop())
+
+MAIL_QUERY_TOKEN = re.compile(r'(\w+):("[^"]*"|\S+)|"([^"]*)"|(\S+)')
+
+def _fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+def _mail_query_date(value):
+    """Gmail after:/before: date (YYYY/MM/DD or YYYY-MM-DD) as epoch ms at local midnight"""
+    day = datetime.strptime(value.replace('-', '/'), '%Y/%m/%d')
+    return int(pytz.timezone('America/Toronto').localize(day).timestamp() * 1000)
+
+def translate_mail_query(query, exact=True):
+    """Translate the common Gmail operators to SQL
+    
+    Returns (where_clauses, params, fts_match, earliest_ms) or None when the
+    query uses anything the index can't answer exactly (OR, negation, labels...).
+    Without indexed bodies a bare term only sees subject, sender and snippet, so
+    exact translation gives up on those too.
+    """
+    clauses = ["m.labels NOT LIKE '% SPAM %'", "m.labels NOT LIKE '% TRASH %'"]
+    params = []
+    fts_terms = []
+    earliest_ms = 0
+    
+    for match in MAIL_QUERY_TOKEN.finditer(query or ''):
+        operator, value, phrase, word = match.groups()
+        if operator:
+            operator = operator.lower()
+            value = value.strip('"')
+            try:
+                if operator == 'from':
+                    clauses.append('(m.sender_address LIKE ? OR m.sender_name LIKE ?)')
+                    params.extend([f'%{value}%', f'%{value}%'])
+                elif operator == 'subject':
+                    fts_terms.append(f'subject : {_fts_phrase(value)}')
+                elif operator == 'after':
+                    earliest_ms = max(earliest_ms, _mail_query_date(value))
+                    clauses.append('m.internal_date >= ?')
+                    params.append(_mail_query_date(value))
+                elif operator == 'before':
+                    clauses.append('m.internal_date < ?')
+                    params.append(_mail_query_date(value))
+                elif operator in ('newer_than', 'older_than'):
+                    unit_seconds = {'d': 86400, 'm': 30 * 86400, 'y': 365 * 86400}[value[-1].lower()]
+                    cutoff_ms = int((time.time() - int(value[:-1]) * unit_seconds) * 1000)
+                    if operator == 'newer_than':
+                        earliest_ms = max(earliest_ms, cutoff_ms)
+                        clauses.append('m.internal_date >= ?')
+                    else:
+                        clauses.append('m.internal_date < ?')
+                    params.append(cutoff_ms)
+                elif operator == 'is' and value.lower() in ('unread', 'read', 'starred', 'important'):
+                    label = 'UNREAD' if value.lower() in ('unread', 'read') else value.upper()
+                    clauses.append(f"m.labels {'NOT ' if value.lower() == 'read' else ''}LIKE ?")
+                    params.append(f'% {label} %')
+                elif operator == 'in' and value.lower() in ('inbox', 'sent', 'anywhere'):
+                    if value.lower() != 'anywhere':
+                        clauses.append('m.labels LIKE ?')
+                        params.append(f'% {value.upper()} %')
+                else:
+                    return None
+            except (ValueError, KeyError, IndexError):
+                return None
+        else:
+            term = phrase if phrase is not None else word
+            if word and (word in ('OR', 'AND') or word.startswith(('-', '(', '{'))):
+                return None
+            if term.strip():
+                if exact and not MAIL_INDEX_BODIES:
+                    return None
+                fts_terms.append(_fts_phrase(term))
+    
+    return clauses, params, ' AND '.join(fts_terms), earliest_ms
+
+def query_mail_index(query, max_results=10, complete_only=True):
+    """Rows matching a Gmail-style query, newest first
+    
+    None when the query can't be translated, or (with complete_only) when the
+    index may be missing older matches that Gmail would return.
+    """
+    if not init_mail_index():
+        return None
+    translated = translate_mail_query(query, exact=complete_only)
+    if translated is None:
+        return None
+    clauses, params, fts_match, earliest_ms = translated
+    
+    sql = 'SELECT m.*, messages_fts.body AS body FROM messages m JOIN messages_fts ON messages_fts.rowid = m.doc_id'
+    if fts_match:
+        clauses.insert(0, 'messages_fts MATCH ?')
+        params.insert(0, fts_match)
+    sql += ' WHERE ' + ' AND '.join(clauses) + ' ORDER BY m.internal_date DESC LIMIT ?'
+    params.append(max_results)
+    
+    try:
+        with mail_index_db() as conn:
+            rows = conn.execute(sql, params).fetchall()
+    except sqlite3.Error as e:
+        print(f"⚠️ Mail index query failed ({query}): {e}")
+        return None
+    
+    covered_since = int(_mail_index_state('covered_since') or 0)
+    if complete_only and len(rows) < max_results and earliest_ms < covered_since:
+        return None
+    return rows
+
+# Sender directory - one row per address, aggregated from the indexed headers
+SenderEntry = namedtuple('SenderEntry', ['address', 'domain', 'names', 'count', 'last_seen'])
+
+# Only an exact address or domain is acted on; names, substrings and typos are just suggestions
+SENDER_MATCH_THRESHOLD = 0.95
+
+def sender_directory():
+    """Every indexed sender with display names, message count and last-seen time"""
+    if not init_mail_index():
+        return []
+    with mail_index_db() as conn:
+        rows = conn.execute(
+            """SELECT sender_address, sender_domain, GROUP_CONCAT(DISTINCT sender_name || char(31)) AS names,
+                      COUNT(*) AS count, MAX(internal_date) AS last_seen
+               FROM messages
+               WHERE sender_address != '' AND labels NOT LIKE '% SPAM %' AND labels NOT LIKE '% TRASH %'
+               GROUP BY sender_address"""
+        ).fetchall()
+    # Each name carries a \x1f terminator (DISTINCT allows no custom separator), so commas inside names survive
+    return [
+        SenderEntry(row['sender_address'], row['sender_domain'],
+                    [name for name in (row['names'] or '')[:-1].split('\x1f,') if name], row['count'], row['last_seen'])
+        for row in rows
+    ]
+
+def _sender_match_score(term, entry):
+    """How well a free-form sender term (address, domain, brand or name) matches an entry"""
+    if term == entry.address:
+        return 1.0
+    domain = term.lstrip('@')
+    # Whole labels only: "@x.com" isn't fox.com, and a bare TLD ("com") isn't a domain
+    if domain == entry.domain or ('.' in domain and entry.domain.endswith('.' + domain)):
+        return 0.95
+    names = [name.lower() for name in entry.names]
+    if term in names:
+        return 0.9
+    if term in entry.address or any(term in name for name in names):
+        return 0.85
+    # Typos and near-misses ("hnm", "amazon.ca" vs "amazon.com")
+    candidates = [entry.address, entry.address.split('@')[0], entry.domain, entry.domain.split('.')[0]] + names
+    return 0.75 * max(difflib.SequenceMatcher(None, term, candidate).ratio() for candidate in candidates)
+
+def resolve_sender(term, limit=5):
+    """Best directory matches for a sender term as [(score, SenderEntry)], best first"""
+    term = (term or '').strip().lower()
+    if not term:
+        return []
+    _, parsed_address = parseaddr(term)
+    if '@' in parsed_address:
+        term = parsed_address
+    
+    scored = [(_sender_match_score(term, entry), entry) for entry in sender_directory()]
+    scored = [(score, entry) for score, entry in scored if score >= 0.45]
+    scored.sort(key=lambda item: (item[0], item[1].count, item[1].last_seen), reverse=True)
+    return scored[:limit]
+
+def resolve_sender_address(term):
+    """The one address a sender term confidently refers to, or None
+    
+    A typed address is taken as-is - it only resolves to its own directory entry.
+    """
+    if '@' in (term or ''):
+        _, address = parseaddr(term.strip().lower())
+        return next((entry for entry in sender_directory() if entry.address == address), None)
+    matches = resolve_sender(term, limit=2)
+    if not matches or matches[0][0] < SENDER_MATCH_THRESHOLD:
+        return None
+    # Two equally good matches (e.g. two addresses at one domain) - don't guess
+    if len(matches) > 1 and matches[1][0] == matches[0][0] and matches[0][0] < 1.0:
+        return None
+    return matches[0][1]
+
+def format_sender_entry(entry):
+    """One-line directory entry for previews and debug output"""
+    last_seen = datetime.fromtimestamp(entry.last_seen / 1000, pytz.timezone('America/Toronto')).strftime('%m/%d')
+    names = f" ({', '.join(entry.names[:2])})" if entry.names else ""
+    return f"`{entry.address}`{names} - {entry.count} indexed, last {last_seen}"
+
+def format_indexed_emails(rows, query, include_body=False, note=""):
+    """Render index rows the same way search_emails renders Gmail results"""
+    if not rows:
+        return f"📧 No emails found matching: {query}{note}"
+    
+    email_list = []
+    for row in rows:
+        try:
+            parsed_date = parsedate_to_datetime(row['date_header'])
+            date_str = parsed_date.strftime('%m/%d at %-I:%M %p')
+        except Exception:
+            date_str = row['date_header'] or 'No Date'
+        
+        email_info = f"📧 **{row['subject'] or 'No Subject'}**\n👤 From: {row['sender'] or 'Unknown Sender'}\n📅 {date_str}"
+        if include_body and row['body']:
+            email_info += f"\n📄 {row['body'][:200]}{'...' if len(row['body']) > 200 else ''}"
+        email_list.append(email_info)
+    
+    header = f"🔍 **Search Results for '{query}' ({len(email_list)}):**{note}\n\n"
+    return header + "\n\n".join(email_list)
+
+# ============================================================================
+# GMAIL FUNCTIONS (ALL PRESERVED)
+# ============================================================================
+
+def fetch_recent_emails(count=10, unread_only=False, include_body=False):
+    """Recent (or unread) emails as MailItem records"""
+    # Build query
+    query = 'is:unread' if unread_only else 'in:inbox'
+    
+    # Get message list
+    results = gmail_service.users().messages().list(
+        userId='me', 
+        q=query, 
+        maxResults=count
+    ).execute()
+    
+    items = []
+    for msg in results.get('messages', []):
+        if include_body:
+            msg_detail = gmail_service.users().messages().get(userId='me', id=msg['id'], format='full').execute()
+            # One char past the preview length, so truncation still shows
+            items.append(MailItem.from_api(msg_detail, get_email_body(msg_detail, max_chars=201) or None))
+        else:
             msg_detail = gmail_service.users().messages().get(
-                userId='me', 
+                userId='me',
                 id=msg['id'],
-                format='full'
+                format='metadata',
+                metadataHeaders=['Subject', 'From', 'Date']
             ).execute()
-            
-            headers = msg_detail['payload'].get('headers', [])
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown Sender')
-            date = next((h['value'] for h in headers if h['name'] == 'Date'), 'No Date')
-            
-            # Parse date
-            try:
-                parsed_date = parsedate_to_datetime(date)
-                date_str = parsed_date.strftime('%m/%d at %-I:%M %p')
-            except:
-                date_str = date
-            
-            email_info = f"📧 **{subject}**\n👤 From: {sender}\n📅 {date_str}"
-            
-            if include_body:
-                # Get email body (simplified)
-                body = get_email_body(msg_detail)
-                if body:
-                    email_info += f"\n📄 {body[:200]}{'...' if len(body) > 200 else ''}"
-            
-            email_list.append(email_info)
-        
-        header = f"📧 **{'Unread' if unread_only else 'Recent'} Emails ({len(email_list)}):**\n\n"
-        return header + "\n\n".join(email_list)
+            items.append(MailItem.from_api(msg_detail))
+    return items
+
+def get_recent_emails(count=10, unread_only=False, include_body=False):
+    """Get recent emails from Gmail"""
+    if not gmail_service:
+        return "❌ Gmail service not available"
+    
+    try:
+        return render_emails(fetch_recent_emails(count, unread_only, include_body), unread_only)
         
     except HttpError as e:
         return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
@@ -886,6 +1909,14 @@ def get_recent_emails(count=10, unread_only=False, include_body=False):
 
 def search_emails(query, max_results=10, include_body=False):
     """Search Gmail with a specific query"""
+    # A fresh local index answers in milliseconds without touching Gmail
+    if not include_body or MAIL_INDEX_BODIES:
+        age = mail_index_age()
+        if age is not None and age <= MAIL_INDEX_MAX_STALENESS_SECONDS:
+            rows = query_mail_index(query, max_results)
+            if rows is not None:
+                return format_indexed_emails(rows, query, include_body)
+    
     if not gmail_service:
         return "❌ Gmail service not available"
     
@@ -926,7 +1957,7 @@ def search_emails(query, max_results=10, include_body=False):
             email_info = f"📧 **{subject}**\n👤 From: {sender}\n📅 {date_str}"
             
             if include_body:
-                body = get_email_body(msg_detail)
+                body = get_email_body(msg_detail, max_chars=201)
                 if body:
                     email_info += f"\n📄 {body[:200]}{'...' if len(body) > 200 else ''}"
             
@@ -936,64 +1967,188 @@ def search_emails(query, max_results=10, include_body=False):
         return header + "\n\n".join(email_list)
         
     except HttpError as e:
-        return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
+        return search_emails_offline(query, max_results, include_body) or f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
     except Exception as e:
-        return f"❌ Error searching emails: {str(e)}"
+        return search_emails_offline(query, max_results, include_body) or f"❌ Error searching emails: {str(e)}"
+
+def search_emails_offline(query, max_results=10, include_body=False):
+    """Best-effort answer from the local index while Gmail is failing; None if it can't help"""
+    age = mail_index_age()
+    if age is None:
+        return None
+    rows = query_mail_index(query, max_results, complete_only=False)
+    if rows is None:
+        return None
+    note = f"\n⚠️ _Gmail unavailable - from the local index, synced {int(age // 60)} min ago_"
+    return format_indexed_emails(rows, query, include_body, note)
 
-def get_email_body(message):
-    """Extract email body from Gmail message"""
+def get_email_body(message, max_chars=None):
+    """Extract email body from Gmail message
+    
+    Walks nested multiparts, prefers text/plain over text/html (converted to
+    text), honours each part's charset and stops decoding once max_chars
+    characters have been produced.
+    """
     try:
-        payload = message['payload']
+        plain_parts, html_parts = [], []
+        _collect_text_parts(message['payload'], plain_parts, html_parts)
         
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part['mimeType'] == 'text/plain':
-                    data = part['body']['data']
-                    return base64.urlsafe_b64decode(data).decode('utf-8')
+        if plain_parts:
+            body = _decode_text_parts(plain_parts, max_chars)
+        elif html_parts:
+            body = _decode_text_parts(html_parts, max_chars, html=True)
         else:
-            if payload['mimeType'] == 'text/plain':
-                data = payload['body']['data']
-                return base64.urlsafe_b64decode(data).decode('utf-8')
+            body = ""
         
-        return "Body not available"
+        return body if body.strip() else "Body not available"
         
     except Exception:
         return "Error reading body"
 
-def get_email_stats(days=7):
-    """Get email statistics for the past N days"""
-    if not gmail_service:
-        return "❌ Gmail service not available"
+# Base64 is decoded this many characters at a time (a multiple of 4)
+MIME_DECODE_CHUNK = 16384
+
+def _mime_header(part, name):
+    return next((h['value'] for h in part.get('headers', []) if h['name'].lower() == name), '')
+
+def _collect_text_parts(part, plain_parts, html_parts):
+    """Depth-first walk gathering inline text/plain and text/html parts in order"""
+    mime_type = (part.get('mimeType') or '').lower()
+    
+    if mime_type.startswith('multipart/'):
+        children = part.get('parts', [])
+        if mime_type == 'multipart/alternative':
+            # Alternatives say the same thing - take the plainest one that has text
+            for preferred in ('text/plain', 'text/html'):
+                for child in children:
+                    if child.get('mimeType', '').lower() == preferred and child.get('body', {}).get('data'):
+                        (plain_parts if preferred == 'text/plain' else html_parts).append(child)
+                        return
+            children = children[:1] + [child for child in children[1:] if child.get('mimeType', '').startswith('multipart/')]
+        for child in children:
+            _collect_text_parts(child, plain_parts, html_parts)
+        return
     
+    # Named parts are attachments, even when they're text
+    if part.get('filename') or 'attachment' in _mime_header(part, 'content-disposition').lower():
+        return
+    if not part.get('body', {}).get('data'):
+        return
+    if mime_type == 'text/plain':
+        plain_parts.append(part)
+    elif mime_type == 'text/html':
+        html_parts.append(part)
+
+def _part_charset(part):
+    match = re.search(r'charset="?([\w.:-]+)', _mime_header(part, 'content-type'), re.IGNORECASE)
+    charset = match.group(1) if match else 'utf-8'
     try:
-        # Calculate date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        # Gmail search queries
-        queries = {
-            'total_received': f'after:{start_date.strftime("%Y/%m/%d")}',
-            'unread': 'is:unread',
-            'today': f'after:{end_date.strftime("%Y/%m/%d")}'
-        }
-        
-        stats = {}
-        for key, query in queries.items():
-            try:
-                results = gmail_service.users().messages().list(
-                    userId='me',
-                    q=query
-                ).execute()
-                stats[key] = results.get('resultSizeEstimate', 0)
-            except:
-                stats[key] = 0
-        
-        # Format stats
-        return f"""📊 **Email Statistics (Last {days} days):**
-📥 **Total Received:** {stats['total_received']:,}
-📬 **Unread:** {stats['unread']:,}
-📅 **Today:** {stats['today']:,}
-📈 **Daily Average:** {stats['total_received'] // days:,}"""
+        codecs.lookup(charset)
+    except LookupError:
+        charset = 'utf-8'
+    return charset
+
+def _decode_text_parts(parts, max_chars=None, html=False):
+    """Decode base64url part data chunk by chunk until max_chars of text exist"""
+    output = []
+    produced = 0
+    
+    for part in parts:
+        data = part['body']['data']
+        decoder = codecs.getincrementaldecoder(_part_charset(part))(errors='replace')
+        converter = HTMLTextExtractor() if html else None
+        
+        for start in range(0, len(data), MIME_DECODE_CHUNK):
+            chunk = data[start:start + MIME_DECODE_CHUNK]
+            final = start + MIME_DECODE_CHUNK >= len(data)
+            if final:
+                chunk += '=' * (-len(chunk) % 4)
+            text = decoder.decode(base64.urlsafe_b64decode(chunk), final=final)
+            
+            if converter:
+                converter.feed(text)
+                text = converter.take_text()
+            output.append(text)
+            produced += len(text)
+            if max_chars is not None and produced >= max_chars:
+                return ''.join(output).strip()[:max_chars]
+        
+        if converter:
+            converter.close()
+            output.append(converter.take_text())
+        if len(parts) > 1:
+            output.append('\n')
+    
+    body = ''.join(output).strip()
+    return body[:max_chars] if max_chars is not None else body
+
+class HTMLTextExtractor(HTMLParser):
+    """Incremental HTML-to-text: drops script/style, breaks lines at block elements"""
+    
+    BLOCK_TAGS = {'p', 'div', 'br', 'tr', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'table', 'blockquote', 'hr'}
+    SKIP_TAGS = {'script', 'style', 'head', 'title'}
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._pending = []
+        self._skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self._pending.append('\n')
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCK_TAGS:
+            self._pending.append('\n')
+    
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._pending.append(data)
+    
+    def take_text(self):
+        """Text produced since the last call, with whitespace runs collapsed"""
+        text = ''.join(self._pending)
+        self._pending = []
+        text = re.sub(r'[ \t\r\f\v\xa0]+', ' ', text)
+        return re.sub(r' ?\n[ \n]*', '\n', text)
+
+def fetch_email_stats(days=7):
+    """Mailbox counts for the past N days as a MailStats record"""
+    # Calculate date range
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    
+    # Gmail search queries
+    queries = {
+        'total_received': f'after:{start_date.strftime("%Y/%m/%d")}',
+        'unread': 'is:unread',
+        'today': f'after:{end_date.strftime("%Y/%m/%d")}'
+    }
+    
+    stats = {}
+    for key, query in queries.items():
+        try:
+            results = gmail_service.users().messages().list(
+                userId='me',
+                q=query
+            ).execute()
+            stats[key] = results.get('resultSizeEstimate', 0)
+        except:
+            stats[key] = 0
+    
+    return MailStats(days, stats['total_received'], stats['unread'], stats['today'])
+
+def get_email_stats(days=7):
+    """Get email statistics for the past N days"""
+    if not gmail_service:
+        return "❌ Gmail service not available"
+    
+    try:
+        return render_email_stats(fetch_email_stats(days))
         
     except HttpError as e:
         return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
@@ -1010,6 +2165,7 @@ def delete_email_by_id(email_id):
             userId='me',
             id=email_id
         ).execute()
+        forget_indexed_messages([email_id])
         return f"✅ **Email deleted successfully**"
         
     except HttpError as e:
@@ -1055,6 +2211,7 @@ def delete_specific_email(subject=None, sender=None, date=None):
             userId='me',
             id=email_id
         ).execute()
+        forget_indexed_messages([email_id])
         
         return f"✅ **Email deleted successfully**"
         
@@ -1069,8 +2226,11 @@ def delete_emails_from_sender(sender_email, max_delete=50):
         return "❌ Gmail service not available"
     
     try:
+        # The sender directory usually knows the exact address - one query instead of three
+        resolved = resolve_sender_address(sender_email)
+        
         # First try exact match
-        query = f"from:{sender_email}"
+        query = f"from:{resolved.address if resolved else sender_email}"
         results = gmail_service.users().messages().list(
             userId='me',
             q=query,
@@ -1080,7 +2240,7 @@ def delete_emails_from_sender(sender_email, max_delete=50):
         messages = results.get('messages', [])
         
         # If no exact match, try domain-based search for common patterns
-        if not messages and '@' in sender_email:
+        if not messages and not resolved and '@' in sender_email:
             domain = sender_email.split('@')[1]
             # Try searching by domain
             query = f"from:@{domain}"
@@ -1103,7 +2263,11 @@ def delete_emails_from_sender(sender_email, max_delete=50):
                 messages = results.get('messages', [])
         
         if not messages:
-            return f"📧 No emails found from: {sender_email} (tried exact match, domain match, and partial match)"
+            if resolved:
+                return f"📧 No emails found from: {resolved.address}"
+            suggestions = resolve_sender(sender_email, limit=3)
+            hint = f"\n💡 Did you mean: {', '.join(entry.address for _, entry in suggestions)}" if suggestions else ""
+            return f"📧 No emails found from: {sender_email} (tried exact match, domain match, and partial match){hint}"
         
         # Delete messages
         deleted_count = 0
@@ -1113,6 +2277,7 @@ def delete_emails_from_sender(sender_email, max_delete=50):
                     userId='me',
                     id=msg['id']
                 ).execute()
+                forget_indexed_messages([msg['id']])
                 deleted_count += 1
             except:
                 continue
@@ -1126,6 +2291,13 @@ def delete_emails_from_sender(sender_email, max_delete=50):
 
 def debug_email_senders(search_term, max_results=20):
     """Debug function to show exact sender formats for troubleshooting"""
+    # The sender directory already has every format seen, with counts
+    if mail_index_age() is not None:
+        matches = resolve_sender(search_term, limit=max_results)
+        if matches:
+            sender_list = [format_sender_entry(entry) for _, entry in matches]
+            return f"📧 **Email Senders Found ({len(sender_list)}):**\n\n" + "\n".join(f"• {line}" for line in sender_list)
+    
     if not gmail_service:
         return "❌ Gmail service not available"
     
@@ -1170,123 +2342,379 @@ def debug_email_senders(search_term, max_results=20):
 # EMAIL COMPOSITION & SENDING FUNCTIONS
 # ============================================================================
 
-def send_email(to, subject, body, cc=None, bcc=None):
-    """Send a new email"""
-    if not gmail_service:
-        return "❌ Gmail service not available"
-    
+# Headers replies need, cached per message (a sent message's headers never change)
+REPLY_HEADERS = ['From', 'Reply-To', 'Subject', 'Date', 'Message-ID', 'References']
+MESSAGE_HEADER_CACHE_SIZE = 256
+message_header_cache = OrderedDict()
+message_header_lock = threading.Lock()
+
+# Forwards are assembled in a temp file that only spills to disk past this size
+FORWARD_SPOOL_BYTES = 1024 * 1024
+
+def message_headers(email_id):
+    """{'threadId', lowercase header name: value} for a message, metadata-only and cached"""
+    with message_header_lock:
+        if email_id in message_header_cache:
+            message_header_cache.move_to_end(email_id)
+            return message_header_cache[email_id]
+    
+    message = gmail_service.users().messages().get(
+        userId='me',
+        id=email_id,
+        format='metadata',
+        metadataHeaders=REPLY_HEADERS,
+        fields='threadId,payload/headers'
+    ).execute()
+    headers = {h['name'].lower(): h['value'] for h in message.get('payload', {}).get('headers', [])}
+    headers['threadId'] = message.get('threadId')
+    
+    with message_header_lock:
+        message_header_cache[email_id] = headers
+        while len(message_header_cache) > MESSAGE_HEADER_CACHE_SIZE:
+            message_header_cache.popitem(last=False)
+    return headers
+
+def compose_email(to, subject, body, cc=None, bcc=None):
+    """messages().send arguments for a new email"""
+    message = MIMEText(body)
+    message['to'] = to
+    message['subject'] = subject
+    if cc:
+        message['cc'] = cc
+    if bcc:
+        message['bcc'] = bcc
+    
+    return {'body': {'raw': base64.urlsafe_b64encode(message.as_bytes()).decode()}}
+
+def compose_reply(email_id, reply_body):
+    """messages().send arguments replying to an email, in the same Gmail thread"""
+    headers = message_headers(email_id)
+    original_to = headers.get('reply-to') or headers.get('from', '')
+    original_subject = headers.get('subject', '')
+    message_id = headers.get('message-id', '')
+    
+    # Create reply
+    reply_subject = f"Re: {original_subject}" if not original_subject.startswith('Re:') else original_subject
+    
+    message = MIMEText(reply_body)
+    message['to'] = original_to
+    message['subject'] = reply_subject
+    if message_id:
+        message['In-Reply-To'] = message_id
+        message['References'] = f"{headers['references']} {message_id}" if headers.get('references') else message_id
+    
+    body = {'raw': base64.urlsafe_b64encode(message.as_bytes()).decode()}
+    if headers.get('threadId'):
+        body['threadId'] = headers['threadId']
+    return {'body': body}
+
+def _read_header_block(stream):
+    """The RFC 822 header block at the start of a seekable byte stream"""
+    head = stream.read(64 * 1024)
+    stream.seek(0)
+    end = min((i for i in (head.find(b'\r\n\r\n'), head.find(b'\n\n')) if i >= 0), default=len(head))
+    return BytesHeaderParser(policy=email.policy.default).parsebytes(head[:end + 2])
+
+def compose_forward(email_id, to, forward_message=""):
+    """messages().send arguments forwarding an email with its attachments intact
+    
+    The original is fetched once as raw RFC 822, decoded chunk by chunk into a spool
+    file and wrapped as a message/rfc822 part - it's never parsed or re-encoded.
+    """
+    raw = gmail_service.users().messages().get(
+        userId='me',
+        id=email_id,
+        format='raw',
+        fields='raw'
+    ).execute()['raw']
+    
+    original = tempfile.SpooledTemporaryFile(max_size=FORWARD_SPOOL_BYTES)
+    _write_base64url_stream(
+        (raw[i:i + ATTACHMENT_CHUNK_BYTES] for i in range(0, len(raw), ATTACHMENT_CHUNK_BYTES)),
+        original
+    )
+    del raw
+    original.seek(0)
+    original_headers = _read_header_block(original)
+    original_subject = str(original_headers.get('Subject', ''))
+    
+    # Create forward message
+    forward_subject = f"Fwd: {original_subject}" if not original_subject.startswith('Fwd:') else original_subject
+    
+    forward_body = f"{forward_message}\n\n---------- Forwarded message ----------\n"
+    forward_body += f"From: {original_headers.get('From', '')}\n"
+    forward_body += f"Date: {original_headers.get('Date', '')}\n"
+    forward_body += f"Subject: {original_subject}\n"
+    
+    boundary = f"==rose-forward-{os.urandom(12).hex()}=="
+    outer = EmailMessage(policy=email.policy.SMTP)
+    outer['To'] = to
+    outer['Subject'] = forward_subject
+    outer['MIME-Version'] = '1.0'
+    outer['Content-Type'] = f'multipart/mixed; boundary="{boundary}"'
+    
+    message = tempfile.SpooledTemporaryFile(max_size=FORWARD_SPOOL_BYTES)
+    # Headers only - the generator would otherwise close the (still empty) multipart body
+    message.write(b''.join(outer.policy.fold_binary(name, value) for name, value in outer.items()) + b'\r\n')
+    message.write(f"--{boundary}\r\n".encode())
+    message.write(MIMEText(forward_body, 'plain', 'utf-8').as_bytes(policy=email.policy.SMTP))
+    message.write(f"\r\n--{boundary}\r\nContent-Type: message/rfc822\r\nContent-Disposition: attachment; filename=\"forwarded.eml\"\r\n\r\n".encode())
+    shutil.copyfileobj(original, message)
+    message.write(f"\r\n--{boundary}--\r\n".encode())
+    original.close()
+    message.seek(0)
+    
+    # Uploaded as media - no second base64 copy of the original in a JSON body
+    media = google_http.MediaIoBaseUpload(message, mimetype='message/rfc822', chunksize=1024 * 1024, resumable=True)
+    return {'body': {}, 'media_body': media}
+
+# ============================================================================
+# OUTBOUND MAIL QUEUE (PERSISTENT SPOOL, RETRIES, IDEMPOTENCY)
+# ============================================================================
+
+# Tool calls spool mail here and return at once; a worker sends it in the background
+OUTBOX_DB = os.getenv('OUTBOX_DB', 'rose_outbox.sqlite')
+OUTBOX_CONCURRENCY = int(os.getenv('OUTBOX_CONCURRENCY', '4'))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '6'))
+OUTBOX_BACKOFF_SECONDS = 15  # doubled after every failed attempt, capped at 15 minutes
+OUTBOX_POLL_SECONDS = 30
+# A repeat of the same send within this window is treated as a retried tool call;
+# after it (or once the first attempt failed) the same mail is sent again
+OUTBOX_DEDUP_MINUTES = int(os.getenv('OUTBOX_DEDUP_MINUTES', '10'))
+
+OUTBOX_COMPOSERS = {
+    'send': compose_email,
+    'reply': compose_reply,
+    'forward': compose_forward
+}
+
+outbox_ready = False
+outbox_wakeup = None
+outbox_task = None
+
+@contextlib.contextmanager
+def outbox_db():
+    """Short-lived connection to the outbox spool"""
+    conn = sqlite3.connect(OUTBOX_DB, timeout=10)
+    conn.row_factory = sqlite3.Row
     try:
-        message = MIMEText(body)
-        message['to'] = to
-        message['subject'] = subject
-        if cc:
-            message['cc'] = cc
-        if bcc:
-            message['bcc'] = bcc
-        
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        
-        send_message = gmail_service.users().messages().send(
-            userId='me',
-            body={'raw': raw_message}
-        ).execute()
-        
-        return f"✅ **Email sent successfully to {to}**"
-        
-    except HttpError as e:
-        return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
-    except Exception as e:
-        return f"❌ Error sending email: {str(e)}"
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
 
-def reply_to_email(email_id, reply_body):
-    """Reply to a specific email"""
-    if not gmail_service:
-        return "❌ Gmail service not available"
+def init_outbox():
+    """Create the spool table once and requeue anything a crash left mid-send"""
+    global outbox_ready
+    if outbox_ready:
+        return
+    with outbox_db() as conn:
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                summary TEXT,
+                channel_id INTEGER,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                gmail_id TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)')
+        conn.execute("UPDATE outbox SET status = 'queued' WHERE status = 'sending'")
+    outbox_ready = True
+
+def outbox_idempotency_key(kind, payload, scope=''):
+    """Same mail from the same conversation -> same key"""
+    canonical = json.dumps({'kind': kind, 'payload': payload, 'scope': scope}, sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def outbound_email_problem(kind, payload):
+    """Why a send can't work, checked while the assistant can still fix it; None if it looks sendable"""
+    if kind in ('send', 'forward'):
+        addresses = [address for _, address in getaddresses([payload.get('to') or ''])]
+        if not addresses or not all('@' in address for address in addresses):
+            return f"❌ A valid recipient address ('to') is required - got '{payload.get('to') or ''}'"
+    if kind in ('reply', 'forward'):
+        if not payload.get('email_id'):
+            return "❌ Please specify the email ID to " + ('reply to' if kind == 'reply' else 'forward')
+        try:
+            if gmail_service:
+                message_headers(payload['email_id'])
+        except HttpError as e:
+            if e.resp.status in (400, 404):
+                return f"❌ Email {payload['email_id']} not found"
+            # Anything else may be transient - the worker retries it
+        except Exception:
+            pass
+    if kind == 'reply' and not payload.get('reply_body'):
+        return "❌ The reply has no text ('reply_body')"
+    return None
+
+def queue_outbound_email(kind, payload, summary, channel_id=None, idempotency_key=None, scope=''):
+    """Spool an email for the worker; returns the status line for the tool output"""
+    problem = outbound_email_problem(kind, payload)
+    if problem:
+        return problem
+    init_outbox()
+    key = idempotency_key or outbox_idempotency_key(kind, payload, scope)
+    now = time.time()
+    
+    with outbox_db() as conn:
+        existing = conn.execute('SELECT id, status, created_at FROM outbox WHERE idempotency_key = ?', (key,)).fetchone()
+        if existing and existing['status'] == 'failed':
+            # Asked again after giving up - try the same item afresh
+            conn.execute(
+                """UPDATE outbox SET status = 'queued', payload = ?, summary = ?, channel_id = ?, attempts = 0,
+                                     next_attempt_at = ?, last_error = NULL, updated_at = ? WHERE id = ?""",
+                (json.dumps(payload), summary, channel_id, now, now, existing['id'])
+            )
+            if outbox_wakeup:
+                outbox_wakeup.set()
+            return f"📤 **Queued for sending again** (#{existing['id']}) - {summary}"
+        if existing and (idempotency_key or now - existing['created_at'] < OUTBOX_DEDUP_MINUTES * 60):
+            return f"📤 **Already queued** (#{existing['id']}, {existing['status']}) - {summary}"
+        if existing:
+            # Outside the window - a genuine resend of an old message
+            conn.execute('DELETE FROM outbox WHERE id = ?', (existing['id'],))
+        
+        cursor = conn.execute(
+            """INSERT INTO outbox (idempotency_key, kind, payload, summary, channel_id, status, next_attempt_at, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?)""",
+            (key, kind, json.dumps(payload), summary, channel_id, now, now, now)
+        )
+        outbox_id = cursor.lastrowid
     
+    if outbox_wakeup:
+        outbox_wakeup.set()
+    return f"📤 **Queued for sending** (#{outbox_id}) - {summary}"
+
+def _claim_due_outbox_items(limit):
+    """Mark up to limit due items as sending and return them"""
+    with outbox_db() as conn:
+        rows = conn.execute(
+            "SELECT * FROM outbox WHERE status = 'queued' AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+            (time.time(), limit)
+        ).fetchall()
+        conn.executemany(
+            "UPDATE outbox SET status = 'sending', updated_at = ? WHERE id = ?",
+            [(time.time(), row['id']) for row in rows]
+        )
+    return [dict(row) for row in rows]
+
+def _seconds_until_next_outbox_item():
+    """How long the worker may sleep before a queued retry comes due"""
+    with outbox_db() as conn:
+        row = conn.execute("SELECT MIN(next_attempt_at) AS due FROM outbox WHERE status = 'queued'").fetchone()
+    if row['due'] is None:
+        return OUTBOX_POLL_SECONDS
+    return min(OUTBOX_POLL_SECONDS, max(0.0, row['due'] - time.time()))
+
+def deliver_outbox_item(item):
+    """Compose and send one spooled email; returns the Gmail message id"""
+    message = OUTBOX_COMPOSERS[item['kind']](**json.loads(item['payload']))
+    sent = gmail_service.users().messages().send(userId='me', **message).execute()
+    return sent.get('id')
+
+def _outbox_failure_is_permanent(error):
+    """Client errors won't fix themselves - except rate limits and auth hiccups"""
+    return isinstance(error, HttpError) and 400 <= error.resp.status < 500 and error.resp.status not in (401, 403, 408, 429)
+
+def _finish_outbox_item(item, gmail_id=None, error=None):
+    """Record the outcome of one attempt; returns the item's new status"""
+    now = time.time()
+    attempts = item['attempts'] + 1
+    with outbox_db() as conn:
+        if error is None:
+            status = 'sent'
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, gmail_id = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                (status, attempts, gmail_id, now, item['id'])
+            )
+        else:
+            give_up = attempts >= OUTBOX_MAX_ATTEMPTS or _outbox_failure_is_permanent(error)
+            status = 'failed' if give_up else 'queued'
+            retry_at = now + min(OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1), 900)
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                (status, attempts, retry_at, str(error)[:300], now, item['id'])
+            )
+    return status
+
+async def _notify_outbox_status(item, status, error=None):
+    """Tell the channel that asked for the email how it went"""
+    channel = bot.get_channel(item['channel_id']) if item['channel_id'] else None
+    if not channel or status == 'queued':
+        return
     try:
-        # Get original message
-        original_msg = gmail_service.users().messages().get(
-            userId='me',
-            id=email_id,
-            format='full'
-        ).execute()
-        
-        headers = original_msg['payload'].get('headers', [])
-        original_to = next((h['value'] for h in headers if h['name'] == 'From'), '')
-        original_subject = next((h['value'] for h in headers if h['name'] == 'Subject'), '')
-        message_id = next((h['value'] for h in headers if h['name'] == 'Message-ID'), '')
-        
-        # Create reply
-        reply_subject = f"Re: {original_subject}" if not original_subject.startswith('Re:') else original_subject
-        
-        message = MIMEText(reply_body)
-        message['to'] = original_to
-        message['subject'] = reply_subject
-        if message_id:
-            message['In-Reply-To'] = message_id
-            message['References'] = message_id
-        
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        
-        gmail_service.users().messages().send(
-            userId='me',
-            body={'raw': raw_message}
-        ).execute()
-        
-        return f"✅ **Reply sent successfully**"
-        
-    except HttpError as e:
-        return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
+        if status == 'sent':
+            await channel.send(f"📤 Sent (#{item['id']}): {item['summary']}")
+        else:
+            await channel.send(f"❌ Could not send (#{item['id']}): {item['summary']} - {str(error)[:150]}")
     except Exception as e:
-        return f"❌ Error replying to email: {str(e)}"
+        print(f"❌ Outbox notification failed: {e}")
 
-def forward_email(email_id, to, forward_message=""):
-    """Forward a specific email"""
-    if not gmail_service:
-        return "❌ Gmail service not available"
-    
+async def _process_outbox_item(item):
     try:
-        # Get original message
-        original_msg = gmail_service.users().messages().get(
-            userId='me',
-            id=email_id,
-            format='full'
-        ).execute()
-        
-        headers = original_msg['payload'].get('headers', [])
-        original_from = next((h['value'] for h in headers if h['name'] == 'From'), '')
-        original_subject = next((h['value'] for h in headers if h['name'] == 'Subject'), '')
-        original_date = next((h['value'] for h in headers if h['name'] == 'Date'), '')
-        
-        # Get original body
-        original_body = get_email_body(original_msg)
-        
-        # Create forward message
-        forward_subject = f"Fwd: {original_subject}" if not original_subject.startswith('Fwd:') else original_subject
-        
-        forward_body = f"{forward_message}\n\n---------- Forwarded message ----------\n"
-        forward_body += f"From: {original_from}\n"
-        forward_body += f"Date: {original_date}\n"
-        forward_body += f"Subject: {original_subject}\n\n"
-        forward_body += original_body
-        
-        message = MIMEText(forward_body)
-        message['to'] = to
-        message['subject'] = forward_subject
-        
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        
-        gmail_service.users().messages().send(
-            userId='me',
-            body={'raw': raw_message}
-        ).execute()
-        
-        return f"✅ **Email forwarded successfully to {to}**"
-        
-    except HttpError as e:
-        return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
+        gmail_id = await run_google_call(deliver_outbox_item, item)
+        error = None
     except Exception as e:
-        return f"❌ Error forwarding email: {str(e)}"
+        gmail_id, error = None, e
+    status = await asyncio.to_thread(_finish_outbox_item, item, gmail_id, error)
+    if error:
+        print(f"⚠️ Outbox #{item['id']} attempt {item['attempts'] + 1} failed ({status}): {error}")
+    await _notify_outbox_status(item, status, error)
+
+async def outbox_worker_loop():
+    """Background task - send due items, a few at a time, until the spool is drained"""
+    while True:
+        outbox_wakeup.clear()
+        sleep_seconds = OUTBOX_POLL_SECONDS
+        try:
+            items = await asyncio.to_thread(_claim_due_outbox_items, OUTBOX_CONCURRENCY)
+            if items:
+                await asyncio.gather(*(_process_outbox_item(item) for item in items))
+                continue
+            sleep_seconds = await asyncio.to_thread(_seconds_until_next_outbox_item)
+        except Exception as e:
+            print(f"❌ Outbox worker error: {e}")
+        try:
+            await asyncio.wait_for(outbox_wakeup.wait(), timeout=sleep_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+def start_outbox_worker():
+    """Start the outbox worker once (called when Google services come up)"""
+    global outbox_task, outbox_wakeup
+    init_outbox()
+    if outbox_wakeup is None:
+        outbox_wakeup = asyncio.Event()
+    if outbox_task is None or outbox_task.done():
+        outbox_task = asyncio.create_task(outbox_worker_loop())
+
+def get_outbox_items(limit=10):
+    """Most recent outbox entries, newest first"""
+    init_outbox()
+    with outbox_db() as conn:
+        return [dict(row) for row in conn.execute('SELECT * FROM outbox ORDER BY id DESC LIMIT ?', (limit,))]
+
+def retry_outbox_item(outbox_id):
+    """Put a failed item back in the queue; False if there's no such failed item"""
+    init_outbox()
+    with outbox_db() as conn:
+        updated = conn.execute(
+            "UPDATE outbox SET status = 'queued', attempts = 0, next_attempt_at = ?, updated_at = ? WHERE id = ? AND status = 'failed'",
+            (time.time(), time.time(), outbox_id)
+        ).rowcount
+    if updated and outbox_wakeup:
+        outbox_wakeup.set()
+    return bool(updated)
 
 # ============================================================================
 # EMAIL ORGANIZATION FUNCTIONS
@@ -1387,21 +2815,79 @@ def unstar_email(email_id):
     except Exception as e:
         return f"❌ Error removing star: {str(e)}"
 
+# Label catalog: lowercase name -> label, refreshed periodically and on label creation
+LABEL_CATALOG_TTL_SECONDS = int(os.getenv('LABEL_CATALOG_TTL_SECONDS', '300'))
+BATCH_MODIFY_MAX_IDS = 1000  # Gmail's per-request limit for batchModify
+label_catalog_cache = {'labels': None, 'loaded_at': 0.0}
+label_catalog_lock = threading.Lock()
+
+def label_catalog(refresh=False):
+    """All labels keyed by lowercase name, one labels().list per TTL"""
+    with label_catalog_lock:
+        fresh = time.monotonic() - label_catalog_cache['loaded_at'] < LABEL_CATALOG_TTL_SECONDS
+        if label_catalog_cache['labels'] is not None and fresh and not refresh:
+            return label_catalog_cache['labels']
+        
+        labels_result = gmail_service.users().labels().list(userId='me').execute()
+        label_catalog_cache['labels'] = {label['name'].lower(): label for label in labels_result.get('labels', [])}
+        label_catalog_cache['loaded_at'] = time.monotonic()
+        return label_catalog_cache['labels']
+
+def invalidate_label_catalog():
+    with label_catalog_lock:
+        label_catalog_cache['labels'] = None
+
+def find_label_id(label_name):
+    """Label ID for a name (case-insensitive); re-lists once before giving up"""
+    label = label_catalog().get(label_name.lower())
+    if not label:
+        # Could have been created in Gmail since the last refresh
+        label = label_catalog(refresh=True).get(label_name.lower())
+    return label['id'] if label else None
+
+def batch_modify_messages(message_ids, add_label_ids=None, remove_label_ids=None):
+    """Apply label changes to many messages, one request per 1000 ids"""
+    body = {}
+    if add_label_ids:
+        body['addLabelIds'] = list(add_label_ids)
+    if remove_label_ids:
+        body['removeLabelIds'] = list(remove_label_ids)
+    
+    for start in range(0, len(message_ids), BATCH_MODIFY_MAX_IDS):
+        gmail_service.users().messages().batchModify(
+            userId='me',
+            body=dict(body, ids=list(message_ids[start:start + BATCH_MODIFY_MAX_IDS]))
+        ).execute()
+
+def create_email_label(label_name):
+    """Create a user label (no-op if it already exists)"""
+    if not gmail_service:
+        return "❌ Gmail service not available"
+    
+    try:
+        if label_catalog().get(label_name.lower()):
+            return f"📝 Label '{label_name}' already exists"
+        
+        gmail_service.users().labels().create(
+            userId='me',
+            body={'name': label_name, 'labelListVisibility': 'labelShow', 'messageListVisibility': 'show'}
+        ).execute()
+        invalidate_label_catalog()
+        
+        return f"✅ **Label '{label_name}' created**"
+        
+    except HttpError as e:
+        return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
+    except Exception as e:
+        return f"❌ Error creating label: {str(e)}"
+
 def add_label_to_email(email_id, label_name):
     """Add a label to an email"""
     if not gmail_service:
         return "❌ Gmail service not available"
     
     try:
-        # Get all labels to find the label ID
-        labels_result = gmail_service.users().labels().list(userId='me').execute()
-        labels = labels_result.get('labels', [])
-        
-        label_id = None
-        for label in labels:
-            if label['name'].lower() == label_name.lower():
-                label_id = label['id']
-                break
+        label_id = find_label_id(label_name)
         
         if not label_id:
             return f"❌ Label '{label_name}' not found"
@@ -1425,15 +2911,7 @@ def remove_label_from_email(email_id, label_name):
         return "❌ Gmail service not available"
     
     try:
-        # Get all labels to find the label ID
-        labels_result = gmail_service.users().labels().list(userId='me').execute()
-        labels = labels_result.get('labels', [])
-        
-        label_id = None
-        for label in labels:
-            if label['name'].lower() == label_name.lower():
-                label_id = label['id']
-                break
+        label_id = find_label_id(label_name)
         
         if not label_id:
             return f"❌ Label '{label_name}' not found"
@@ -1451,6 +2929,232 @@ def remove_label_from_email(email_id, label_name):
     except Exception as e:
         return f"❌ Error removing label: {str(e)}"
 
+# ============================================================================
+# MAIL RULES (LOCAL TRIAGE ON SYNC DELTAS)
+# ============================================================================
+
+# A JSON list of rules, checked against every message the index sync brings in:
+# {"name": "newsletters", "match": {"sender": ["@substack.com"], "subject_regex": "digest",
+#   "has_labels": ["INBOX"], "not_labels": ["STARRED"], "older_than_days": 3},
+#  "actions": {"add_labels": ["Reading"], "archive": true, "mark_read": true}, "stop": true}
+MAIL_RULES_FILE = os.getenv('MAIL_RULES_FILE', 'mail_rules.json')
+MAIL_RULE_MATCH_KEYS = {'sender', 'subject_regex', 'has_labels', 'not_labels', 'older_than_days', 'newer_than_days'}
+MAIL_RULE_ACTIONS = {'add_labels', 'remove_labels', 'archive', 'mark_read', 'star', 'important'}
+
+mail_rules = []
+mail_rules_mtime = None
+mail_rule_hits = defaultdict(int)
+mail_rules_last_run = {'at': None, 'checked': 0, 'changed': 0}
+
+def _validate_mail_rule(raw):
+    """Normalize one rule, raising ValueError when it can't be applied"""
+    name = str(raw.get('name') or '').strip()
+    if not name:
+        raise ValueError("missing name")
+    
+    match = raw.get('match') or {}
+    actions = raw.get('actions') or {}
+    unknown = [key for key in match if key not in MAIL_RULE_MATCH_KEYS] + [key for key in actions if key not in MAIL_RULE_ACTIONS]
+    if unknown:
+        raise ValueError(f"unknown keys: {', '.join(unknown)}")
+    if not match:
+        raise ValueError("empty match would apply to every message")
+    if not any(actions.values()):
+        raise ValueError("no actions")
+    
+    senders = match.get('sender', [])
+    subject_regex = match.get('subject_regex')
+    try:
+        subject_pattern = re.compile(subject_regex, re.IGNORECASE) if subject_regex else None
+    except re.error as e:
+        raise ValueError(f"bad subject_regex: {e}")
+    
+    return {
+        'name': name,
+        'enabled': raw.get('enabled', True),
+        'senders': [s.lower() for s in ([senders] if isinstance(senders, str) else senders)],
+        'subject': subject_pattern,
+        'has_labels': list(match.get('has_labels', [])),
+        'not_labels': list(match.get('not_labels', [])),
+        'older_than_days': match.get('older_than_days'),
+        'newer_than_days': match.get('newer_than_days'),
+        'add_labels': list(actions.get('add_labels', [])),
+        'remove_labels': list(actions.get('remove_labels', [])),
+        'archive': bool(actions.get('archive')),
+        'mark_read': bool(actions.get('mark_read')),
+        'star': bool(actions.get('star')),
+        'important': bool(actions.get('important')),
+        'stop': bool(raw.get('stop'))
+    }
+
+def load_mail_rules():
+    """(Re)load MAIL_RULES_FILE; a broken file keeps the rules already loaded"""
+    global mail_rules, mail_rules_mtime
+    
+    if not os.path.exists(MAIL_RULES_FILE):
+        mail_rules, mail_rules_mtime = [], None
+        return mail_rules
+    
+    try:
+        mtime = os.path.getmtime(MAIL_RULES_FILE)
+        with open(MAIL_RULES_FILE, 'r', encoding='utf-8') as f:
+            raw_rules = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ Could not read {MAIL_RULES_FILE}: {e} - keeping current rules")
+        return mail_rules
+    if not isinstance(raw_rules, list):
+        print(f"❌ {MAIL_RULES_FILE} must hold a JSON list of rules - keeping current rules")
+        return mail_rules
+    
+    rules = []
+    for raw in raw_rules:
+        if not isinstance(raw, dict):
+            print(f"⚠️ Skipping mail rule {raw!r}: not an object")
+            continue
+        try:
+            rules.append(_validate_mail_rule(raw))
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"⚠️ Skipping mail rule {raw.get('name', '?')}: {e}")
+    
+    mail_rules, mail_rules_mtime = rules, mtime
+    print(f"📋 Loaded {len(rules)} mail rules from {MAIL_RULES_FILE}")
+    return rules
+
+def current_mail_rules():
+    """The rule list, reloaded first if the file changed on disk"""
+    mtime = os.path.getmtime(MAIL_RULES_FILE) if os.path.exists(MAIL_RULES_FILE) else None
+    if mtime != mail_rules_mtime:
+        load_mail_rules()
+    return [rule for rule in mail_rules if rule['enabled']]
+
+def _label_ids_for(names, catalog):
+    """(label IDs, names not found) for rule label names (system IDs like INBOX pass through)"""
+    ids, missing = [], []
+    for name in names:
+        label = catalog.get(name.lower())
+        if label:
+            ids.append(label['id'])
+        elif name.isupper():
+            ids.append(name)
+        else:
+            missing.append(name)
+    return ids, missing
+
+def _resolve_rule_labels(rule, catalog):
+    """A rule's label names as IDs, once per pass
+    
+    An unknown has_labels name makes the rule match nothing (has_ids is None) -
+    skipping it would widen the rule to every message. Unknown not_labels and
+    action labels are just left out.
+    """
+    has_ids, has_missing = _label_ids_for(rule['has_labels'], catalog)
+    not_ids, not_missing = _label_ids_for(rule['not_labels'], catalog)
+    add_ids, add_missing = _label_ids_for(rule['add_labels'], catalog)
+    remove_ids, remove_missing = _label_ids_for(rule['remove_labels'], catalog)
+    if has_missing:
+        print(f"⚠️ Mail rule '{rule['name']}' skipped - has_labels not found: {', '.join(has_missing)}")
+    ignored = not_missing + add_missing + remove_missing
+    if ignored:
+        print(f"⚠️ Mail rule '{rule['name']}' labels not found - ignoring: {', '.join(ignored)}")
+    return {
+        'has': None if has_missing else has_ids,
+        'not': not_ids,
+        'add': set(add_ids),
+        'remove': set(remove_ids)
+    }
+
+def _mail_rule_matches(rule, record, label_ids, now_ms):
+    """Whether an index record satisfies every condition of a rule"""
+    if label_ids['has'] is None:
+        return False
+    if rule['senders'] and not any(s in record['sender'].lower() for s in rule['senders']):
+        return False
+    if rule['subject'] and not rule['subject'].search(record['subject'] or ''):
+        return False
+    
+    labels = record['labels']
+    if any(f" {label_id} " not in labels for label_id in label_ids['has']):
+        return False
+    if any(f" {label_id} " in labels for label_id in label_ids['not']):
+        return False
+    
+    age_days = (now_ms - record['internal_date']) / 86400000
+    if rule['older_than_days'] is not None and age_days < rule['older_than_days']:
+        return False
+    if rule['newer_than_days'] is not None and age_days > rule['newer_than_days']:
+        return False
+    return True
+
+def _mail_rule_changes(rule, label_ids):
+    """(labels to add, labels to remove) for a rule's actions"""
+    add = set(label_ids['add'])
+    remove = set(label_ids['remove'])
+    if rule['archive']:
+        remove.add('INBOX')
+    if rule['mark_read']:
+        remove.add('UNREAD')
+    if rule['star']:
+        add.add('STARRED')
+    if rule['important']:
+        add.add('IMPORTANT')
+    return add, remove - add
+
+def apply_mail_rules(records, dry_run=False):
+    """Run the rules over index records, batching identical label changes together
+    
+    Returns {rule name: messages matched}.
+    """
+    rules = current_mail_rules()
+    if not rules or not records:
+        return {}
+    
+    catalog = label_catalog()
+    resolved = [(rule, _resolve_rule_labels(rule, catalog)) for rule in rules]
+    now_ms = time.time() * 1000
+    hits = defaultdict(int)
+    changes = {}
+    
+    for record in records:
+        add, remove = set(), set()
+        for rule, label_ids in resolved:
+            if not _mail_rule_matches(rule, record, label_ids, now_ms):
+                continue
+            hits[rule['name']] += 1
+            rule_add, rule_remove = _mail_rule_changes(rule, label_ids)
+            add |= rule_add
+            remove |= rule_remove
+            if rule['stop']:
+                break
+        # Drop changes the message already has
+        add = {label_id for label_id in add if f" {label_id} " not in record['labels']}
+        remove = {label_id for label_id in remove - add if f" {label_id} " in record['labels']}
+        if add or remove:
+            changes[record['id']] = (frozenset(add), frozenset(remove))
+    
+    if not dry_run:
+        groups = defaultdict(list)
+        for message_id, change in changes.items():
+            groups[change].append(message_id)
+        for (add, remove), message_ids in groups.items():
+            batch_modify_messages(message_ids, add_label_ids=add, remove_label_ids=remove)
+        
+        for name, count in hits.items():
+            mail_rule_hits[name] += count
+        mail_rules_last_run.update(at=datetime.now(pytz.timezone('America/Toronto')), checked=len(records), changed=len(changes))
+        if changes:
+            print(f"📋 Mail rules changed {len(changes)} of {len(records)} new messages")
+    
+    return dict(hits)
+
+def run_mail_rules_over_index(days=7, dry_run=False):
+    """Apply the rules to everything indexed in the last N days (for age-based rules)"""
+    if not init_mail_index():
+        return None
+    cutoff_ms = (time.time() - days * 86400) * 1000
+    with mail_index_db() as conn:
+        records = [dict(row) for row in conn.execute('SELECT * FROM messages WHERE internal_date >= ?', (cutoff_ms,))]
+    return apply_mail_rules(records, dry_run=dry_run), len(records)
+
 # ============================================================================
 # ADVANCED EMAIL MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -1506,39 +3210,90 @@ def get_email_attachments(email_id):
     except Exception as e:
         return f"❌ Error getting attachments: {str(e)}"
 
-def get_email_thread(thread_id):
-    """Get all emails in a conversation thread"""
+# Thread summaries keyed by thread id, valid while the thread's historyId is unchanged
+THREAD_CACHE_SIZE = int(os.getenv('THREAD_CACHE_SIZE', '64'))
+THREAD_CACHE_TTL_SECONDS = int(os.getenv('THREAD_CACHE_TTL_SECONDS', '60'))
+THREAD_PAGE_SIZE = 20
+THREAD_HEADERS = ['From', 'Subject', 'Date']
+thread_summary_cache = OrderedDict()  # thread_id -> (history_id, checked_at, summaries)
+thread_summary_lock = threading.Lock()
+
+def _thread_summaries(thread_id):
+    """(sender, subject, date_str) per message, from cache or a metadata-only fetch"""
+    threads = gmail_service.users().threads()
+    
+    with thread_summary_lock:
+        cached = thread_summary_cache.get(thread_id)
+        if cached:
+            thread_summary_cache.move_to_end(thread_id)
+    if cached and time.monotonic() - cached[1] < THREAD_CACHE_TTL_SECONDS:
+        return cached[2]
+    
+    if cached:
+        # A tiny request tells whether anything in the thread changed
+        current = threads.get(userId='me', id=thread_id, format='minimal', fields='historyId').execute()
+        if current.get('historyId') == cached[0]:
+            with thread_summary_lock:
+                thread_summary_cache[thread_id] = (cached[0], time.monotonic(), cached[2])
+            return cached[2]
+    
+    thread = threads.get(
+        userId='me',
+        id=thread_id,
+        format='metadata',
+        metadataHeaders=THREAD_HEADERS,
+        fields='historyId,messages(payload/headers)'
+    ).execute()
+    
+    summaries = []
+    for msg in thread.get('messages', []):
+        headers = msg['payload'].get('headers', [])
+        sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown')
+        subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
+        date = next((h['value'] for h in headers if h['name'] == 'Date'), 'No Date')
+        
+        # Parse date
+        try:
+            parsed_date = parsedate_to_datetime(date)
+            date_str = parsed_date.strftime('%m/%d at %-I:%M %p')
+        except:
+            date_str = date
+        
+        summaries.append((sender, subject, date_str))
+    
+    with thread_summary_lock:
+        thread_summary_cache[thread_id] = (thread.get('historyId'), time.monotonic(), summaries)
+        thread_summary_cache.move_to_end(thread_id)
+        while len(thread_summary_cache) > THREAD_CACHE_SIZE:
+            thread_summary_cache.popitem(last=False)
+    return summaries
+
+def get_email_thread(thread_id, page=1, page_size=THREAD_PAGE_SIZE):
+    """Get all emails in a conversation thread (headers only, one page at a time)"""
     if not gmail_service:
         return "❌ Gmail service not available"
     
     try:
-        thread = gmail_service.users().threads().get(
-            userId='me',
-            id=thread_id
-        ).execute()
+        summaries = _thread_summaries(thread_id)
         
-        messages = thread.get('messages', [])
-        
-        if not messages:
+        if not summaries:
             return "📧 No messages found in thread"
         
+        page_size = max(1, int(page_size))
+        pages = (len(summaries) + page_size - 1) // page_size
+        page = min(max(1, int(page)), pages)
+        first = (page - 1) * page_size
+        
         thread_summary = []
-        for i, msg in enumerate(messages):
-            headers = msg['payload'].get('headers', [])
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown')
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-            date = next((h['value'] for h in headers if h['name'] == 'Date'), 'No Date')
-            
-            # Parse date
-            try:
-                parsed_date = parsedate_to_datetime(date)
-                date_str = parsed_date.strftime('%m/%d at %-I:%M %p')
-            except:
-                date_str = date
-            
+        for i, (sender, subject, date_str) in enumerate(summaries[first:first + page_size], start=first):
             thread_summary.append(f"{i+1}. **{subject}**\n   From: {sender}\n   Date: {date_str}")
         
-        return f"🧵 **Conversation Thread ({len(messages)} messages):**\n\n" + "\n\n".join(thread_summary)
+        header = f"🧵 **Conversation Thread ({len(summaries)} messages):**\n\n"
+        if pages > 1:
+            header = f"🧵 **Conversation Thread ({len(summaries)} messages, page {page}/{pages}):**\n\n"
+            if page < pages:
+                thread_summary.append(f"➡️ More: page {page + 1} of {pages}")
+        return header + "\n\n".join(thread_summary)
         
     except HttpError as e:
         return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
@@ -1588,7 +3343,6 @@ def archive_old_emails(days_old=30, max_archive=50):
     
     try:
         # Calculate date
-        from datetime import datetime, timedelta
         cutoff_date = (datetime.now() - timedelta(days=days_old)).strftime('%Y/%m/%d')
         query = f"before:{cutoff_date} in:inbox"
         
@@ -1628,7 +3382,6 @@ def delete_by_subject_pattern(pattern, max_delete=25):
         return "❌ Gmail service not available"
     
     try:
-        import re
         query = f'subject:"{pattern}"'
         
         results = gmail_service.users().messages().list(
@@ -1649,6 +3402,7 @@ def delete_by_subject_pattern(pattern, max_delete=25):
                     userId='me',
                     id=msg['id']
                 ).execute()
+                forget_indexed_messages([msg['id']])
                 deleted_count += 1
             except:
                 continue
@@ -1666,8 +3420,7 @@ def list_email_labels():
         return "❌ Gmail service not available"
     
     try:
-        labels_result = gmail_service.users().labels().list(userId='me').execute()
-        labels = labels_result.get('labels', [])
+        labels = list(label_catalog().values())
         
         if not labels:
             return "📝 No labels found"
@@ -1701,6 +3454,46 @@ def list_email_labels():
     except Exception as e:
         return f"❌ Error listing labels: {str(e)}"
 
+def apply_label_to_query(query, label_name, max_messages=500):
+    """Label every message matching a search with one list pass and batched modifies"""
+    if not gmail_service:
+        return "❌ Gmail service not available"
+    if not (query or '').strip():
+        # An empty search is the whole mailbox
+        return "❌ Please specify a search query for the emails to label"
+    
+    try:
+        label_id = find_label_id(label_name)
+        if not label_id:
+            return f"❌ Label '{label_name}' not found"
+        
+        message_ids = []
+        page_token = None
+        while len(message_ids) < max_messages:
+            results = gmail_service.users().messages().list(
+                userId='me',
+                q=query,
+                maxResults=min(500, max_messages - len(message_ids)),
+                pageToken=page_token,
+                fields='messages/id,nextPageToken'
+            ).execute()
+            message_ids.extend(msg['id'] for msg in results.get('messages', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+        
+        if not message_ids:
+            return f"📧 No emails found matching '{query}'"
+        
+        batch_modify_messages(message_ids, add_label_ids=[label_id])
+        
+        return f"✅ **Label '{label_name}' applied to {len(message_ids)} emails** matching '{query}'"
+        
+    except HttpError as e:
+        return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
+    except Exception as e:
+        return f"❌ Error applying label: {str(e)}"
+
 def create_email_filter(criteria, actions):
     """Create a Gmail filter (simplified version)"""
     if not gmail_service:
@@ -1766,58 +3559,275 @@ def list_email_filters():
         return f"❌ Error listing filters: {str(e)}"
 
 # ============================================================================
-# CALENDAR VIEW FUNCTIONS (ALL PRESERVED)
+# ATTACHMENT STORE (STREAMED TO DISK, CONTENT-ADDRESSED)
 # ============================================================================
 
-def get_work_schedule(time_filter=None):
-    """Get work calendar schedule - for Vivian's reports"""
-    if not calendar_service or not GMAIL_WORK_CALENDAR_ID:
-        return "❌ Work calendar not available"
+# Downloads land in <dir>/<sha256[:2]>/<sha256>; identical files are stored once
+ATTACHMENT_STORE_DIR = os.getenv('ATTACHMENT_STORE_DIR', 'attachments')
+ATTACHMENT_DOWNLOAD_WORKERS = int(os.getenv('ATTACHMENT_DOWNLOAD_WORKERS', '4'))
+ATTACHMENT_CHUNK_BYTES = 64 * 1024
+
+# Own pool - these use requests sessions, not the httplib2 clients of the Google pool
+attachment_executor = concurrent.futures.ThreadPoolExecutor(max_workers=ATTACHMENT_DOWNLOAD_WORKERS, thread_name_prefix='attachments')
+_attachment_sessions = threading.local()
+
+GMAIL_ATTACHMENT_URL = 'https://gmail.googleapis.com/gmail/v1/users/me/messages/{message_id}/attachments/{attachment_id}'
+
+def _init_attachment_table():
+    with mail_index_db() as conn:
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS attachments (
+                message_id TEXT NOT NULL,
+                part_id TEXT NOT NULL,
+                filename TEXT,
+                mime_type TEXT,
+                size INTEGER,
+                sha256 TEXT NOT NULL,
+                stored_at TEXT,
+                PRIMARY KEY (message_id, part_id)
+            )"""
+        )
+
+def _attachment_session():
+    """This thread's authorized requests session (rebuilt when the credential is swapped)"""
+    session = getattr(_attachment_sessions, 'session', None)
+    if session is None or session.credentials is not oauth_credentials:
+        session = google_auth_requests.AuthorizedSession(oauth_credentials)
+        _attachment_sessions.session = session
+    return session
+
+def _stream_json_string_field(chunks, field):
+    """Yield the value of a top-level JSON string field piece by piece, never holding it whole
+    
+    Only for values without escapes - base64url attachment data qualifies.
+    """
+    opening = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+    prefix = ''
+    in_value = False
+    for chunk in chunks:
+        text = chunk.decode('ascii') if isinstance(chunk, bytes) else chunk
+        if not in_value:
+            prefix += text
+            match = opening.search(prefix)
+            if not match:
+                continue
+            in_value = True
+            text = prefix[match.end():]
+            prefix = ''
+        end = text.find('"')
+        if end >= 0:
+            yield text[:end]
+            return
+        yield text
+    if not in_value:
+        raise ValueError(f"field '{field}' not found in response")
+
+def _write_base64url_stream(pieces, destination):
+    """Decode base64url pieces 4-aligned into destination; returns (sha256 hex, byte count)"""
+    digest = hashlib.sha256()
+    size = 0
+    carry = ''
+    for piece in pieces:
+        carry += piece
+        usable = len(carry) - len(carry) % 4
+        if not usable:
+            continue
+        data = base64.urlsafe_b64decode(carry[:usable])
+        carry = carry[usable:]
+        destination.write(data)
+        digest.update(data)
+        size += len(data)
+    if carry:
+        data = base64.urlsafe_b64decode(carry + '=' * (-len(carry) % 4))
+        destination.write(data)
+        digest.update(data)
+        size += len(data)
+    return digest.hexdigest(), size
+
+def _store_attachment_stream(pieces):
+    """Stream decoded bytes to a temp file, then file it under its hash (or drop it if known)"""
+    os.makedirs(ATTACHMENT_STORE_DIR, exist_ok=True)
+    temp_path = os.path.join(ATTACHMENT_STORE_DIR, f".incoming.{os.getpid()}.{threading.get_ident()}")
+    try:
+        with open(temp_path, 'wb') as f:
+            sha256, size = _write_base64url_stream(pieces, f)
+        final_path = os.path.join(ATTACHMENT_STORE_DIR, sha256[:2], sha256)
+        if os.path.exists(final_path):
+            os.remove(temp_path)
+            return sha256, size, final_path, True
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(temp_path, final_path)
+        return sha256, size, final_path, False
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def _attachment_parts(payload):
+    """Every named part (attachment) in a message payload, depth-first"""
+    found = []
+    if payload.get('filename'):
+        found.append(payload)
+    for part in payload.get('parts', []):
+        found.extend(_attachment_parts(part))
+    return found
+
+def download_attachment_part(message_id, part):
+    """Store one attachment part; returns a result dict (never raises)"""
+    filename = part.get('filename') or 'attachment'
+    try:
+        with mail_index_db() as conn:
+            known = conn.execute(
+                'SELECT sha256, size FROM attachments WHERE message_id = ? AND part_id = ?',
+                (message_id, part.get('partId', ''))
+            ).fetchone()
+        if known:
+            path = os.path.join(ATTACHMENT_STORE_DIR, known['sha256'][:2], known['sha256'])
+            if os.path.exists(path):
+                return {'filename': filename, 'path': path, 'size': known['size'], 'status': 'cached'}
+        
+        body = part.get('body', {})
+        if body.get('data'):
+            # Small attachments come inline with the message
+            sha256, size, path, existed = _store_attachment_stream([body['data']])
+        else:
+            url = GMAIL_ATTACHMENT_URL.format(message_id=message_id, attachment_id=body['attachmentId'])
+            with _attachment_session().get(url, params={'fields': 'data'}, stream=True, timeout=GOOGLE_HTTP_TIMEOUT_SECONDS) as response:
+                response.raise_for_status()
+                pieces = _stream_json_string_field(response.iter_content(ATTACHMENT_CHUNK_BYTES), 'data')
+                sha256, size, path, existed = _store_attachment_stream(pieces)
+        
+        with mail_index_db() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO attachments (message_id, part_id, filename, mime_type, size, sha256, stored_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (message_id, part.get('partId', ''), filename, part.get('mimeType'), size, sha256,
+                 datetime.now(timezone.utc).isoformat())
+            )
+        return {'filename': filename, 'path': path, 'size': size, 'status': 'duplicate' if existed else 'downloaded'}
+    except Exception as e:
+        return {'filename': filename, 'path': None, 'size': 0, 'status': f"error: {str(e)[:80]}"}
+
+def _download_message_parts(messages):
+    """Fetch every attachment of the given full-format messages concurrently"""
+    init_mail_index()
+    _init_attachment_table()
+    jobs = [(message['id'], part) for message in messages for part in _attachment_parts(message['payload'])]
+    futures = [attachment_executor.submit(download_attachment_part, message_id, part) for message_id, part in jobs]
+    return [future.result() for future in futures]
+
+def _format_attachment_downloads(results, scope):
+    if not results:
+        return f"📎 No attachments found in this {scope}"
+    
+    icons = {'downloaded': '⬇️', 'duplicate': '♻️', 'cached': '📦'}
+    lines = []
+    for result in results:
+        if result['path']:
+            lines.append(f"{icons[result['status']]} {result['filename']} ({result['size'] / 1024:.1f}KB) → `{result['path']}`")
+        else:
+            lines.append(f"❌ {result['filename']} - {result['status']}")
+    stored = sum(1 for result in results if result['path'])
+    return f"📎 **Attachments saved ({stored}/{len(results)}):**\n" + "\n".join(lines)
+
+def download_email_attachments(email_id):
+    """Download every attachment of an email into the local attachment store"""
+    if not gmail_service:
+        return "❌ Gmail service not available"
     
     try:
-        toronto_tz = pytz.timezone('America/Toronto')
-        now = datetime.now(toronto_tz)
-        
-        # Set time range based on filter
-        if time_filter == 'noon':
-            start_time = now.replace(hour=12, minute=0, second=0, microsecond=0)
-            end_time = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        elif time_filter == 'afternoon':
-            start_time = now.replace(hour=15, minute=0, second=0, microsecond=0)
-            end_time = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        else:  # Full day
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        
-        events_result = calendar_service.events().list(
-            calendarId=GMAIL_WORK_CALENDAR_ID,
-            timeMin=start_time.isoformat(),
-            timeMax=end_time.isoformat(),
-            maxResults=25,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        events = events_result.get('items', [])
-        
-        if not events:
-            return "💼 **Work Schedule:** Clear - focus time available"
-        
-        # Format events
-        formatted_events = []
-        for event in events:
-            summary = event.get('summary', 'Untitled Meeting')
-            start = event.get('start', {})
-            if 'dateTime' in start:
-                start_dt = datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00'))
-                time_str = start_dt.astimezone(toronto_tz).strftime('%-I:%M %p')
-            else:
-                time_str = 'All day'
-            
-            formatted_events.append(f"• {time_str} - {summary}")
+        message = gmail_service.users().messages().get(userId='me', id=email_id, format='full').execute()
+        return _format_attachment_downloads(_download_message_parts([message]), "email")
+    except HttpError as e:
+        return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
+    except Exception as e:
+        return f"❌ Error downloading attachments: {str(e)}"
+
+def download_thread_attachments(thread_id):
+    """Download every attachment in a conversation, all messages at once"""
+    if not gmail_service:
+        return "❌ Gmail service not available"
+    
+    try:
+        thread = gmail_service.users().threads().get(userId='me', id=thread_id, format='full').execute()
+        return _format_attachment_downloads(_download_message_parts(thread.get('messages', [])), "thread")
+    except HttpError as e:
+        return f"❌ Gmail API error: {e.resp.status} - {e._get_reason()}"
+    except Exception as e:
+        return f"❌ Error downloading attachments: {str(e)}"
+
+# ============================================================================
+# CALENDAR VIEW FUNCTIONS (ALL PRESERVED)
+# ============================================================================
+
+def schedule_window(time_filter=None):
+    """(start, end) of today in Toronto, from noon or 3pm onwards when filtered"""
+    toronto_tz = pytz.timezone('America/Toronto')
+    now = datetime.now(toronto_tz)
+    
+    # Set time range based on filter
+    if time_filter == 'noon':
+        start_time = now.replace(hour=12, minute=0, second=0, microsecond=0)
+    elif time_filter == 'afternoon':
+        start_time = now.replace(hour=15, minute=0, second=0, microsecond=0)
+    else:  # Full day
+        start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    end_time = now.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return start_time, end_time
+
+def fetch_calendar_events(calendars, start_time, end_time, max_results=25, default_summary='Untitled Event', skip_errors=True):
+    """CalendarEvent records from several calendars, merged in start order"""
+    all_events = []
+    for calendar_name, calendar_id in calendars:
+        try:
+            events_result = calendar_service.events().list(
+                calendarId=calendar_id,
+                timeMin=start_time.isoformat(),
+                timeMax=end_time.isoformat(),
+                maxResults=max_results,
+                singleEvents=True,
+                orderBy='startTime'
+            ).execute()
+        except Exception:
+            if not skip_errors:
+                raise
+            continue
         
-        header = f"💼 **Work Schedule ({len(formatted_events)} items):**\n"
-        return header + "\n".join(formatted_events)
+        for event in events_result.get('items', []):
+            all_events.append((event.get('start', {}), CalendarEvent.from_api(event, calendar_name, default_summary)))
+    
+    # Sort by start time
+    all_events.sort(key=lambda pair: pair[0].get('dateTime', pair[0].get('date', '')))
+    return [event for _, event in all_events]
+
+def fetch_work_events(time_filter=None):
+    start_time, end_time = schedule_window(time_filter)
+    return fetch_calendar_events([('Work', GMAIL_WORK_CALENDAR_ID)], start_time, end_time,
+                                 default_summary='Untitled Meeting', skip_errors=False)
+
+def fetch_personal_events(time_filter=None):
+    start_time, end_time = schedule_window(time_filter)
+    # Get personal calendars (exclude work calendar)
+    personal_calendars = [(name, cal_id) for name, cal_id in accessible_calendars 
+                         if cal_id != GMAIL_WORK_CALENDAR_ID]
+    return fetch_calendar_events(personal_calendars, start_time, end_time)
+
+def fetch_upcoming_events(days=7):
+    start_time = datetime.now(pytz.timezone('America/Toronto'))
+    return fetch_calendar_events(accessible_calendars, start_time, start_time + timedelta(days=days), max_results=50)
+
+def get_work_schedule(time_filter=None):
+    """Get work calendar schedule - for Vivian's reports"""
+    if not calendar_service or not GMAIL_WORK_CALENDAR_ID:
+        return "❌ Work calendar not available"
+    
+    try:
+        return render_schedule(
+            fetch_work_events(time_filter),
+            "💼 **Work Schedule",
+            "💼 **Work Schedule:** Clear - focus time available",
+            show_calendar=False
+        )
         
     except Exception as e:
         return f"❌ Error getting work schedule: {str(e)}"
@@ -1828,66 +3838,11 @@ def get_personal_schedule(time_filter=None):
         return "❌ Calendar service not available"
     
     try:
-        toronto_tz = pytz.timezone('America/Toronto')
-        now = datetime.now(toronto_tz)
-        
-        # Set time range based on filter
-        if time_filter == 'noon':
-            start_time = now.replace(hour=12, minute=0, second=0, microsecond=0)
-            end_time = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        elif time_filter == 'afternoon':
-            start_time = now.replace(hour=15, minute=0, second=0, microsecond=0)
-            end_time = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        else:  # Full day
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        
-        # Get personal calendars (exclude work calendar)
-        personal_calendars = [(name, cal_id) for name, cal_id in accessible_calendars 
-                             if cal_id != GMAIL_WORK_CALENDAR_ID]
-        
-        all_events = []
-        for calendar_name, calendar_id in personal_calendars:
-            try:
-                events_result = calendar_service.events().list(
-                    calendarId=calendar_id,
-                    timeMin=start_time.isoformat(),
-                    timeMax=end_time.isoformat(),
-                    maxResults=25,
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute()
-                
-                events = events_result.get('items', [])
-                for event in events:
-                    event['_calendar_name'] = calendar_name
-                    all_events.append(event)
-            except:
-                continue
-        
-        if not all_events:
-            return "📅 **Personal Schedule:** Clear - great for personal priorities"
-        
-        # Sort by start time
-        all_events.sort(key=lambda x: x.get('start', {}).get('dateTime', x.get('start', {}).get('date', '')))
-        
-        # Format events
-        formatted_events = []
-        for event in all_events:
-            summary = event.get('summary', 'Untitled Event')
-            calendar_name = event.get('_calendar_name', '')
-            
-            start = event.get('start', {})
-            if 'dateTime' in start:
-                start_dt = datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00'))
-                time_str = start_dt.astimezone(toronto_tz).strftime('%-I:%M %p')
-            else:
-                time_str = 'All day'
-            
-            formatted_events.append(f"• {time_str} - {summary} ({calendar_name})")
-        
-        header = f"📅 **Personal Schedule ({len(formatted_events)} items):**\n"
-        return header + "\n".join(formatted_events)
+        return render_schedule(
+            fetch_personal_events(time_filter),
+            "📅 **Personal Schedule",
+            "📅 **Personal Schedule:** Clear - great for personal priorities"
+        )
         
     except Exception as e:
         return f"❌ Error getting personal schedule: {str(e)}"
@@ -1907,69 +3862,7 @@ def get_upcoming_events(days=7):
         return "❌ Calendar service not available"
     
     try:
-        toronto_tz = pytz.timezone('America/Toronto')
-        start_time = datetime.now(toronto_tz)
-        end_time = start_time + timedelta(days=days)
-        
-        all_events = []
-        for calendar_name, calendar_id in accessible_calendars:
-            try:
-                events_result = calendar_service.events().list(
-                    calendarId=calendar_id,
-                    timeMin=start_time.isoformat(),
-                    timeMax=end_time.isoformat(),
-                    maxResults=50,
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute()
-                
-                events = events_result.get('items', [])
-                for event in events:
-                    event['_calendar_name'] = calendar_name
-                    all_events.append(event)
-            except:
-                continue
-        
-        if not all_events:
-            return f"📅 **Upcoming Events ({days} days):** No events scheduled."
-        
-        # Sort by start time
-        all_events.sort(key=lambda x: x.get('start', {}).get('dateTime', x.get('start', {}).get('date', '')))
-        
-        # Group by date and format
-        events_by_date = defaultdict(list)
-        for event in all_events:
-            summary = event.get('summary', 'Untitled Event')
-            calendar_name = event.get('_calendar_name', '')
-            
-            start = event.get('start', {})
-            if 'dateTime' in start:
-                start_dt = datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00'))
-                date_key = start_dt.astimezone(toronto_tz).strftime('%Y-%m-%d')
-                time_str = start_dt.astimezone(toronto_tz).strftime('%-I:%M %p')
-            elif 'date' in start:
-                date_key = start['date']
-                time_str = 'All day'
-            else:
-                date_key = 'Unknown'
-                time_str = 'Time TBD'
-            
-            events_by_date[date_key].append(f"  • {time_str} - {summary} ({calendar_name})")
-        
-        # Format output
-        formatted_output = [f"📅 **Upcoming Events (Next {days} days):**\n"]
-        for date_key in sorted(events_by_date.keys()):
-            try:
-                date_obj = datetime.strptime(date_key, '%Y-%m-%d')
-                date_display = date_obj.strftime('%A, %B %-d')
-            except:
-                date_display = date_key
-            
-            formatted_output.append(f"**{date_display}:**")
-            formatted_output.extend(events_by_date[date_key])
-            formatted_output.append("")
-        
-        return "\n".join(formatted_output)
+        return render_upcoming_events(fetch_upcoming_events(days), days)
         
     except Exception as e:
         return f"❌ Error getting upcoming events: {str(e)}"
@@ -2025,6 +3918,122 @@ async def web_search(query, max_results=5):
         print(f"❌ Web search error: {e}")
         return f"🔍 Search error: {str(e)}"
 
+# ============================================================================
+# COMPACT TOOL OUTPUT (TERSE JSON/TSV FOR THE ASSISTANT)
+# ============================================================================
+
+# 'compact' sends the assistant TSV/JSON and de-decorated text; 'markdown' sends the Discord text
+TOOL_OUTPUT_FORMAT = os.getenv('TOOL_OUTPUT_FORMAT', 'compact')
+
+# Characters of tool output per call - long lists are cut at a row boundary
+TOOL_OUTPUT_DEFAULT_BUDGET = int(os.getenv('TOOL_OUTPUT_BUDGET', '1500'))
+TOOL_OUTPUT_BUDGETS = {
+    'get_recent_emails': 3000,
+    'search_emails': 3000,
+    'smart_email_search': 3000,
+    'advanced_email_search': 3000,
+    'get_upcoming_events': 3000,
+    'list_gcal_events': 2500,
+    'get_today_schedule': 2000,
+    'get_thread': 2500,
+    'get_email_thread': 2500,
+    'debug_email_senders': 2000,
+    'find_free_time': 2000,
+    'get_email_stats': 300
+}
+
+# Status emoji carry meaning the assistant needs; every other symbol is decoration
+TOOL_STATUS_MARKERS = {'✅': 'OK:', '❌': 'ERROR:', '⚠️': 'WARNING:', '⚠': 'WARNING:'}
+
+def records_or_text(service, fetch, render_text, *args, **kwargs):
+    """Records for compact tool output, else (or with the service down) the Markdown helper"""
+    if TOOL_OUTPUT_FORMAT == 'compact' and service:
+        return fetch(*args, **kwargs)
+    return render_text(*args, **kwargs)
+
+def fetch_today_events():
+    """Today's work and personal events as one start-ordered list"""
+    events = fetch_personal_events()
+    if GMAIL_WORK_CALENDAR_ID:
+        # Like the Markdown schedule: a failing work calendar still leaves the personal events
+        try:
+            events = fetch_work_events() + events
+        except Exception as e:
+            print(f"⚠️ Work calendar unavailable for today's events: {e}")
+    return sorted(events, key=lambda event: (event.date or '', event.start.isoformat() if event.start else ''))
+
+def _tsv_cell(value):
+    return ' '.join(str(value if value is not None else '').split())
+
+def encode_tsv(columns, rows):
+    return '\n'.join(['\t'.join(columns)] + ['\t'.join(_tsv_cell(cell) for cell in row) for row in rows])
+
+def encode_tool_records(value):
+    """TSV for record lists, one-line JSON for stats"""
+    if isinstance(value, MailStats):
+        return json.dumps({
+            'days': value.days, 'received': value.total_received, 'unread': value.unread,
+            'today': value.today, 'daily_avg': value.daily_average
+        }, separators=(',', ':'))
+    
+    if not value:
+        return 'no results'
+    if isinstance(value[0], MailItem):
+        with_body = any(item.body for item in value)
+        columns = ['id', 'date', 'from', 'subject'] + (['preview'] if with_body else [])
+        rows = []
+        for item in value:
+            row = [item.id, item.date_str, item.sender, item.subject]
+            if with_body:
+                row.append((item.body or '')[:200])
+            rows.append(row)
+        return encode_tsv(columns, rows)
+    if isinstance(value[0], CalendarEvent):
+        return encode_tsv(
+            ['date', 'time', 'summary', 'calendar'],
+            [[event.date, event.start.strftime('%H:%M') if event.start else 'all-day', event.summary, event.calendar_name] for event in value]
+        )
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+def compact_tool_text(text):
+    """Strip the Discord decoration (bold, emoji, blank lines) from a helper's Markdown"""
+    lines = []
+    for line in str(text).replace('**', '').splitlines():
+        line = line.strip()
+        marker = next((label for emoji, label in TOOL_STATUS_MARKERS.items() if line.startswith(emoji)), None)
+        line = ''.join(ch for ch in line if unicodedata.category(ch) != 'So' and ch not in '\ufe0f\u200d')
+        line = ' '.join(line.split())
+        if marker:
+            line = f"{marker} {line}"
+        if line:
+            lines.append(line)
+    return '\n'.join(lines)
+
+def fit_tool_output(function_name, text):
+    """Truncate to the tool's budget at a line boundary, saying how much was dropped"""
+    budget = TOOL_OUTPUT_BUDGETS.get(function_name, TOOL_OUTPUT_DEFAULT_BUDGET)
+    if len(text) <= budget:
+        return text
+    
+    lines = text.split('\n')
+    kept, used = [], 0
+    for line in lines:
+        if used + len(line) + 1 > budget - 40:
+            break
+        kept.append(line)
+        used += len(line) + 1
+    if not kept:
+        return text[:budget - 20] + ' ...[truncated]'
+    return '\n'.join(kept) + f"\n...[{len(lines) - len(kept)} more lines truncated]"
+
+def format_tool_output(function_name, result):
+    """What the assistant sees for one tool call"""
+    if TOOL_OUTPUT_FORMAT != 'compact':
+        return str(result)
+    if isinstance(result, str):
+        return fit_tool_output(function_name, compact_tool_text(result))
+    return fit_tool_output(function_name, encode_tool_records(result))
+
 # ============================================================================
 # ENHANCED FUNCTION HANDLING WITH ALL CAPABILITIES (PRESERVED)
 # ============================================================================
@@ -2032,10 +4041,18 @@ async def web_search(query, max_results=5):
 def handle_rose_functions_enhanced(run, thread_id):
     """Enhanced function handler for Rose's full capabilities"""
     tool_outputs = []
+    # Outbound mail reports back to the conversation's channel; a retried call in the same thread is deduplicated
+    conversation_thread_id = thread_id
+    conversation = conversation_metadata.get(thread_id, {})
     
     for tool_call in run.required_action.submit_tool_outputs.tool_calls:
         function_name = tool_call.function.name
         arguments = json.loads(tool_call.function.arguments)
+        outbox_context = {
+            'channel_id': conversation.get('channel_id'),
+            'idempotency_key': arguments.pop('idempotency_key', None),
+            'scope': conversation_thread_id
+        }
         
         print(f"🔧 Executing function: {function_name}")
         print(f"📋 Arguments: {arguments}")
@@ -2062,7 +4079,7 @@ def handle_rose_functions_enhanced(run, thread_id):
                 count = arguments.get('count', 10)
                 unread_only = arguments.get('unread_only', False)
                 include_body = arguments.get('include_body', False)
-                result = get_recent_emails(count, unread_only, include_body)
+                result = records_or_text(gmail_service, fetch_recent_emails, get_recent_emails, count, unread_only, include_body)
             elif function_name == "search_emails":
                 query = arguments.get('query', '')
                 max_results = arguments.get('max_results', 10)
@@ -2070,7 +4087,7 @@ def handle_rose_functions_enhanced(run, thread_id):
                 result = search_emails(query, max_results, include_body)
             elif function_name == "get_email_stats":
                 days = arguments.get('days', 7)
-                result = get_email_stats(days)
+                result = records_or_text(gmail_service, fetch_email_stats, get_email_stats, days)
             elif function_name == "delete_emails_from_sender":
                 sender_email = arguments.get('sender_email', '')
                 max_delete = arguments.get('max_delete', 50)
@@ -2146,16 +4163,25 @@ def handle_rose_functions_enhanced(run, thread_id):
                 body = arguments.get('body', '') or arguments.get('message', '')
                 cc = arguments.get('cc', '')
                 bcc = arguments.get('bcc', '')
-                result = send_email(to, subject, body, cc, bcc)
+                result = queue_outbound_email(
+                    'send', {'to': to, 'subject': subject, 'body': body, 'cc': cc, 'bcc': bcc},
+                    f"email to {to}: {subject}", **outbox_context
+                )
             elif function_name == "reply_to_email":
                 email_id = arguments.get('email_id', '') or arguments.get('id', '')
                 reply_body = arguments.get('reply_body', '') or arguments.get('message', '') or arguments.get('body', '')
-                result = reply_to_email(email_id, reply_body)
+                result = queue_outbound_email(
+                    'reply', {'email_id': email_id, 'reply_body': reply_body},
+                    f"reply to email {email_id}", **outbox_context
+                )
             elif function_name == "forward_email":
                 email_id = arguments.get('email_id', '') or arguments.get('id', '')
                 to = arguments.get('to', '') or arguments.get('recipient', '')
                 forward_message = arguments.get('forward_message', '') or arguments.get('message', '')
-                result = forward_email(email_id, to, forward_message)
+                result = queue_outbound_email(
+                    'forward', {'email_id': email_id, 'to': to, 'forward_message': forward_message},
+                    f"forward of email {email_id} to {to}", **outbox_context
+                )
                 
             # Email organization functions
             elif function_name == "mark_as_read" or function_name == "mark_email_as_read":
@@ -2186,9 +4212,16 @@ def handle_rose_functions_enhanced(run, thread_id):
             elif function_name == "get_attachments" or function_name == "get_email_attachments":
                 email_id = arguments.get('email_id', '') or arguments.get('id', '')
                 result = get_email_attachments(email_id)
+            elif function_name == "download_attachments" or function_name == "download_email_attachments":
+                email_id = arguments.get('email_id', '') or arguments.get('id', '')
+                result = download_email_attachments(email_id)
+            elif function_name == "download_thread_attachments":
+                result = download_thread_attachments(arguments.get('thread_id', '') or arguments.get('id', ''))
             elif function_name == "get_thread" or function_name == "get_email_thread":
                 thread_id = arguments.get('thread_id', '') or arguments.get('id', '')
-                result = get_email_thread(thread_id)
+                page = arguments.get('page', 1)
+                page_size = arguments.get('page_size', THREAD_PAGE_SIZE)
+                result = get_email_thread(thread_id, page, page_size)
             elif function_name == "mark_all_as_read":
                 query = arguments.get('query', 'is:unread')
                 result = mark_all_as_read(query)
@@ -2202,6 +4235,14 @@ def handle_rose_functions_enhanced(run, thread_id):
                 result = delete_by_subject_pattern(pattern, max_delete)
             elif function_name == "list_labels" or function_name == "list_email_labels":
                 result = list_email_labels()
+            elif function_name == "create_label" or function_name == "create_email_label":
+                label_name = arguments.get('label_name', '') or arguments.get('label', '') or arguments.get('name', '')
+                result = create_email_label(label_name)
+            elif function_name == "apply_label_to_query" or function_name == "label_emails":
+                query = arguments.get('query', '')
+                label_name = arguments.get('label_name', '') or arguments.get('label', '')
+                max_messages = arguments.get('max_messages', 500) or arguments.get('count', 500)
+                result = apply_label_to_query(query, label_name, max_messages)
             elif function_name == "create_filter" or function_name == "create_email_filter":
                 criteria = arguments.get('criteria', {})
                 actions = arguments.get('actions', {})
@@ -2232,10 +4273,10 @@ def handle_rose_functions_enhanced(run, thread_id):
             
             # Calendar view functions
             elif function_name == "get_today_schedule":
-                result = get_today_schedule()
+                result = records_or_text(calendar_service, fetch_today_events, get_today_schedule)
             elif function_name == "get_upcoming_events":
                 days = arguments.get('days', 7)
-                result = get_upcoming_events(days)
+                result = records_or_text(calendar_service, fetch_upcoming_events, get_upcoming_events, days)
             elif function_name == "get_morning_briefing":
                 # Return actual briefing data with live weather
                 result = f"🌅 **Morning Briefing**\n{get_weather_briefing()}\n\n📅 **Schedule:** Available via calendar functions\n💌 **Email:** Available via email functions"
@@ -2249,12 +4290,13 @@ def handle_rose_functions_enhanced(run, thread_id):
             else:
                 result = f"❌ Function '{function_name}' not implemented."
             
+            output = format_tool_output(function_name, result)
             tool_outputs.append({
                 "tool_call_id": tool_call.id,
-                "output": str(result)
+                "output": output
             })
             
-            print(f"✅ Function result: {result}")
+            print(f"✅ Function result ({len(output)} chars): {output}")
             
         except Exception as e:
             error_msg = f"❌ Error in {function_name}: {str(e)}"
@@ -2268,6 +4310,305 @@ def handle_rose_functions_enhanced(run, thread_id):
     
     return tool_outputs
 
+# ============================================================================
+# THREAD LIFECYCLE (TOKEN BUDGETS & SUMMARY ROLLOVER)
+# ============================================================================
+
+# Once a thread's messages add up to this many tokens the conversation continues in a
+# fresh thread seeded with a summary, so run latency doesn't creep up over weeks
+THREAD_TOKEN_BUDGET = int(os.getenv('THREAD_TOKEN_BUDGET', '20000'))
+# Each run only reads this many of the most recent messages
+THREAD_TRUNCATION_LAST_MESSAGES = int(os.getenv('THREAD_TRUNCATION_LAST_MESSAGES', '20'))
+# Roll over before much falls out of that window, so older context is summarized rather than dropped
+THREAD_MAX_MESSAGES = int(os.getenv('THREAD_MAX_MESSAGES', str(THREAD_TRUNCATION_LAST_MESSAGES * 2)))
+THREAD_SUMMARY_MODEL = os.getenv('THREAD_SUMMARY_MODEL', 'gpt-4o-mini')
+THREAD_SUMMARY_SOURCE_MESSAGES = 40
+THREAD_SUMMARY_SOURCE_CHARS = 16000
+
+def run_truncation_strategy():
+    return {'type': 'last_messages', 'last_messages': THREAD_TRUNCATION_LAST_MESSAGES}
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token) for text we haven't been billed for yet"""
+    return len(text or '') // 4 + 1
+
+def new_conversation_thread(user_id, channel_id, seed_messages=None, previous=None):
+    """Create a thread for a user and start tracking it"""
+    thread = client.beta.threads.create(messages=seed_messages or [])
+    user_conversations[user_id] = thread.id
+    conversation_metadata[thread.id] = {
+        'user_id': user_id,
+        'channel_id': channel_id,
+        'created_at': time.time(),
+        'tokens': sum(estimate_tokens(m['content']) for m in seed_messages or []),
+        'messages': len(seed_messages or []),
+        'runs': 0,
+        'rollovers': previous['rollovers'] + 1 if previous else 0
+    }
+    return thread.id
+
+def final_step_usage(thread_id, run):
+    """Usage of a run's last step - run.usage sums every step, so a tool-using run overstates its context"""
+    try:
+        steps = client.beta.threads.runs.steps.list(thread_id=thread_id, run_id=run.id, order='desc', limit=1)
+        return steps.data[0].usage if steps.data else None
+    except Exception as e:
+        print(f"⚠️ Couldn't read run steps: {e}")
+        return None
+
+def record_thread_usage(thread_id, run, user_text='', reply_text='', multi_step=False):
+    """Grow a thread's size by the exchange it just gained
+    
+    The billed prompt can't be used: truncation caps it at the last messages, so it
+    stops growing long before the thread does. The reply is counted from the final
+    step's completion tokens when available.
+    """
+    metadata = conversation_metadata.setdefault(thread_id, {'tokens': 0, 'messages': 0, 'runs': 0, 'rollovers': 0})
+    metadata['runs'] = metadata.get('runs', 0) + 1
+    metadata['messages'] = metadata.get('messages', 0) + 2  # the user's message and the reply
+    usage = final_step_usage(thread_id, run) if multi_step else getattr(run, 'usage', None)
+    reply_tokens = usage.completion_tokens if usage and usage.completion_tokens else estimate_tokens(reply_text)
+    metadata['tokens'] = metadata.get('tokens', 0) + estimate_tokens(user_text) + reply_tokens
+
+def summarize_thread(thread_id):
+    """A short summary of a thread's recent messages, for seeding its successor"""
+    messages = client.beta.threads.messages.list(thread_id=thread_id, order='desc', limit=THREAD_SUMMARY_SOURCE_MESSAGES)
+    transcript = []
+    used = 0
+    for msg in messages.data:
+        text = ' '.join(part.text.value for part in msg.content if getattr(part, 'type', '') == 'text')
+        line = f"{msg.role}: {text}"
+        if used + len(line) > THREAD_SUMMARY_SOURCE_CHARS:
+            break
+        transcript.append(line)
+        used += len(line)
+    transcript.reverse()
+    if not transcript:
+        return None
+    
+    try:
+        completion = client.chat.completions.create(
+            model=THREAD_SUMMARY_MODEL,
+            messages=[
+                {'role': 'system', 'content': 'Summarize this assistant conversation for continuity in under 200 words: '
+                                              'open tasks, decisions, preferences, names, dates and IDs still relevant. No preamble.'},
+                {'role': 'user', 'content': '\n'.join(transcript)}
+            ],
+            max_tokens=400
+        )
+        return completion.choices[0].message.content.strip()
+    except Exception as e:
+        # Still better than starting blank: carry the last few exchanges verbatim
+        print(f"⚠️ Thread summary failed ({e}) - carrying recent messages instead")
+        return '\n'.join(transcript[-6:])[-2000:]
+
+def rollover_thread_if_needed(user_id, channel_id):
+    """The user's thread id, after moving them to a summarized new thread if over budget"""
+    thread_id = user_conversations.get(user_id)
+    if not thread_id:
+        return new_conversation_thread(user_id, channel_id)
+    
+    metadata = conversation_metadata.get(thread_id, {})
+    if metadata.get('tokens', 0) < THREAD_TOKEN_BUDGET and metadata.get('messages', 0) < THREAD_MAX_MESSAGES:
+        return thread_id
+    
+    started = time.time()
+    summary = summarize_thread(thread_id)
+    seed = [{'role': 'assistant', 'content': f"Summary of our earlier conversation:\n{summary}"}] if summary else None
+    new_thread_id = new_conversation_thread(user_id, channel_id, seed, previous=metadata)
+    conversation_metadata[new_thread_id]['previous_thread'] = thread_id
+    print(f"🔄 Thread rollover for user {user_id}: ~{metadata.get('tokens', 0):,} tokens, "
+          f"{metadata.get('messages', 0)} messages -> new thread ({time.time() - started:.1f}s)")
+    return new_thread_id
+
+# ============================================================================
+# FAST-PATH INTENT ROUTER (SIMPLE MENTIONS WITHOUT AN ASSISTANT RUN)
+# ============================================================================
+
+# Short, unambiguous requests that map straight onto a helper are answered locally;
+# anything else - or anything that asks for a change - goes to the assistant
+FAST_PATH_ENABLED = os.getenv('FAST_PATH_ENABLED', 'true').lower() == 'true'
+FAST_PATH_MAX_WORDS = 12
+# Optional semantic matching for phrasings the patterns miss (needs sentence-transformers)
+FAST_PATH_EMBEDDING_MODEL = os.getenv('FAST_PATH_EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+FAST_PATH_EMBEDDING_THRESHOLD = float(os.getenv('FAST_PATH_EMBEDDING_THRESHOLD', '0.75'))
+
+# Words that mean the user wants something done or reasoned about, not just shown
+FAST_PATH_VETO = re.compile(
+    r"\b(add|book|cancel|create|delete|remove|move|reschedule|schedule (a|an|my)|send|reply|forward|draft|write|"
+    r"archive|label|mark|unsubscribe|why|should|compare|summari[sz]e|plan|remind|from|about|with|"
+    r"attachments?|how many|count|number of)\b"
+)
+# Anything narrowing the lookup beyond what the helpers answer: other days, places, topics
+FAST_PATH_SCOPE_VETO = re.compile(
+    r"\b(yesterday|tomorrow|tonight|weekend|monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"(next|last|this coming) (week|month)|month|\d+)\b|\bin (?!my\b)\w+|\bfor\b(?! (today|this week)\b)"
+)
+
+def _whole_utterance(*bodies):
+    """A pattern matching one of `bodies` as the entire message, give or take a greeting and 'please'"""
+    return re.compile(
+        r"^(?:(?:hey|hi|ok|okay) )?(?:rose,? )?(?:(?:can|could|would) you |please )?"
+        rf"(?:{'|'.join(bodies)})"
+        r"(?:,? please)?[?.! ]*$"
+    )
+
+FastPathIntent = namedtuple('FastPathIntent', ['name', 'pattern', 'examples', 'handler', 'service'])
+
+FAST_PATH_INTENTS = [
+    FastPathIntent(
+        'weather',
+        _whole_utterance(
+            r"(what'?s|what is|how'?s|how is) (the )?(weather|forecast|temperature)( (like )?(today|now|right now|outside))?",
+            r"(check |show me )?(the |today'?s )?(weather|forecast)( today| now)?",
+            r"do i need an umbrella( today)?",
+            r"(is it|will it|is it going to) rain( today)?",
+            r"(what'?s|what is) the uv( index)?( today)?"
+        ),
+        ["what's the weather", "weather today", "do I need an umbrella", "what's the forecast"],
+        lambda: asyncio.to_thread(get_weather_briefing),
+        None
+    ),
+    FastPathIntent(
+        'unread_emails',
+        _whole_utterance(
+            r"(check|show( me)?|get|list) (my )?unread (e-?mails?|mail|messages)",
+            r"(any|do i have( any)?) unread (e-?mails?|mail|messages)",
+            r"(what'?s|what is) unread( in my inbox)?"
+        ),
+        ["check my unread emails", "any unread mail", "what's unread in my inbox"],
+        lambda: run_google_call(get_recent_emails, 5, True),
+        'google'
+    ),
+    FastPathIntent(
+        'recent_emails',
+        _whole_utterance(
+            r"(check|show( me)?|get|read) (my )?((new|recent|latest) )?(e-?mails?|mail|inbox)",
+            r"(any|anything) new( (e-?mails?|mail|in my inbox))?",
+            r"(what'?s|what is) (new )?in my inbox",
+            r"(any )?new (e-?mails?|mail)"
+        ),
+        ["check my email", "show my latest emails", "anything new in my inbox"],
+        lambda: run_google_call(get_recent_emails, 5),
+        'google'
+    ),
+    FastPathIntent(
+        'upcoming_events',
+        _whole_utterance(
+            r"(what'?s|what is) coming up( this week)?",
+            r"(show( me)? )?(my )?upcoming (events|meetings|schedule)",
+            r"(what'?s on |show( me)? )?my (calendar|schedule) (this|for this) week",
+            r"what (events|meetings|plans) do i have this week"
+        ),
+        ["what's coming up this week", "upcoming events", "my calendar for this week"],
+        lambda: run_google_call(get_upcoming_events, 7),
+        'calendars'
+    ),
+    FastPathIntent(
+        'today_schedule',
+        _whole_utterance(
+            r"(what'?s|what is) (on )?(my )?(schedule|calendar|agenda)( (for )?today)?",
+            r"(show( me)?|check) (my )?(schedule|calendar|agenda)( (for )?today)?",
+            r"today'?s (schedule|calendar|agenda|meetings|events)",
+            r"(my )?(schedule|calendar|agenda) (for )?today",
+            r"(any|do i have( any)?) (meetings|events) today",
+            r"what (meetings|events) do i have today"
+        ),
+        ["what's my schedule today", "what's on my calendar today", "today's agenda", "any meetings today"],
+        lambda: run_google_call(get_today_schedule),
+        'calendars'
+    ),
+]
+
+fast_path_embeddings = {'model': None, 'examples': None, 'failed': False}
+fast_path_stats = defaultdict(int)
+
+def normalize_mention_text(content):
+    """Message text without mentions, lowercased, single-spaced"""
+    text = re.sub(r'<[@#][!&]?\d+>', ' ', content).replace('\u2019', "'")
+    return ' '.join(text.lower().split())
+
+def _load_fast_path_embeddings():
+    """Load the embedding model and encode the intent examples once; None when unavailable"""
+    if fast_path_embeddings['model'] is None and not fast_path_embeddings['failed']:
+        sentence_transformers = optional_import('sentence_transformers')
+        if not sentence_transformers:
+            fast_path_embeddings['failed'] = True
+            return None
+        try:
+            model = sentence_transformers.SentenceTransformer(FAST_PATH_EMBEDDING_MODEL)
+            examples = [(intent, example) for intent in FAST_PATH_INTENTS for example in intent.examples]
+            vectors = model.encode([example for _, example in examples], normalize_embeddings=True)
+            fast_path_embeddings.update(model=model, examples=(examples, vectors))
+            print(f"🧭 Fast-path embeddings ready ({FAST_PATH_EMBEDDING_MODEL}, {len(examples)} examples)")
+        except Exception as e:
+            print(f"⚠️ Fast-path embeddings unavailable: {e}")
+            fast_path_embeddings['failed'] = True
+            return None
+    return fast_path_embeddings['model']
+
+def _embedding_intent(text):
+    """(intent, similarity) of the closest example, or (None, 0)"""
+    model = _load_fast_path_embeddings()
+    if model is None:
+        return None, 0.0
+    examples, vectors = fast_path_embeddings['examples']
+    scores = vectors @ model.encode([text], normalize_embeddings=True)[0]
+    best = int(scores.argmax())
+    return examples[best][0], float(scores[best])
+
+def classify_fast_path(text):
+    """(intent, how it matched) for a high-confidence simple request, else (None, reason)"""
+    if not text or len(text.split()) > FAST_PATH_MAX_WORDS:
+        return None, 'too long'
+    if FAST_PATH_VETO.search(text):
+        return None, 'action requested'
+    if FAST_PATH_SCOPE_VETO.search(text):
+        return None, 'narrower than the helpers'
+    
+    for intent in FAST_PATH_INTENTS:
+        if intent.pattern.match(text):
+            return intent, 'pattern'
+    
+    intent, score = _embedding_intent(text)
+    if intent and score >= FAST_PATH_EMBEDDING_THRESHOLD:
+        return intent, f"embedding {score:.2f}"
+    return None, 'no match'
+
+async def route_fast_path(content):
+    """Answer a mention locally when it's a simple lookup; None means use the assistant"""
+    if not FAST_PATH_ENABLED:
+        return None
+    
+    text = normalize_mention_text(content)
+    intent, reason = await asyncio.to_thread(classify_fast_path, text)
+    if not intent:
+        return None
+    if intent.service and service_readiness.get(intent.service) != 'ready':
+        return None
+    
+    started = time.time()
+    result = await intent.handler()
+    if not result or result.startswith('❌'):
+        # Let the assistant explain or work around the failure
+        return None
+    
+    fast_path_stats[intent.name] += 1
+    print(f"⚡ Fast path: {intent.name} ({reason}) in {time.time() - started:.2f}s")
+    return result
+
+def record_fast_path_exchange(user_id, channel_id, content, reply):
+    """Add a locally answered exchange to the user's thread, so follow-ups ("reply to the second one") have it"""
+    try:
+        thread_id = rollover_thread_if_needed(user_id, channel_id)
+        client.beta.threads.messages.create(thread_id=thread_id, role='user', content=content)
+        client.beta.threads.messages.create(thread_id=thread_id, role='assistant', content=reply)
+        metadata = conversation_metadata.setdefault(thread_id, {'tokens': 0, 'messages': 0, 'runs': 0, 'rollovers': 0})
+        metadata['messages'] = metadata.get('messages', 0) + 2
+        metadata['tokens'] = metadata.get('tokens', 0) + estimate_tokens(content + reply)
+    except Exception as e:
+        print(f"⚠️ Couldn't add fast-path answer to thread: {e}")
+
 # ============================================================================
 # AI ASSISTANT INTEGRATION (ALL PRESERVED)
 # ============================================================================
@@ -2275,17 +4616,8 @@ def handle_rose_functions_enhanced(run, thread_id):
 async def handle_ai_conversation(message, user_id, channel_id):
     """Handle AI assistant conversation with OpenAI"""
     try:
-        # Get or create conversation thread
-        thread_id = user_conversations.get(user_id)
-        if not thread_id:
-            thread = client.beta.threads.create()
-            thread_id = thread.id
-            user_conversations[user_id] = thread_id
-            conversation_metadata[thread_id] = {
-                'user_id': user_id,
-                'channel_id': channel_id,
-                'created_at': time.time()
-            }
+        # Get or create conversation thread (a fresh, summarized one once it's over budget)
+        thread_id = await asyncio.to_thread(rollover_thread_if_needed, user_id, channel_id)
         
         # Add message to thread
         client.beta.threads.messages.create(
@@ -2297,12 +4629,14 @@ async def handle_ai_conversation(message, user_id, channel_id):
         # Create run
         run = client.beta.threads.runs.create(
             thread_id=thread_id,
-            assistant_id=ASSISTANT_ID
+            assistant_id=ASSISTANT_ID,
+            truncation_strategy=run_truncation_strategy()
         )
         
         # Wait for completion
         max_wait_time = 60
         start_time = time.time()
+        tool_rounds = 0
         
         while run.status in ['queued', 'in_progress', 'requires_action']:
             if time.time() - start_time > max_wait_time:
@@ -2310,6 +4644,7 @@ async def handle_ai_conversation(message, user_id, channel_id):
             
             if run.status == 'requires_action':
                 # Handle function calls
+                tool_rounds += 1
                 tool_outputs = handle_rose_functions_enhanced(run, thread_id)
                 
                 run = client.beta.threads.runs.submit_tool_outputs(
@@ -2334,6 +4669,7 @@ async def handle_ai_conversation(message, user_id, channel_id):
             
             if messages.data:
                 response_content = messages.data[0].content[0].text.value
+                record_thread_usage(thread_id, run, message.content, response_content, multi_step=tool_rounds > 0)
                 return response_content
             else:
                 return "❌ No response generated."
@@ -2386,103 +4722,233 @@ ASSISTANT_COLORS = {
     'cressida frost': 0xFF6B9D     # Pink (from Cressida's bot)
 }
 
-async def call_team_assistant(assistant_name, briefing_prompt):
-    """Call a specific team assistant's OpenAI assistant for their briefing"""
+# Display names for the short keys used in TEAM_ASSISTANT_IDS
+TEAM_DISPLAY_NAMES = {
+    'vivian': 'Vivian Spencer',
+    'flora': 'Flora Penrose',
+    'maeve': 'Maeve Windham',
+    'celeste': 'Celeste Marchmont',
+    'charlotte': 'Charlotte Astor',
+    'alice': 'Alice Fortescue',
+    'pippa': 'Pippa Blackwood',
+    'cressida': 'Cressida Frost'
+}
+
+# A whole-team fan-out finishes (or gives up on stragglers) within this many seconds
+TEAM_FANOUT_DEADLINE_SECONDS = int(os.getenv('TEAM_FANOUT_DEADLINE_SECONDS', '45'))
+# Follow-up prompts to an assistant reuse its thread while it's this fresh and short
+TEAM_THREAD_MAX_AGE_HOURS = int(os.getenv('TEAM_THREAD_MAX_AGE_HOURS', '12'))
+TEAM_THREAD_MAX_RUNS = 10
+TEAM_POLL_MIN_SECONDS = 0.5
+TEAM_POLL_MAX_SECONDS = 2.0
+
+# name -> {'thread_id', 'created_at', 'runs'}; one run at a time per thread, hence the locks
+team_threads = {}
+team_thread_locks = defaultdict(asyncio.Lock)
+
+async def _team_thread(assistant_name):
+    """The assistant's current thread, or a new one once the old is stale or long"""
+    entry = team_threads.get(assistant_name)
+    if entry and time.time() - entry['created_at'] < TEAM_THREAD_MAX_AGE_HOURS * 3600 and entry['runs'] < TEAM_THREAD_MAX_RUNS:
+        return entry
+    thread = await asyncio.to_thread(client.beta.threads.create)
+    entry = {'thread_id': thread.id, 'created_at': time.time(), 'runs': 0}
+    team_threads[assistant_name] = entry
+    return entry
+
+async def _poll_run(thread_id, run, until, statuses=('queued', 'in_progress')):
+    """Poll a run with backoff while it's in one of `statuses`, stopping at the monotonic deadline"""
+    delay = TEAM_POLL_MIN_SECONDS
+    while run.status in statuses and time.monotonic() < until:
+        await asyncio.sleep(min(delay, max(0.0, until - time.monotonic())))
+        delay = min(delay * 1.5, TEAM_POLL_MAX_SECONDS)
+        run = await asyncio.to_thread(client.beta.threads.runs.retrieve, thread_id=thread_id, run_id=run.id)
+    return run
+
+async def _latest_reply(thread_id):
+    messages = await asyncio.to_thread(client.beta.threads.messages.list, thread_id=thread_id, order='desc', limit=1)
+    assistant_message = messages.data[0] if messages.data else None
+    if assistant_message and assistant_message.content:
+        return assistant_message.content[0].text.value
+    return None
+
+# Tools a team assistant may call mid-run: name -> {tool_name: TeamTool}.
+# handler takes the parsed arguments dict; google marks helpers that belong on the Google API pool.
+# Team assistants only get read-only tools - anything that sends, deletes or books goes through Rose.
+TeamTool = namedtuple('TeamTool', ['handler', 'google'])
+TEAM_TOOL_REGISTRY = defaultdict(dict)
+TEAM_TOOL_MAX_ROUNDS = 4
+
+def register_team_tool(tool_name, handler, assistants=None, google=False):
+    """Make a tool callable by the named team assistants (all of them when assistants is None)"""
+    for name in assistants or ['*']:
+        TEAM_TOOL_REGISTRY[name][tool_name] = TeamTool(handler, google)
+
+def team_tools_for(assistant_name):
+    """Shared tools overlaid with the assistant's own"""
+    return {**TEAM_TOOL_REGISTRY['*'], **TEAM_TOOL_REGISTRY.get(assistant_name, {})}
+
+def current_datetime_tool(arguments):
+    now = datetime.now(pytz.timezone(arguments.get('timezone') or 'America/Toronto'))
+    return json.dumps({'datetime': now.isoformat(timespec='minutes'), 'weekday': now.strftime('%A')})
+
+register_team_tool('get_current_datetime', current_datetime_tool)
+register_team_tool('get_weather_briefing', lambda arguments: get_weather_briefing())
+register_team_tool(
+    'get_today_schedule',
+    lambda arguments: records_or_text(calendar_service, fetch_today_events, get_today_schedule),
+    google=True
+)
+register_team_tool(
+    'get_upcoming_events',
+    lambda arguments: records_or_text(calendar_service, fetch_upcoming_events, get_upcoming_events, arguments.get('days', 7)),
+    assistants=['vivian', 'maeve', 'flora', 'celeste'], google=True
+)
+register_team_tool(
+    'get_email_stats',
+    lambda arguments: records_or_text(gmail_service, fetch_email_stats, get_email_stats, arguments.get('days', 7)),
+    assistants=['vivian'], google=True
+)
+register_team_tool(
+    'search_emails',
+    lambda arguments: search_emails(arguments.get('query', ''), arguments.get('max_results', 10)),
+    assistants=['vivian'], google=True
+)
+
+async def _run_team_tool(assistant_name, tool_call):
+    """One tool call's output entry; failures become ERROR outputs so the run can still finish"""
+    function_name = tool_call.function.name
+    tool = team_tools_for(assistant_name).get(function_name)
+    try:
+        if not tool:
+            raise LookupError(f"'{function_name}' is not available to {assistant_name} - answer without it")
+        arguments = json.loads(tool_call.function.arguments or '{}')
+        runner = run_google_call if tool.google else asyncio.to_thread
+        result = await runner(tool.handler, arguments)
+        output = format_tool_output(function_name, result)
+    except Exception as e:
+        print(f"❌ {assistant_name.title()} tool {function_name} failed: {e}")
+        output = f"❌ Error in {function_name}: {str(e)[:200]}"
+    return {'tool_call_id': tool_call.id, 'output': output}
+
+async def _submit_team_tool_outputs(assistant_name, thread_id, run):
+    """Run every requested tool at once and hand the outputs back to the run"""
+    tool_calls = run.required_action.submit_tool_outputs.tool_calls
+    print(f"🔧 {assistant_name.title()} called {', '.join(call.function.name for call in tool_calls)}")
+    tool_outputs = await asyncio.gather(*(_run_team_tool(assistant_name, call) for call in tool_calls))
+    return await asyncio.to_thread(
+        client.beta.threads.runs.submit_tool_outputs,
+        thread_id=thread_id,
+        run_id=run.id,
+        tool_outputs=list(tool_outputs)
+    )
+
+async def call_team_assistant(assistant_name, briefing_prompt, deadline=None):
+    """Call a specific team assistant's OpenAI assistant for their briefing
+    
+    deadline is a time.monotonic() value; without one the call gets 20 seconds.
+    """
+    until = deadline or time.monotonic() + 20
     try:
         assistant_id = TEAM_ASSISTANT_IDS.get(assistant_name.lower())
-        print(f"🔍 DEBUG: Looking for '{assistant_name.lower()}', found ID: {assistant_id}")
-        print(f"🔍 DEBUG: Available keys: {list(TEAM_ASSISTANT_IDS.keys())}")
         if not assistant_id:
-            print(f"🔍 DEBUG: TEAM_ASSISTANT_IDS = {TEAM_ASSISTANT_IDS}")
             return f"❌ {assistant_name.title()} assistant not configured"
         
-        # Create a new thread for this briefing request
-        thread = client.beta.threads.create()
-        thread_id = thread.id
-        
-        # Add the briefing prompt to the thread
-        client.beta.threads.messages.create(
-            thread_id=thread_id,
-            role="user",
-            content=briefing_prompt
-        )
-        
-        # Run the assistant
-        run = client.beta.threads.runs.create(
-            thread_id=thread_id,
-            assistant_id=assistant_id
-        )
-        
-        # Wait for completion with timeout
-        max_wait = 20  # 20 second timeout - shorter for team briefings
-        wait_time = 0
-        
-        while run.status in ['queued', 'in_progress'] and wait_time < max_wait:
-            await asyncio.sleep(1)
-            wait_time += 1
-            run = client.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run.id)
-        
-        # Handle function calls specially - allow Flora to use them for astrological data
-        if run.status == 'requires_action':
-            if assistant_name == 'flora':
-                print(f"🔮 Flora requires astrological functions - allowing for enhanced briefing")
-                # Handle Flora's function calls for astrological data
-                try:
-                    # Flora needs more time for astrological calculations
-                    max_function_wait = 30
-                    function_wait_time = 0
-                    
-                    while run.status == 'requires_action' and function_wait_time < max_function_wait:
-                        # For Flora, we can skip complex function handling and let her assistant handle it
-                        await asyncio.sleep(2)
-                        function_wait_time += 2
-                        run = client.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run.id)
-                    
-                    if run.status == 'completed':
-                        messages = client.beta.threads.messages.list(thread_id=thread_id)
-                        assistant_message = messages.data[0]
-                        if assistant_message.content:
-                            response_text = assistant_message.content[0].text.value
-                            print(f"✅ Flora enhanced briefing completed ({len(response_text)} chars)")
-                            return response_text
-                    
-                    print(f"⚠️ Flora function calls timed out after {function_wait_time}s")
-                    return f"🔮 Flora's astrological calculations are taking longer than expected - using enhanced fallback"
-                    
-                except Exception as e:
-                    print(f"❌ Flora function call error: {e}")
-                    return f"🔮 Flora's mystical energies encountered interference - using enhanced fallback"
-            else:
-                print(f"⚠️ {assistant_name.title()} requires functions - using fallback for team briefing")
-                return f"❌ {assistant_name.title()} requires function calls - using fallback response"
-        
-        if run.status == 'completed':
-            # Get the assistant's response
-            messages = client.beta.threads.messages.list(thread_id=thread_id)
-            assistant_message = messages.data[0]
+        async with team_thread_locks[assistant_name]:
+            entry = await _team_thread(assistant_name)
+            thread_id = entry['thread_id']
+            
+            # Add the briefing prompt to the thread
+            await asyncio.to_thread(
+                client.beta.threads.messages.create,
+                thread_id=thread_id,
+                role="user",
+                content=briefing_prompt
+            )
+            
+            # Run the assistant
+            run = await asyncio.to_thread(
+                client.beta.threads.runs.create,
+                thread_id=thread_id,
+                assistant_id=assistant_id,
+                truncation_strategy=run_truncation_strategy()
+            )
+            entry['runs'] += 1
+            
+            # Wait for completion, up to the shared deadline
+            run = await _poll_run(thread_id, run, until)
+            
+            # Tool calls are answered from the assistant's registry, then the run carries on
+            rounds = 0
+            while run.status == 'requires_action' and rounds < TEAM_TOOL_MAX_ROUNDS and time.monotonic() < until:
+                run = await _submit_team_tool_outputs(assistant_name, thread_id, run)
+                run = await _poll_run(thread_id, run, until)
+                rounds += 1
+            
+            if run.status == 'completed':
+                # Get the assistant's response
+                response_text = await _latest_reply(thread_id)
+                if response_text:
+                    print(f"✅ {assistant_name.title()} assistant responded ({len(response_text)} chars)")
+                    return response_text
+                else:
+                    return f"❌ {assistant_name.title()} assistant returned empty response"
+            
+            elif run.status == 'failed':
+                error_msg = f"Assistant run failed"
+                if hasattr(run, 'last_error') and run.last_error:
+                    error_msg += f": {run.last_error}"
+                print(f"❌ {assistant_name.title()} {error_msg}")
+                return f"❌ {assistant_name.title()} assistant failed"
             
-            if assistant_message.content:
-                response_text = assistant_message.content[0].text.value
-                print(f"✅ {assistant_name.title()} assistant responded ({len(response_text)} chars)")
-                return response_text
             else:
-                return f"❌ {assistant_name.title()} assistant returned empty response"
-        
-        elif run.status == 'failed':
-            error_msg = f"Assistant run failed"
-            if hasattr(run, 'last_error') and run.last_error:
-                error_msg += f": {run.last_error}"
-            print(f"❌ {assistant_name.title()} {error_msg}")
-            return f"❌ {assistant_name.title()} assistant failed"
-        
-        else:
-            print(f"❌ {assistant_name.title()} assistant timeout (status: {run.status})")
-            return f"❌ {assistant_name.title()} assistant timeout"
+                print(f"❌ {assistant_name.title()} assistant timeout (status: {run.status})")
+                # The run stays "cancelling" for a while and blocks new messages on its thread,
+                # so the next prompt starts a fresh thread either way
+                try:
+                    await asyncio.to_thread(client.beta.threads.runs.cancel, thread_id=thread_id, run_id=run.id)
+                except Exception:
+                    pass
+                team_threads.pop(assistant_name, None)
+                return f"❌ {assistant_name.title()} assistant timeout"
         
     except Exception as e:
         print(f"❌ {assistant_name.title()} assistant error: {str(e)}")
         return f"❌ Error processing request: {str(e)[:100]}"
 
+def configured_team_members():
+    """Team members with their own assistant (Charlotte shares Rose's, so she's not fanned out to)"""
+    return [name for name, assistant_id in TEAM_ASSISTANT_IDS.items() if assistant_id and assistant_id != ASSISTANT_ID]
+
+async def fan_out_team_prompt(channel, prompt, names=None, deadline_seconds=TEAM_FANOUT_DEADLINE_SECONDS):
+    """Send one prompt to several team assistants at once, posting each answer as it lands
+    
+    Returns (posted, total). The whole fan-out takes as long as the slowest assistant,
+    capped by the deadline.
+    """
+    names = names or configured_team_members()
+    until = time.monotonic() + deadline_seconds
+    started = time.time()
+    
+    async def ask(name):
+        return name, await call_team_assistant(name, prompt, deadline=until)
+    
+    tasks = [asyncio.create_task(ask(name)) for name in names]
+    posted = 0
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=deadline_seconds + 15):
+            name, response = await next_done
+            await send_as_assistant_bot(channel, response, TEAM_DISPLAY_NAMES.get(name, name.title()))
+            posted += 1
+    except asyncio.TimeoutError:
+        waiting = [name for name, task in zip(names, tasks) if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await channel.send(f"⏰ Still waiting on {', '.join(TEAM_DISPLAY_NAMES.get(name, name) for name in waiting)} - skipped for now")
+    
+    print(f"👥 Team fan-out: {posted}/{len(names)} answered in {time.time() - started:.1f}s")
+    return posted, len(names)
+
 async def send_as_assistant_bot(channel, content, assistant_name):
     """Send message with clear assistant identity using Discord embeds for better visual distinction"""
     try:
@@ -2556,10 +5022,7 @@ def get_daily_quotes():
     ]
     
     try:
-        import os
-        
         # Try multiple paths for the simple text file (much easier than Excel)
-        import os
         script_dir = os.path.dirname(os.path.abspath(__file__))
         
         possible_paths = [
@@ -2595,7 +5058,6 @@ def get_daily_quotes():
                 
     except Exception as e:
         print(f"❌ Quote file reading failed, using fallback: {e}")
-        import traceback
         print(f"📋 Traceback: {traceback.format_exc()}")
     
     # Fallback to hardcoded quotes
@@ -2603,9 +5065,6 @@ def get_daily_quotes():
 
 async def get_charlotte_report():
     """Generate Charlotte's real-time Systems Check briefing"""
-    import aiohttp
-    from datetime import datetime, timedelta
-    
     report = "⚙️ **Real-Time Systems Check**\nRunning live diagnostics...\n\n"
     issues = []
     
@@ -2615,8 +5074,10 @@ async def get_charlotte_report():
     # Gmail Service Check
     try:
         if gmail_service:
-            # Test with a simple profile query
-            profile = gmail_service.users().getProfile(userId='me').execute()
+            # Test with a simple profile query (off the event loop - briefing sections run alongside)
+            profile = await run_google_call(
+                lambda: gmail_service.users().getProfile(userId='me').execute()
+            )
             email = profile.get('emailAddress', 'Unknown')
             report += f"📧 **Gmail Service - Connected** ({email}) ✅\n"
         else:
@@ -2630,7 +5091,9 @@ async def get_charlotte_report():
     try:
         if calendar_service:
             # Test with calendar list query
-            calendar_list = calendar_service.calendarList().list(maxResults=20).execute()
+            calendar_list = await run_google_call(
+                lambda: calendar_service.calendarList().list(maxResults=20).execute()
+            )
             calendars = calendar_list.get('items', [])
             
             if calendars:
@@ -2669,7 +5132,7 @@ async def get_charlotte_report():
     try:
         if client and ASSISTANT_ID:
             # Test with assistant retrieve
-            assistant = client.beta.assistants.retrieve(ASSISTANT_ID)
+            assistant = await asyncio.to_thread(client.beta.assistants.retrieve, ASSISTANT_ID)
             report += f"🤖 **OpenAI Assistant - Operational** ({assistant.name}) ✅\n"
         else:
             report += "🤖 **OpenAI Assistant - Not configured** ❌\n"
@@ -2741,8 +5204,8 @@ async def get_charlotte_report():
         report += "📺 **YouTube Data API - Not configured** ⚪\n"
     
     # System Resource Check (basic)
-    try:
-        import psutil
+    psutil = optional_import('psutil')
+    if psutil:
         memory_percent = psutil.virtual_memory().percent
         cpu_percent = psutil.cpu_percent(interval=0.1)
         report += f"💻 **System Resources - {memory_percent:.1f}% RAM, {cpu_percent:.1f}% CPU** "
@@ -2751,12 +5214,11 @@ async def get_charlotte_report():
             issues.append("High system resource usage")
         else:
             report += "✅\n"
-    except ImportError:
+    else:
         report += "💻 **System Resources - Monitoring unavailable** ⚪\n"
     
     # Runtime uptime
     try:
-        import time
         uptime_seconds = time.time() - bot_start_time if 'bot_start_time' in globals() else 0
         uptime_hours = uptime_seconds / 3600
         report += f"⏱️ **Bot Uptime - {uptime_hours:.1f} hours** ✅\n"
@@ -2785,21 +5247,17 @@ async def _check_team_bot_connections():
     
     # Check Swiss Ephemeris availability (for Flora's astrological functions)
     try:
-        import swisseph as swe
-        # Test basic functionality
-        swe.julday(2023, 1, 1)
-        statuses.append(("⭐ **Swiss Ephemeris - Available** ✅\n", False, None))
-    except ImportError:
-        try:
-            import pyswisseph as swe
-            swe.julday(2023, 1, 1)
+        if optional_import('swisseph'):
+            # Test basic functionality
+            optional_import('swisseph').julday(2023, 1, 1)
+            statuses.append(("⭐ **Swiss Ephemeris - Available** ✅\n", False, None))
+        elif optional_import('pyswisseph'):
+            optional_import('pyswisseph').julday(2023, 1, 1)
             statuses.append(("⭐ **PySwisseph - Available** ✅\n", False, None))
-        except ImportError:
-            try:
-                import ephem
-                statuses.append(("⭐ **PyEphem - Available** (Fallback) ⚠️\n", True, "No Swiss Ephemeris, using PyEphem fallback"))
-            except ImportError:
-                statuses.append(("⭐ **Ephemeris - Not available** ⚪\n", False, None))
+        elif optional_import('ephem'):
+            statuses.append(("⭐ **PyEphem - Available** (Fallback) ⚠️\n", True, "No Swiss Ephemeris, using PyEphem fallback"))
+        else:
+            statuses.append(("⭐ **Ephemeris - Not available** ⚪\n", False, None))
     except Exception as e:
         statuses.append((f"⭐ **Swiss Ephemeris - Error** ❌\n", True, f"Ephemeris error: {str(e)[:30]}"))
     
@@ -2814,186 +5272,776 @@ def get_alice_report(brief=False):
 • Home systems on track
 • Family coordination complete"""
 
-def get_random_kindness_ideas():
-    """Generate 3 random acts of kindness ideas"""
-    kindness_ideas = [
-        "Leave a genuine compliment sticky note in a library book",
-        "Pay for someone's coffee behind you in line",
-        "Send a heartfelt text to a friend you haven't spoken to in a while",
-        "Write a thank-you note to a local essential worker",
-        "Hold the door open and make warm eye contact with a stranger",
-        "Share homemade cookies with your neighbors",
-        "Leave quarters in a laundromat for someone to find",
-        "Pick up litter in your neighborhood during your walk",
-        "Give a genuine compliment to someone who serves you today",
-        "Donate unused items in good condition to a local shelter",
-        "Help carry groceries for someone struggling with bags",
-        "Leave a positive review for a small local business you love",
-        "Offer to help an elderly person with technology",
-        "Send an encouraging message to someone going through a tough time",
-        "Leave a positive chalk message on a public sidewalk",
-        "Volunteer an hour at a local charity",
-        "Bring flowers from your garden to a nursing home",
-        "Let someone go ahead of you in line when you're not in a rush",
-        "Call a family member just to tell them you love them",
-        "Leave bird seed in a park for the wildlife",
-        "Give someone a book that changed your life",
-        "Offer your seat to someone on public transport",
-        "Leave a surprise treat for your mail carrier",
-        "Help someone carry a stroller up/down stairs"
-    ]
+def get_random_kindness_ideas():
+    """Generate 3 random acts of kindness ideas"""
+    kindness_ideas = [
+        "Leave a genuine compliment sticky note in a library book",
+        "Pay for someone's coffee behind you in line",
+        "Send a heartfelt text to a friend you haven't spoken to in a while",
+        "Write a thank-you note to a local essential worker",
+        "Hold the door open and make warm eye contact with a stranger",
+        "Share homemade cookies with your neighbors",
+        "Leave quarters in a laundromat for someone to find",
+        "Pick up litter in your neighborhood during your walk",
+        "Give a genuine compliment to someone who serves you today",
+        "Donate unused items in good condition to a local shelter",
+        "Help carry groceries for someone struggling with bags",
+        "Leave a positive review for a small local business you love",
+        "Offer to help an elderly person with technology",
+        "Send an encouraging message to someone going through a tough time",
+        "Leave a positive chalk message on a public sidewalk",
+        "Volunteer an hour at a local charity",
+        "Bring flowers from your garden to a nursing home",
+        "Let someone go ahead of you in line when you're not in a rush",
+        "Call a family member just to tell them you love them",
+        "Leave bird seed in a park for the wildlife",
+        "Give someone a book that changed your life",
+        "Offer your seat to someone on public transport",
+        "Leave a surprise treat for your mail carrier",
+        "Help someone carry a stroller up/down stairs"
+    ]
+    
+    return random.sample(kindness_ideas, 3)
+
+def get_style_temp_advice(temp):
+    """Get styling advice based on temperature"""
+    if temp < 5:
+        return "Luxe layering with statement outerwear"
+    elif temp < 15:
+        return "Chic transitional pieces and textures"
+    elif temp < 25:
+        return "Perfect for sophisticated separates"
+    else:
+        return "Breathable fabrics in elevated silhouettes"
+
+def get_style_weather_advice(condition):
+    """Get styling advice based on weather conditions"""
+    condition_lower = condition.lower()
+    if 'rain' in condition_lower:
+        return "Water-resistant pieces with protective glamour"
+    elif 'snow' in condition_lower:
+        return "Cozy luxury with winter white accents"
+    elif 'sun' in condition_lower or 'clear' in condition_lower:
+        return "Light fabrics with UV-protective accessories"
+    elif 'cloud' in condition_lower:
+        return "Versatile layers for changing conditions"
+    else:
+        return "Adaptable pieces for weather transitions"
+
+def get_style_air_quality_advice(aqi_us):
+    """Get styling advice based on air quality"""
+    if aqi_us >= 4:  # Unhealthy or worse
+        return "Stylish face masks, indoor aesthetic focus, minimal outdoor fabric exposure"
+    elif aqi_us == 3:  # Unhealthy for sensitive groups
+        return "Light scarves for style & protection, breathable fabrics preferred"
+    elif aqi_us == 2:  # Moderate
+        return "Perfect for outdoor style content, all fabric choices suitable"
+    elif aqi_us == 1:  # Good
+        return "Excellent for outdoor photoshoots and fresh air styling sessions"
+    else:
+        return "Versatile styling recommended"
+
+# ============================================================================
+# BRIEFING PIPELINE (CONCURRENT SECTION ASSEMBLY)
+# ============================================================================
+
+# Total time a briefing waits for its sections before posting what it has
+BRIEFING_DEADLINE_SECONDS = float(os.getenv('BRIEFING_DEADLINE_SECONDS', '8'))
+
+class GoogleCall(functools.partial):
+    """A blocking Google helper bound to its arguments - runs on the Google API pool"""
+
+def google_section(func, *args, **kwargs):
+    """Wrap a Gmail or Calendar helper as a briefing section"""
+    return GoogleCall(func, *args, **kwargs)
+
+async def _run_briefing_section(section):
+    """Run one section - coroutines on the event loop, Google helpers on the Google pool, the rest in a worker thread"""
+    if asyncio.iscoroutinefunction(section):
+        return await section()
+    if isinstance(section, GoogleCall):
+        return await run_google_call(section)
+    return await asyncio.to_thread(section)
+
+async def gather_briefing_sections(sections, deadline=None, failures=None):
+    """Run briefing sections concurrently, substituting fallbacks for slow or failed ones
+    
+    sections maps name -> (callable, fallback_text); returns name -> rendered text.
+    Names that fell back are added to the optional failures set.
+    """
+    deadline = BRIEFING_DEADLINE_SECONDS if deadline is None else deadline
+    if not sections:
+        return {}
+    
+    started = time.time()
+    tasks = {
+        name: asyncio.create_task(_run_briefing_section(func))
+        for name, (func, _) in sections.items()
+    }
+    
+    done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+    
+    results = {}
+    for name, task in tasks.items():
+        fallback = sections[name][1]
+        if task in pending:
+            print(f"⏳ Briefing section '{name}' missed the {deadline:g}s deadline")
+            results[name] = fallback
+            if failures is not None:
+                failures.add(name)
+        elif task.exception():
+            print(f"❌ Briefing section '{name}' failed: {task.exception()}")
+            results[name] = fallback
+            if failures is not None:
+                failures.add(name)
+        else:
+            results[name] = task.result()
+    
+    print(f"⚡ Briefing sections ready in {time.time() - started:.1f}s ({len(done)}/{len(tasks)} on time)")
+    return results
+
+# ============================================================================
+# BRIEFING DATA LAYER (SHARED SNAPSHOTS, BUILT AHEAD OF SCHEDULED DELIVERY)
+# ============================================================================
+
+# Start gathering this many minutes before each scheduled briefing
+BRIEFING_PREWARM_MINUTES = int(os.getenv('BRIEFING_PREWARM_MINUTES', '5'))
+
+# Manual !am/!noon/!pm reuse the warmed snapshot until this long after delivery
+BRIEFING_REUSE_MINUTES = int(os.getenv('BRIEFING_REUSE_MINUTES', '30'))
+
+# Within this many seconds a snapshot is served as-is, without even probing for changes
+BRIEFING_SNAPSHOT_TTL_SECONDS = int(os.getenv('BRIEFING_SNAPSHOT_TTL_SECONDS', '120'))
+
+# Pre-warm is not user-facing, so it can wait far longer for slow APIs
+BRIEFING_PREWARM_DEADLINE_SECONDS = max(BRIEFING_DEADLINE_SECONDS, BRIEFING_PREWARM_MINUTES * 30)
+
+# Version probes must be cheap - they decide which snapshot sections get refetched
+BRIEFING_PROBE_DEADLINE_SECONDS = 3
+
+# Sources without a version probe are refreshed once their copy is this old (seconds)
+BRIEFING_SOURCE_MAX_AGE = {
+    'weather': 1800,
+    'health': 600
+}
+
+# One immutable view of a slot's data; sections/fetched_at/versions are read-only mappings
+BriefingSnapshot = namedtuple('BriefingSnapshot', ['slot', 'built_at', 'sections', 'fetched_at', 'versions'])
+
+# slot -> {'snapshot', 'checked_at', 'reuse_until'}
+briefing_snapshots = {}
+
+# slot -> asyncio.Task of the build in flight, so concurrent callers share one set of API calls
+briefing_snapshot_builds = {}
+
+def _gmail_version():
+    """Mailbox historyId - changes whenever anything in Gmail changes"""
+    profile = gmail_service.users().getProfile(userId='me', fields='historyId').execute()
+    return profile.get('historyId')
+
+def _calendar_version():
+    """Last-modified stamp of every accessible calendar"""
+    versions = []
+    for _, calendar_id in accessible_calendars:
+        result = calendar_service.events().list(
+            calendarId=calendar_id,
+            maxResults=1,
+            fields='updated'
+        ).execute()
+        versions.append(result.get('updated'))
+    return tuple(versions)
+
+BRIEFING_SOURCE_PROBES = {
+    'gmail': google_section(_gmail_version),
+    'calendar': google_section(_calendar_version)
+}
+
+def briefing_slot_sections(slot):
+    """Sections making up a slot's snapshot: name -> (callable, fallback, source)"""
+    sections = {}
+    
+    if slot == 'am':
+        sections['weather'] = (get_weather_briefing, "🌤️ **Weather:** Still loading - try `!weather` shortly", 'weather')
+        sections['personal_schedule'] = (google_section(get_personal_schedule), "📅 **Personal Schedule:** Still loading - try `!schedule` shortly", 'calendar')
+        sections['work_schedule'] = (google_section(get_work_schedule), "💼 **Work Schedule:** Still loading - try `!schedule` shortly", 'calendar')
+        sections['health'] = (get_charlotte_report, "⚙️ **Real-Time Systems Check**\nDiagnostics still running - try `!teambriefing charlotte`", 'health')
+        if gmail_service:
+            # The week's stats, as the automated briefing always reported (unread doesn't depend on the window)
+            sections['mail'] = (google_section(fetch_email_stats, 7), None, 'gmail')
+    elif slot == 'noon':
+        sections['personal_schedule'] = (google_section(get_personal_schedule, 'noon'), "📅 **Personal Schedule:** Still loading - try `!schedule` shortly", 'calendar')
+        if gmail_service:
+            sections['unread_preview'] = (google_section(fetch_recent_emails, 3, unread_only=True), None, 'gmail')
+    elif slot == 'pm':
+        sections['personal_schedule'] = (google_section(get_personal_schedule, 'afternoon'), "📅 **Personal Schedule:** Still loading - try `!schedule` shortly", 'calendar')
+    
+    return sections
+
+async def _probe_briefing_versions(sources):
+    """Fetch the current version token of each probed source (None when the probe failed)"""
+    probes = {source: (BRIEFING_SOURCE_PROBES[source], None) for source in sources if source in BRIEFING_SOURCE_PROBES}
+    return await gather_briefing_sections(probes, deadline=BRIEFING_PROBE_DEADLINE_SECONDS)
+
+async def _build_briefing_snapshot(slot, deadline=None, full=False, reuse_seconds=None):
+    """Build a new snapshot for a slot, refetching only changed sections when a live one exists"""
+    # A briefing built right after a restart should wait briefly for Google rather than go out empty
+    await wait_for_startup_services(deadline or BRIEFING_DEADLINE_SECONDS)
+    
+    specs = briefing_slot_sections(slot)
+    sources = {source for _, _, source in specs.values()}
+    now = time.time()
+    
+    entry = briefing_snapshots.get(slot)
+    previous = entry['snapshot'] if entry and not full and entry['reuse_until'] >= now else None
+    
+    # Take versions first so any change during the fetch is caught next time
+    versions = await _probe_briefing_versions(sources)
+    
+    stale = {}
+    for name, (func, fallback, source) in specs.items():
+        if previous is None or name not in previous.fetched_at:
+            stale[name] = (func, fallback)
+        elif source in BRIEFING_SOURCE_PROBES:
+            current = versions.get(source)
+            if current is None or current != previous.versions.get(name):
+                stale[name] = (func, previous.sections[name])
+        elif now - previous.fetched_at[name] > BRIEFING_SOURCE_MAX_AGE.get(source, 0):
+            stale[name] = (func, previous.sections[name])
+    
+    failures = set()
+    refreshed = {}
+    if stale:
+        if previous:
+            print(f"🔄 {slot} briefing: refreshing changed sections {', '.join(stale)}")
+        refreshed = await gather_briefing_sections(stale, deadline=deadline, failures=failures)
+    else:
+        print(f"⚡ {slot} briefing: snapshot unchanged")
+    
+    sections = dict(previous.sections) if previous else {}
+    fetched_at = dict(previous.fetched_at) if previous else {}
+    section_versions = dict(previous.versions) if previous else {}
+    for name, text in refreshed.items():
+        sections[name] = text
+        if name in failures:
+            continue
+        fetched_at[name] = now
+        section_versions[name] = versions.get(specs[name][2])
+    
+    snapshot = BriefingSnapshot(
+        slot=slot,
+        built_at=now,
+        sections=MappingProxyType(sections),
+        fetched_at=MappingProxyType(fetched_at),
+        versions=MappingProxyType(section_versions)
+    )
+    
+    reuse_until = now + (reuse_seconds if reuse_seconds is not None else BRIEFING_SNAPSHOT_TTL_SECONDS)
+    if previous:
+        reuse_until = max(reuse_until, entry['reuse_until'])
+    briefing_snapshots[slot] = {
+        'snapshot': snapshot,
+        'checked_at': now,
+        'reuse_until': reuse_until
+    }
+    return snapshot
+
+async def _run_snapshot_build(slot, **kwargs):
+    """Start a snapshot build, or join the one already in flight for this slot"""
+    build = briefing_snapshot_builds.get(slot)
+    if build is None:
+        build = asyncio.create_task(_build_briefing_snapshot(slot, **kwargs))
+        briefing_snapshot_builds[slot] = build
+        build.add_done_callback(lambda _: briefing_snapshot_builds.pop(slot, None))
+    # Shield so one caller giving up doesn't cancel the build for everyone else
+    return await asyncio.shield(build)
+
+async def get_briefing_snapshot(slot):
+    """Return the current snapshot for a slot - shared by !am/!noon/!pm and the scheduled jobs"""
+    entry = briefing_snapshots.get(slot)
+    if entry and time.time() - entry['checked_at'] < BRIEFING_SNAPSHOT_TTL_SECONDS:
+        return entry['snapshot']
+    return await _run_snapshot_build(slot)
+
+async def prewarm_briefing(slot):
+    """Build a slot's snapshot ahead of delivery and keep it live through the reuse window"""
+    try:
+        print(f"🔥 Pre-warming {slot} briefing")
+        
+        # Let a manual build that is already running finish, then do the full warm-up
+        in_flight = briefing_snapshot_builds.get(slot)
+        if in_flight:
+            await asyncio.gather(asyncio.shield(in_flight), return_exceptions=True)
+        
+        snapshot = await _run_snapshot_build(
+            slot,
+            deadline=BRIEFING_PREWARM_DEADLINE_SECONDS,
+            full=True,
+            reuse_seconds=(BRIEFING_PREWARM_MINUTES + BRIEFING_REUSE_MINUTES) * 60
+        )
+        print(f"✅ {slot} briefing warmed ({len(snapshot.fetched_at)}/{len(snapshot.sections)} sections)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error pre-warming {slot} briefing: {e}")
+        return False
+
+# ============================================================================
+# AUTOMATED SCHEDULING FUNCTIONS
+# ============================================================================
+
+async def send_automated_am(target_channel, sections=None):
+    """Send the automated morning briefing to one channel"""
+    sections = sections or BRIEFING_TYPE_SECTIONS['am']['default']
+    try:
+        print(f"🕖 Automated morning briefing - sending to #{target_channel.name}")
+        
+        # Execute the same logic as the !am command
+        await target_channel.send("🌅 **Morning Briefing**")
+        
+        # Same snapshot the !am command reads - pre-warmed a few minutes ago
+        snapshot = await get_briefing_snapshot('am')
+        data = snapshot.sections
+        
+        # Rose's strategic overview (goes first)
+        toronto_tz = pytz.timezone('America/Toronto')
+        current_time = datetime.now(toronto_tz).strftime('%A, %B %d - %-I:%M %p')
+        
+        rose_briefing = ""
+        
+        if 'weather' in sections:
+            rose_briefing += f"{data['weather']}\n\n"
+        
+        # Today's calendar
+        calendar_sections = [name for name in ('work_schedule', 'personal_schedule') if name in sections]
+        if calendar_sections:
+            rose_briefing += f"📅 **Today's Calendar:**\n"
+            if calendar_service:
+                for name in calendar_sections:
+                    rose_briefing += f"{data[name]}\n\n"
+            else:
+                rose_briefing += "Calendar service unavailable\n\n"
+        
+        # Quick email status
+        if 'mail' in sections and gmail_service:
+            stats = data.get('mail')
+            if stats is not None:
+                rose_briefing += f"📧 **Email Status:**\n📥 **Total ({stats.days} days):** {stats.total_received:,}\n📬 **Unread:** {stats.unread:,}\n\n"
+            else:
+                rose_briefing += "📧 **Email Status:** Service unavailable\n\n"
+        
+        rose_briefing += "🎯 Ready to optimize your productivity and strategic priorities today."
+        await send_as_rose(target_channel, rose_briefing, f"Strategic Overview ({current_time})")
+        
+        if 'health' in sections:
+            await send_as_assistant_bot(target_channel, data['health'], "Charlotte Astor")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error in automated morning briefing: {e}")
+        return False
+
+async def send_automated_noon(target_channel, sections=None):
+    """Send the automated midday check-in to one channel"""
+    sections = sections or BRIEFING_TYPE_SECTIONS['noon']['default']
+    try:
+        print(f"☀️ Automated midday briefing - sending to #{target_channel.name}")
+        
+        # Execute the same logic as the !noon command
+        toronto_tz = pytz.timezone('America/Toronto')
+        current_time = datetime.now(toronto_tz).strftime('%A, %B %d - %-I:%M %p')
+        
+        await target_channel.send(f"☀️ **Midday Check-In** ({current_time})")
+        snapshot = await get_briefing_snapshot('noon')
+        
+        # Rose's midday coordination
+        rose_midday = "👑 **Rose's Midday Coordination**\n"
+        if 'personal_schedule' in sections:
+            rose_midday += f"{snapshot.sections['personal_schedule']}\n"
+        if 'unread_preview' in sections and gmail_service:
+            unread_emails = snapshot.sections.get('unread_preview')
+            if unread_emails:
+                rose_midday += "\n📧 **Email Status:** New items require attention\n"
+        rose_midday += "\n🌟 **Afternoon Focus:** Optimizing productivity for remaining day priorities"
+        
+        await send_as_rose(target_channel, rose_midday, "Rose's Midday Coordination")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error in automated midday briefing: {e}")
+        return False
+
+async def send_automated_pm(target_channel, sections=None):
+    """Send the automated afternoon focus to one channel"""
+    sections = sections or BRIEFING_TYPE_SECTIONS['pm']['default']
+    try:
+        print(f"🌇 Automated afternoon briefing - sending to #{target_channel.name}")
+        
+        # Execute the same logic as the !pm command
+        toronto_tz = pytz.timezone('America/Toronto')
+        current_time = datetime.now(toronto_tz).strftime('%A, %B %d - %-I:%M %p')
+        
+        await target_channel.send(f"🌇 **Afternoon Focus** ({current_time})")
+        snapshot = await get_briefing_snapshot('pm')
+        
+        # Rose's afternoon coordination
+        rose_afternoon = "👑 **Rose's Afternoon Priorities**\n"
+        if 'personal_schedule' in sections:
+            rose_afternoon += f"{snapshot.sections['personal_schedule']}\n"
+        rose_afternoon += "\n🎯 **Evening Prep:** Review day's progress & tomorrow setup"
+        
+        await send_as_rose(target_channel, rose_afternoon, "Rose's Afternoon Priorities")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error in automated afternoon briefing: {e}")
+        return False
+
+# ============================================================================
+# BRIEFING SCHEDULE REGISTRY (DATA-DRIVEN, RELOADABLE)
+# ============================================================================
+
+# JSON list of {id, type, channel_id, cron, timezone, sections} - edit and !reloadbriefings.
+# cron is standard crontab: day-of-week 0 or 7 is Sunday (APScheduler's own numbering starts
+# at Monday, so numeric weekdays are rewritten as names before they reach CronTrigger)
+BRIEFING_SCHEDULES_FILE = os.getenv('BRIEFING_SCHEDULES_FILE', 'briefing_schedules.json')
+CRON_WEEKDAY_NAMES = ['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+# Sender and allowed sections per briefing type (first list is what a schedule gets by default)
+BRIEFING_TYPE_SECTIONS = {
+    'am': {
+        'sender': send_automated_am,
+        'default': ['work_schedule', 'personal_schedule', 'mail'],
+        'allowed': ['weather', 'work_schedule', 'personal_schedule', 'mail', 'health']
+    },
+    'noon': {
+        'sender': send_automated_noon,
+        'default': ['personal_schedule'],
+        'allowed': ['personal_schedule', 'unread_preview']
+    },
+    'pm': {
+        'sender': send_automated_pm,
+        'default': ['personal_schedule'],
+        'allowed': ['personal_schedule']
+    }
+}
+
+# Used when no schedule file exists - the original three Toronto briefings
+DEFAULT_BRIEFING_SCHEDULES = [
+    {'id': 'daily_morning_briefing', 'type': 'am', 'channel_id': 1400672908610769027, 'cron': '15 7 * * *', 'timezone': 'America/Toronto'},
+    {'id': 'daily_midday_briefing', 'type': 'noon', 'channel_id': 1400674820429053992, 'cron': '0 12 * * *', 'timezone': 'America/Toronto'},
+    {'id': 'daily_afternoon_briefing', 'type': 'pm', 'channel_id': 1400674903547576363, 'cron': '0 15 * * *', 'timezone': 'America/Toronto'}
+]
+
+# schedule id -> validated entry; rebuilt wholesale on every (re)load
+briefing_schedules = {}
+briefing_schedules_mtime = None
+
+# group key -> next fire time already pre-warmed, so each fire is warmed once
+prewarmed_fire_times = {}
+
+def normalize_cron_weekdays(cron):
+    """Crontab day-of-week numbers (0/7 = Sunday) as names, e.g. '0 7 * * 1-5' -> '0 7 * * mon,tue,wed,thu,fri'"""
+    fields = cron.split()
+    if len(fields) != 5:
+        return cron  # from_crontab reports the problem
+    days = []
+    for part in fields[4].split(','):
+        match = re.fullmatch(r'(\d)(?:-(\d))?(?:/(\d+))?', part)
+        if not match or (match.group(3) and not match.group(2)):
+            days.append(part)
+            continue
+        start = int(match.group(1))
+        end = int(match.group(2) or start)
+        step = int(match.group(3) or 1)
+        if end > 7 or start > end or step < 1:
+            days.append(part)
+            continue
+        days.extend(CRON_WEEKDAY_NAMES[day] for day in range(start, end + 1, step))
+    fields[4] = ','.join(dict.fromkeys(days))
+    return ' '.join(fields)
+
+def _validate_briefing_schedule(raw):
+    """Normalize one registry entry, raising ValueError when it can't be scheduled"""
+    schedule_id = str(raw.get('id') or '').strip()
+    if not schedule_id:
+        raise ValueError("missing id")
+    
+    briefing_type = raw.get('type')
+    if briefing_type not in BRIEFING_TYPE_SECTIONS:
+        raise ValueError(f"unknown type '{briefing_type}'")
+    
+    try:
+        channel_id = int(raw.get('channel_id'))
+    except (TypeError, ValueError):
+        raise ValueError("channel_id must be a Discord channel ID")
+    
+    timezone_name = raw.get('timezone', 'America/Toronto')
+    try:
+        pytz.timezone(timezone_name)
+    except pytz.UnknownTimeZoneError:
+        raise ValueError(f"unknown timezone '{timezone_name}'")
+    
+    cron = normalize_cron_weekdays(' '.join(str(raw.get('cron', '')).split()))
+    CronTrigger.from_crontab(cron, timezone=pytz.timezone(timezone_name))  # raises on a bad expression
+    
+    type_config = BRIEFING_TYPE_SECTIONS[briefing_type]
+    sections = raw.get('sections') or type_config['default']
+    unknown = [name for name in sections if name not in type_config['allowed']]
+    if unknown:
+        raise ValueError(f"sections not available for {briefing_type}: {', '.join(unknown)}")
+    
+    return {
+        'id': schedule_id,
+        'type': briefing_type,
+        'channel_id': channel_id,
+        'cron': cron,
+        'timezone': timezone_name,
+        'sections': list(sections)
+    }
+
+def load_briefing_schedules():
+    """(Re)load the schedule registry from BRIEFING_SCHEDULES_FILE, falling back to the defaults"""
+    global briefing_schedules, briefing_schedules_mtime
+    
+    raw_entries = DEFAULT_BRIEFING_SCHEDULES
+    source = "built-in defaults"
+    mtime = None
+    
+    if os.path.exists(BRIEFING_SCHEDULES_FILE):
+        try:
+            mtime = os.path.getmtime(BRIEFING_SCHEDULES_FILE)
+            with open(BRIEFING_SCHEDULES_FILE, 'r', encoding='utf-8') as f:
+                raw_entries = json.load(f)
+            source = BRIEFING_SCHEDULES_FILE
+        except (OSError, json.JSONDecodeError) as e:
+            # Keep running on the registry we already have rather than dropping every briefing
+            print(f"❌ Could not read {BRIEFING_SCHEDULES_FILE}: {e} - keeping current schedules")
+            briefing_schedules_mtime = mtime
+            return briefing_schedules
+        if not isinstance(raw_entries, list):
+            print(f"❌ {BRIEFING_SCHEDULES_FILE} must hold a JSON list of schedules - keeping current schedules")
+            briefing_schedules_mtime = mtime
+            return briefing_schedules
+    
+    schedules = {}
+    for raw in raw_entries:
+        if not isinstance(raw, dict):
+            print(f"⚠️ Skipping briefing schedule {raw!r}: not an object")
+            continue
+        try:
+            entry = _validate_briefing_schedule(raw)
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"⚠️ Skipping briefing schedule {raw.get('id', '?')}: {e}")
+            continue
+        if entry['id'] in schedules:
+            print(f"⚠️ Skipping duplicate briefing schedule id {entry['id']}")
+            continue
+        schedules[entry['id']] = entry
+    
+    briefing_schedules = schedules
+    briefing_schedules_mtime = mtime
+    print(f"📋 Loaded {len(schedules)} briefing schedules from {source}")
+    return schedules
+
+def briefing_schedule_groups():
+    """Group schedules that fire together: (type, cron, timezone) -> [entries]"""
+    groups = defaultdict(list)
+    for entry in briefing_schedules.values():
+        groups[(entry['type'], entry['cron'], entry['timezone'])].append(entry)
+    return groups
+
+def briefing_group_job_id(briefing_type, cron, timezone_name):
+    """Stable scheduler job id for a schedule group"""
+    digest = hashlib.sha1(f"{briefing_type}|{cron}|{timezone_name}".encode()).hexdigest()[:10]
+    return f"briefing_{briefing_type}_{digest}"
+
+async def _deliver_scheduled_briefing(entry):
+    """Post one registry entry's briefing and record the outcome under its schedule id"""
+    target_channel = bot.get_channel(entry['channel_id'])
+    if not target_channel:
+        print(f"⚠️ Target channel {entry['channel_id']} not found for briefing schedule {entry['id']}")
+        return False
     
-    return random.sample(kindness_ideas, 3)
+    sender = BRIEFING_TYPE_SECTIONS[entry['type']]['sender']
+    delivered = await sender(target_channel, entry['sections'])
+    if delivered:
+        record_run_success(entry['id'])
+    return delivered
 
-def get_style_temp_advice(temp):
-    """Get styling advice based on temperature"""
-    if temp < 5:
-        return "Luxe layering with statement outerwear"
-    elif temp < 15:
-        return "Chic transitional pieces and textures"
-    elif temp < 25:
-        return "Perfect for sophisticated separates"
-    else:
-        return "Breathable fabrics in elevated silhouettes"
+async def run_scheduled_briefing(briefing_type, cron, timezone_name):
+    """Scheduler job for one group - every channel shares the same snapshot and posts concurrently"""
+    entries = [entry for entry in briefing_schedules.values()
+               if (entry['type'], entry['cron'], entry['timezone']) == (briefing_type, cron, timezone_name)]
+    if not entries:
+        print(f"⚠️ No briefing schedules left for {briefing_type} '{cron}' ({timezone_name})")
+        return False
+    
+    results = await asyncio.gather(*[_deliver_scheduled_briefing(entry) for entry in entries], return_exceptions=True)
+    delivered = sum(1 for result in results if result is True)
+    print(f"📬 {briefing_type} briefing delivered to {delivered}/{len(entries)} channels")
+    return delivered > 0
 
-def get_style_weather_advice(condition):
-    """Get styling advice based on weather conditions"""
-    condition_lower = condition.lower()
-    if 'rain' in condition_lower:
-        return "Water-resistant pieces with protective glamour"
-    elif 'snow' in condition_lower:
-        return "Cozy luxury with winter white accents"
-    elif 'sun' in condition_lower or 'clear' in condition_lower:
-        return "Light fabrics with UV-protective accessories"
-    elif 'cloud' in condition_lower:
-        return "Versatile layers for changing conditions"
-    else:
-        return "Adaptable pieces for weather transitions"
+async def send_scheduled_briefings(briefing_type):
+    """Send every registered briefing of one type right now (used by !testam/!testnoon/!testpm)"""
+    entries = [entry for entry in briefing_schedules.values() if entry['type'] == briefing_type]
+    results = await asyncio.gather(*[_deliver_scheduled_briefing(entry) for entry in entries], return_exceptions=True)
+    return sum(1 for result in results if result is True), len(entries)
 
-def get_style_air_quality_advice(aqi_us):
-    """Get styling advice based on air quality"""
-    if aqi_us >= 4:  # Unhealthy or worse
-        return "Stylish face masks, indoor aesthetic focus, minimal outdoor fabric exposure"
-    elif aqi_us == 3:  # Unhealthy for sensitive groups
-        return "Light scarves for style & protection, breathable fabrics preferred"
-    elif aqi_us == 2:  # Moderate
-        return "Perfect for outdoor style content, all fabric choices suitable"
-    elif aqi_us == 1:  # Good
-        return "Excellent for outdoor photoshoots and fresh air styling sessions"
-    else:
-        return "Versatile styling recommended"
+async def prewarm_due_briefings():
+    """Minute tick - reload a changed registry and pre-warm groups firing within BRIEFING_PREWARM_MINUTES"""
+    if os.path.exists(BRIEFING_SCHEDULES_FILE) and os.path.getmtime(BRIEFING_SCHEDULES_FILE) != briefing_schedules_mtime:
+        print(f"🔄 {BRIEFING_SCHEDULES_FILE} changed - reloading briefing schedules")
+        load_briefing_schedules()
+        sync_briefing_jobs()
+    
+    now = datetime.now(timezone.utc)
+    due_types = set()
+    for briefing_type, cron, timezone_name in briefing_schedule_groups():
+        key = (briefing_type, cron, timezone_name)
+        trigger = CronTrigger.from_crontab(cron, timezone=pytz.timezone(timezone_name))
+        next_fire = trigger.get_next_fire_time(None, now)
+        if not next_fire or next_fire - now > timedelta(minutes=BRIEFING_PREWARM_MINUTES):
+            continue
+        if prewarmed_fire_times.get(key) == next_fire:
+            continue
+        prewarmed_fire_times[key] = next_fire
+        due_types.add(briefing_type)
+    
+    # Snapshots are per briefing type, so groups firing together are warmed once
+    for briefing_type in due_types:
+        await prewarm_briefing(briefing_type)
+    return True
 
 # ============================================================================
-# AUTOMATED SCHEDULING FUNCTIONS
+# SCHEDULER STARTUP & RUN HISTORY
 # ============================================================================
 
-async def send_automated_am():
-    """Automatically send morning briefing to specific channel"""
+def _init_job_run_table():
+    """Create the last-successful-run table next to the APScheduler job store"""
+    with sqlite3.connect(SCHEDULER_DB_PATH) as conn:
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS briefing_job_runs (
+                job_id TEXT PRIMARY KEY,
+                scheduled_run_time TEXT,
+                last_success_at TEXT
+            )"""
+        )
+
+def record_run_success(run_id, scheduled_run_time=None):
+    """Remember the last successful run of a job or briefing schedule"""
     try:
-        # Target specific channel by ID
-        target_channel_id = 1400672908610769027
-        target_channel = bot.get_channel(target_channel_id)
-        
-        if target_channel:
-            print(f"🕖 Automated morning briefing - sending to #{target_channel.name}")
-            
-            # Execute the same logic as the !am command
-            await target_channel.send("🌅 **Morning Briefing**")
-            await asyncio.sleep(1)
-            
-            # Rose's strategic overview (goes first)
-            toronto_tz = pytz.timezone('America/Toronto')
-            current_time = datetime.now(toronto_tz).strftime('%A, %B %d - %-I:%M %p')
-            
-            rose_briefing = f"📅 **Today's Calendar:**\n"
-            
-            # Today's calendar
-            if calendar_service:
-                schedule = get_today_schedule()
-                rose_briefing += f"{schedule}\n\n"
-            else:
-                rose_briefing += "Calendar service unavailable\n\n"
-            
-            # Quick email status
-            if gmail_service:
-                try:
-                    stats = get_email_stats()
-                    lines = stats.split('\n')
-                    email_summary = '\n'.join([line for line in lines if 'Total:' in line or 'Unread:' in line][:2])
-                    rose_briefing += f"📧 **Email Status:**\n{email_summary}\n\n"
-                except:
-                    rose_briefing += "📧 **Email Status:** Service unavailable\n\n"
-            
-            rose_briefing += "🎯 Ready to optimize your productivity and strategic priorities today."
-            await send_as_rose(target_channel, rose_briefing, f"Strategic Overview ({current_time})")
-            
-        else:
-            print(f"⚠️ Target channel {target_channel_id} not found for automated morning briefing")
-            
+        with sqlite3.connect(SCHEDULER_DB_PATH) as conn:
+            conn.execute(
+                """INSERT INTO briefing_job_runs (job_id, scheduled_run_time, last_success_at)
+                   VALUES (?, ?, ?)
+                   ON CONFLICT(job_id) DO UPDATE SET
+                       scheduled_run_time = excluded.scheduled_run_time,
+                       last_success_at = excluded.last_success_at""",
+                (run_id, scheduled_run_time.isoformat() if scheduled_run_time else None,
+                 datetime.now(timezone.utc).isoformat())
+            )
     except Exception as e:
-        print(f"❌ Error in automated morning briefing: {e}")
+        print(f"⚠️ Could not record run of {run_id}: {e}")
+
+def record_job_success(event):
+    """Scheduler listener - remember the last run of each job that actually delivered"""
+    # Briefing jobs report failure by returning False rather than raising
+    if event.exception or event.retval is False:
+        return
+    record_run_success(event.job_id, event.scheduled_run_time)
 
-async def send_automated_noon():
-    """Automatically send midday check-in to specific channel"""
+def get_job_run_history():
+    """Return {job_id: last_success_at} for every job that has delivered at least once"""
     try:
-        # Target specific channel by ID
-        target_channel_id = 1400674820429053992
-        target_channel = bot.get_channel(target_channel_id)
+        with sqlite3.connect(SCHEDULER_DB_PATH) as conn:
+            rows = conn.execute('SELECT job_id, last_success_at FROM briefing_job_runs').fetchall()
+        return dict(rows)
+    except sqlite3.Error:
+        return {}
+
+def briefing_job_definitions():
+    """Every scheduled job as (job_id, func, trigger, args, misfire_grace_time)"""
+    jobs = []
+    for briefing_type, cron, timezone_name in briefing_schedule_groups():
+        trigger = CronTrigger.from_crontab(cron, timezone=pytz.timezone(timezone_name))
+        jobs.append((
+            briefing_group_job_id(briefing_type, cron, timezone_name),
+            run_scheduled_briefing,
+            trigger,
+            [briefing_type, cron, timezone_name],
+            BRIEFING_MISFIRE_GRACE_SECONDS
+        ))
+    
+    # One minute tick pre-warms whichever groups are about to fire, however many there are
+    jobs.append(('prewarm_due_briefings', prewarm_due_briefings, IntervalTrigger(minutes=1), [], 30))
+    return jobs
+
+def sync_briefing_jobs():
+    """Make the scheduler's persisted jobs match the registry, touching only what changed"""
+    definitions = briefing_job_definitions()
+    wanted_ids = {job_id for job_id, _, _, _, _ in definitions}
+    added = removed = 0
+    
+    for job in scheduler.get_jobs():
+        if job.id not in wanted_ids:
+            job.remove()
+            removed += 1
+    
+    for job_id, func, trigger, args, grace in definitions:
+        existing = scheduler.get_job(job_id)
+        
+        # Keep an unchanged job as-is so its stored next_run_time (possibly missed
+        # while we were down) is honoured; only replace it if the definition changed
+        if existing and repr(existing.trigger) == repr(trigger) and existing.func == func \
+                and list(existing.args) == args and existing.misfire_grace_time == grace:
+            continue
         
-        if target_channel:
-            print(f"☀️ Automated midday briefing - sending to #{target_channel.name}")
-            
-            # Execute the same logic as the !noon command
-            toronto_tz = pytz.timezone('America/Toronto')
-            current_time = datetime.now(toronto_tz).strftime('%A, %B %d - %-I:%M %p')
-            
-            await target_channel.send(f"☀️ **Midday Check-In** ({current_time})")
-            await asyncio.sleep(1)
-            
-            # Rose's midday coordination
-            rose_midday = "👑 **Rose's Midday Coordination**\n"
-            personal_schedule = get_personal_schedule('noon')
-            rose_midday += f"{personal_schedule}\n"
-            rose_midday += "\n🌟 **Afternoon Focus:** Optimizing productivity for remaining day priorities"
-            
-            await send_as_rose(target_channel, rose_midday, "Rose's Midday Coordination")
-            
-        else:
-            print(f"⚠️ Target channel {target_channel_id} not found for automated midday briefing")
-            
-    except Exception as e:
-        print(f"❌ Error in automated midday briefing: {e}")
+        scheduler.add_job(
+            func,
+            trigger,
+            args=args,
+            id=job_id,
+            misfire_grace_time=grace,
+            replace_existing=True
+        )
+        added += 1
+    
+    print(f"⏰ Briefing jobs synced: {len(definitions)} total, {added} added/updated, {removed} removed")
 
-async def send_automated_pm():
-    """Automatically send afternoon focus to specific channel"""
+scheduler_store_attached = False
+
+def start_briefing_scheduler():
+    """Start the scheduler once and sync its persisted jobs - safe to call on every on_ready"""
+    if scheduler.running:
+        print("⏰ Scheduler already running - keeping persisted jobs")
+        return
+    
+    global scheduler_store_attached
     try:
-        # Target specific channel by ID
-        target_channel_id = 1400674903547576363
-        target_channel = bot.get_channel(target_channel_id)
+        _init_job_run_table()
+        load_briefing_schedules()
+        # A failed start is retried on the next on_ready - the store and listener are added only once
+        if not scheduler_store_attached:
+            scheduler.add_jobstore(apscheduler_sqlalchemy.SQLAlchemyJobStore(url=f'sqlite:///{SCHEDULER_DB_PATH}'), 'default')
+            scheduler.add_listener(record_job_success, EVENT_JOB_EXECUTED)
+            scheduler_store_attached = True
         
-        if target_channel:
-            print(f"🌇 Automated afternoon briefing - sending to #{target_channel.name}")
-            
-            # Execute the same logic as the !pm command
-            toronto_tz = pytz.timezone('America/Toronto')
-            current_time = datetime.now(toronto_tz).strftime('%A, %B %d - %-I:%M %p')
-            
-            await target_channel.send(f"🌇 **Afternoon Focus** ({current_time})")
-            await asyncio.sleep(1)
-            
-            # Rose's afternoon coordination
-            rose_afternoon = "👑 **Rose's Afternoon Priorities**\n"
-            personal_schedule = get_personal_schedule('afternoon')
-            rose_afternoon += f"{personal_schedule}\n"
-            rose_afternoon += "\n🎯 **Evening Prep:** Review day's progress & tomorrow setup"
-            
-            await send_as_rose(target_channel, rose_afternoon, "Rose's Afternoon Priorities")
-            
-        else:
-            print(f"⚠️ Target channel {target_channel_id} not found for automated afternoon briefing")
-            
+        # Start paused: the job store is opened, but nothing fires until jobs are synced
+        scheduler.start(paused=True)
+        sync_briefing_jobs()
+        
+        # Missed runs still inside their grace time fire once, right now
+        scheduler.resume()
+        
+        print("⏰ Automated briefings scheduled:")
+        for entry in briefing_schedules.values():
+            print(f"  • {entry['id']}: {entry['type']} '{entry['cron']}' ({entry['timezone']}) → {entry['channel_id']}")
+        print(f"  • Pre-warm: {BRIEFING_PREWARM_MINUTES} min before each briefing")
+        print(f"  • Store: {SCHEDULER_DB_PATH} (missed runs caught up within {BRIEFING_MISFIRE_GRACE_SECONDS // 60} min)")
     except Exception as e:
-        print(f"❌ Error in automated afternoon briefing: {e}")
+        print(f"⚠️ Failed to start scheduler: {e}")
 
 # ============================================================================
 # DISCORD COMMANDS (ALL PRESERVED WITH ORIGINAL VARIABLE NAMES)
@@ -3030,8 +6078,8 @@ async def status_command(ctx):
     )
     
     # Google Services
-    calendar_status = '✅' if calendar_service else '❌'
-    gmail_status = '✅' if gmail_service else '❌'
+    calendar_status = service_status_icon('calendars', calendar_service and accessible_calendars)
+    gmail_status = service_status_icon('google', gmail_service)
     embed.add_field(
         name="📅 Google Services",
         value=f"{calendar_status} Calendar Service\n{gmail_status} Gmail Service\n📊 {len(accessible_calendars)} Calendars",
@@ -3046,6 +6094,32 @@ async def status_command(ctx):
         inline=True
     )
     
+    # Automated briefings - last delivery per schedule, recorded in the persistent job store
+    run_history = get_job_run_history()
+    briefing_lines = []
+    for entry in briefing_schedules.values():
+        last_success = run_history.get(entry['id'])
+        if last_success:
+            last_dt = datetime.fromisoformat(last_success).astimezone(pytz.timezone(entry['timezone']))
+            briefing_lines.append(f"✅ {entry['id']}: {last_dt.strftime('%m/%d at %-I:%M %p')}")
+        else:
+            briefing_lines.append(f"⚪ {entry['id']}: no delivery recorded")
+    embed.add_field(
+        name=f"⏰ Automated Briefings ({'running' if scheduler.running else 'stopped'})",
+        value="\n".join(briefing_lines) or "No briefing schedules loaded",
+        inline=True
+    )
+    
+    # Mentions answered without an assistant run
+    fast_path_total = sum(fast_path_stats.values())
+    embed.add_field(
+        name=f"⚡ Fast Path ({'on' if FAST_PATH_ENABLED else 'off'})",
+        value=f"{fast_path_total} answered locally" + (
+            "\n" + ", ".join(f"{name}: {count}" for name, count in fast_path_stats.items()) if fast_path_total else ""
+        ),
+        inline=True
+    )
+    
     # Specialties
     embed.add_field(
         name="🎯 Specialties",
@@ -3126,7 +6200,12 @@ async def morning_briefing_command(ctx):
         return
     
     await ctx.send("🌅 **Morning Briefing**")
-    await asyncio.sleep(1)
+    
+    # One shared snapshot per slot - fetched concurrently, or reused from the scheduled
+    # pre-warm / another channel's !am; the posts below are only ordered, never delayed
+    async with ctx.typing():
+        snapshot = await get_briefing_snapshot('am')
+    sections = snapshot.sections
     
     # Rose's strategic overview (goes first)
     toronto_tz = pytz.timezone('America/Toronto')
@@ -3135,38 +6214,28 @@ async def morning_briefing_command(ctx):
     rose_content = f"**Morning Brief** ({current_time})\n"
     
     # Weather briefing (Rose now handles weather)
-    weather = get_weather_briefing()
-    rose_content += f"{weather}\n\n"
+    rose_content += f"{sections['weather']}\n\n"
     
     # Personal/Other calendars (Rose's primary responsibility)
-    personal_schedule = get_personal_schedule()
-    rose_content += f"{personal_schedule}\n"
+    rose_content += f"{sections['personal_schedule']}\n"
     
     # Email overview (Rose's primary responsibility)
     if gmail_service:
-        try:
-            stats = get_email_stats(1)
-            unread_count = stats.count('unread') if 'unread' in stats.lower() else 0
-            rose_content += f"\n📧 **Email Status:** {unread_count} items pending\n"
-        except:
+        stats = sections.get('mail')
+        if stats:
+            rose_content += f"\n📧 **Email Status:** {stats.unread:,} items pending\n"
+        else:
             rose_content += "\n📧 **Email:** Assessment pending\n"
     
     rose_content += "🚀 **Team reports incoming...**"
     await send_as_rose(ctx.channel, rose_content, "Rose's Morning Brief")
-    await asyncio.sleep(2)
-    
-    # Give assistant bots time to see mentions and respond with their full capabilities
-    await asyncio.sleep(3)  # Give all assistant bots time to see mentions and respond
     
     # Charlotte's comprehensive API monitoring (Rose standing in - no bot yet)
-    charlotte_brief = await get_charlotte_report()
-    await send_as_assistant_bot(ctx.channel, charlotte_brief, "Charlotte Astor")
-    await asyncio.sleep(1)
+    await send_as_assistant_bot(ctx.channel, sections['health'], "Charlotte Astor")
     
     # Alice's wellness (Rose standing in - no bot yet)
     alice_brief = get_alice_report(brief=True)
     await send_as_assistant_bot(ctx.channel, alice_brief, "Alice Fortescue")
-    await asyncio.sleep(1)
     
     # Pippa and Cressida will respond directly to their @mentions above
 
@@ -3180,20 +6249,16 @@ async def midday_briefing_command(ctx):
     current_time = datetime.now(toronto_tz).strftime('%A, %B %d - %-I:%M %p')
     
     await ctx.send(f"☀️ **Midday Check-In** ({current_time})")
-    await asyncio.sleep(1)
+    snapshot = await get_briefing_snapshot('noon')
     
     # Rose's midday coordination
     rose_midday = "👑 **Rose's Midday Coordination**\n"
-    personal_schedule = get_personal_schedule('noon')
-    rose_midday += f"{personal_schedule}\n"
+    rose_midday += f"{snapshot.sections['personal_schedule']}\n"
     
     if gmail_service:
-        try:
-            unread_emails = get_recent_emails(3, unread_only=True, include_body=False)
-            if unread_emails and len(unread_emails) > 50:
-                rose_midday += "\n📧 **Email Status:** New items require attention\n"
-        except:
-            pass
+        unread_emails = snapshot.sections.get('unread_preview')
+        if unread_emails:
+            rose_midday += "\n📧 **Email Status:** New items require attention\n"
     
     await send_as_rose(ctx.channel, rose_midday, "Rose's Midday Coordination")
     await asyncio.sleep(1)
@@ -3222,12 +6287,11 @@ async def afternoon_briefing_command(ctx):
     current_time = datetime.now(toronto_tz).strftime('%A, %B %d - %-I:%M %p')
     
     await ctx.send(f"🌇 **Afternoon Focus** ({current_time})")
-    await asyncio.sleep(1)
+    snapshot = await get_briefing_snapshot('pm')
     
     # Rose's afternoon coordination
     rose_afternoon = "👑 **Rose's Afternoon Priorities**\n"
-    personal_schedule = get_personal_schedule('afternoon')
-    rose_afternoon += f"{personal_schedule}\n"
+    rose_afternoon += f"{snapshot.sections['personal_schedule']}\n"
     rose_afternoon += "\n🎯 **Evening Prep:** Review day's progress & tomorrow setup"
     
     await send_as_rose(ctx.channel, rose_afternoon, "Rose's Afternoon Priorities")
@@ -3300,16 +6364,17 @@ async def quickbriefing_command(ctx):
     
     # Essential calendar info
     if calendar_service:
-        upcoming_events = get_upcoming_events(1)
-        event_count = len([line for line in upcoming_events.split('\n') if '•' in line])
-        quick_brief += f"📅 **Today:** {event_count} events scheduled\n"
+        try:
+            event_count = len(fetch_upcoming_events(1))
+            quick_brief += f"📅 **Today:** {event_count} events scheduled\n"
+        except:
+            quick_brief += "📅 **Today:** Calendar unavailable\n"
     
     # Essential email info  
     if gmail_service:
         try:
-            stats = get_email_stats(1)
-            unread_count = stats.count('unread') if 'unread' in stats.lower() else 0
-            quick_brief += f"📧 **Inbox:** {unread_count} unread items\n"
+            stats = fetch_email_stats(1)
+            quick_brief += f"📧 **Inbox:** {stats.unread:,} unread items\n"
         except:
             quick_brief += "📧 **Inbox:** Status unavailable\n"
     
@@ -3361,6 +6426,26 @@ async def teambriefing_command(ctx, assistant_name: str = None):
     else:
         await ctx.send(f"❌ Assistant '{assistant_name}' not found. Use `!teambriefing` to see available team members.")
 
+@bot.command(name='teamask')
+async def teamask_command(ctx, *, prompt: str = None):
+    """Ask every team assistant the same question at once"""
+    if ctx.channel.name not in ALLOWED_CHANNELS:
+        return
+    
+    if not prompt:
+        await ctx.send("👥 **Usage:** `!teamask <question>` - every team member with an assistant answers in parallel")
+        return
+    
+    names = configured_team_members()
+    if not names:
+        await ctx.send("❌ No team assistants configured")
+        return
+    
+    await ctx.send(f"👥 Asking {len(names)} team members - answers appear as they finish...")
+    posted, total = await fan_out_team_prompt(ctx.channel, prompt, names)
+    if posted < total:
+        await ctx.send(f"👥 {posted}/{total} team members answered in time")
+
 @bot.command(name='schedule')
 async def schedule_command(ctx):
     """Get today's schedule"""
@@ -3436,8 +6521,11 @@ async def emailstats_command(ctx):
     
     if gmail_service:
         async with ctx.typing():
-            stats = get_email_stats()
-            await ctx.send(stats)
+            try:
+                stats = await run_google_call(fetch_email_stats)
+                await ctx.send(embed=email_stats_embed(stats))
+            except Exception as e:
+                await ctx.send(f"❌ Error getting email stats: {str(e)}")
     else:
         await ctx.send("📧 Gmail service not available")
 
@@ -3463,11 +6551,11 @@ async def emailcount_command(ctx):
     
     if gmail_service:
         async with ctx.typing():
-            stats = get_email_stats()
-            # Extract just the count lines
-            lines = stats.split('\n')
-            count_lines = [line for line in lines if ('Unread' in line or 'Total' in line or 'Today' in line)]
-            await ctx.send('\n'.join(count_lines))
+            try:
+                stats = await run_google_call(fetch_email_stats)
+                await ctx.send(render_email_counts(stats))
+            except Exception as e:
+                await ctx.send(f"❌ Error getting email counts: {str(e)}")
     else:
         await ctx.send("📧 Gmail service not available")
 
@@ -3485,14 +6573,28 @@ async def cleansender_command(ctx, sender_email: str, count: int = 50):
         async with ctx.typing():
             count = max(1, min(count, 100))
             
+            # Resolve loose input ("hm", "H&M", a typo) to the exact sender before previewing
+            candidates = await asyncio.to_thread(resolve_sender, sender_email, 3)
+            resolved = await asyncio.to_thread(resolve_sender_address, sender_email)
+            if resolved:
+                sender_email = resolved.address
+            
             # First, show what would be deleted
-            search_result = search_emails(f"from:{sender_email}", max_results=5)
+            search_result = await run_google_call(search_emails, f"from:{sender_email}", max_results=5)
             
             embed = discord.Embed(
                 title="🗑️ Email Deletion Confirmation",
                 description=f"This will delete up to {count} emails from: **{sender_email}**",
                 color=0xff0000
             )
+            if resolved:
+                embed.add_field(name="📇 Sender", value=format_sender_entry(resolved), inline=False)
+            elif candidates:
+                embed.add_field(
+                    name="📇 Similar senders (not selected)",
+                    value="\n".join(format_sender_entry(entry) for _, entry in candidates),
+                    inline=False
+                )
             embed.add_field(
                 name="Sample emails to be deleted:",
                 value=search_result[:500] + "..." if len(search_result) > 500 else search_result,
@@ -3517,7 +6619,7 @@ async def cleansender_command(ctx, sender_email: str, count: int = 50):
                 
                 if str(reaction.emoji) == "✅":
                     # Proceed with deletion
-                    result = delete_emails_from_sender(sender_email, count)
+                    result = await run_google_call(delete_emails_from_sender, sender_email, count)
                     await ctx.send(result)
                 else:
                     await ctx.send("❌ Email deletion cancelled.")
@@ -3536,7 +6638,8 @@ async def test_am_command(ctx):
         return
     
     await ctx.send("🧪 Testing automated morning briefing function...")
-    await send_automated_am()
+    delivered, total = await send_scheduled_briefings('am')
+    await ctx.send(f"🧪 Morning briefing delivered to {delivered}/{total} scheduled channels")
 
 @bot.command(name='testnoon')
 async def test_noon_command(ctx):
@@ -3545,7 +6648,8 @@ async def test_noon_command(ctx):
         return
     
     await ctx.send("🧪 Testing automated midday briefing function...")
-    await send_automated_noon()
+    delivered, total = await send_scheduled_briefings('noon')
+    await ctx.send(f"🧪 Midday briefing delivered to {delivered}/{total} scheduled channels")
 
 @bot.command(name='testpm')
 async def test_pm_command(ctx):
@@ -3554,7 +6658,142 @@ async def test_pm_command(ctx):
         return
     
     await ctx.send("🧪 Testing automated afternoon briefing function...")
-    await send_automated_pm()
+    delivered, total = await send_scheduled_briefings('pm')
+    await ctx.send(f"🧪 Afternoon briefing delivered to {delivered}/{total} scheduled channels")
+
+@bot.command(name='briefingschedules')
+async def briefing_schedules_command(ctx):
+    """List the automated briefing schedules"""
+    if ctx.channel.name not in ALLOWED_CHANNELS:
+        return
+    
+    if not briefing_schedules:
+        await ctx.send("⏰ No briefing schedules loaded")
+        return
+    
+    run_history = get_job_run_history()
+    lines = [f"⏰ **Briefing Schedules** ({len(briefing_schedules)})"]
+    for entry in briefing_schedules.values():
+        job = scheduler.get_job(briefing_group_job_id(entry['type'], entry['cron'], entry['timezone'])) if scheduler.running else None
+        next_run = job.next_run_time.strftime('%m/%d %-I:%M %p %Z') if job and job.next_run_time else 'not scheduled'
+        last_success = run_history.get(entry['id'], 'never')[:16]
+        lines.append(
+            f"• **{entry['id']}** - {entry['type']} `{entry['cron']}` ({entry['timezone']}) → <#{entry['channel_id']}>\n"
+            f"  Sections: {', '.join(entry['sections'])} | Next: {next_run} | Last: {last_success}"
+        )
+    
+    # Split between schedules to stay under Discord's message limit
+    message = ""
+    for line in lines:
+        if message and len(message) + len(line) + 1 > 1900:
+            await ctx.send(message)
+            message = ""
+        message = f"{message}\n{line}" if message else line
+    await ctx.send(message)
+
+@bot.command(name='reloadbriefings')
+async def reload_briefings_command(ctx):
+    """Reload briefing schedules from BRIEFING_SCHEDULES_FILE"""
+    if ctx.channel.name not in ALLOWED_CHANNELS:
+        return
+    
+    load_briefing_schedules()
+    if scheduler.running:
+        sync_briefing_jobs()
+    await ctx.send(f"🔄 Reloaded {len(briefing_schedules)} briefing schedules")
+
+@bot.command(name='mailrules')
+async def mail_rules_command(ctx):
+    """List the local mail rules and how often each has matched"""
+    if ctx.channel.name not in ALLOWED_CHANNELS:
+        return
+    
+    rules = current_mail_rules()
+    if not rules:
+        await ctx.send(f"📋 No mail rules loaded (add them to `{MAIL_RULES_FILE}`)")
+        return
+    
+    lines = [f"📋 **Mail Rules** ({len(rules)})"]
+    for rule in rules:
+        actions = [name for name in ('archive', 'mark_read', 'star', 'important') if rule[name]]
+        actions += [f"+{label}" for label in rule['add_labels']] + [f"-{label}" for label in rule['remove_labels']]
+        lines.append(f"• **{rule['name']}** → {', '.join(actions)} | {mail_rule_hits.get(rule['name'], 0)} matched")
+    if mail_rules_last_run['at']:
+        lines.append(f"Last run {mail_rules_last_run['at'].strftime('%-I:%M %p')}: {mail_rules_last_run['changed']}/{mail_rules_last_run['checked']} messages changed")
+    await ctx.send("\n".join(lines))
+
+@bot.command(name='runrules')
+async def run_rules_command(ctx, days: int = 7, mode: str = ''):
+    """Apply the mail rules to indexed mail from the last N days (add 'dry' to preview)"""
+    if ctx.channel.name not in ALLOWED_CHANNELS:
+        return
+    
+    dry_run = mode.lower() in ('dry', 'dryrun', 'preview')
+    try:
+        outcome = await run_google_call(run_mail_rules_over_index, days, dry_run)
+    except Exception as e:
+        await ctx.send(f"❌ Mail rules failed: {e}")
+        return
+    if outcome is None:
+        await ctx.send("❌ Mail index not available")
+        return
+    
+    hits, checked = outcome
+    summary = ", ".join(f"{name}: {count}" for name, count in hits.items()) or "no matches"
+    prefix = "🔍 Dry run" if dry_run else "✅ Rules applied"
+    await ctx.send(f"{prefix} over {checked} messages from the last {days} days - {summary}")
+
+@bot.command(name='outbox')
+async def outbox_command(ctx, action: str = '', outbox_id: int = 0):
+    """Show queued/sent outbound mail, or '!outbox retry <id>' a failed one"""
+    if ctx.channel.name not in ALLOWED_CHANNELS:
+        return
+    
+    if action.lower() == 'retry':
+        if await asyncio.to_thread(retry_outbox_item, outbox_id):
+            await ctx.send(f"🔄 Outbox #{outbox_id} queued again")
+        else:
+            await ctx.send(f"❌ No failed outbox item #{outbox_id}")
+        return
+    
+    items = await asyncio.to_thread(get_outbox_items, 10)
+    if not items:
+        await ctx.send("📤 Outbox is empty")
+        return
+    
+    icons = {'queued': '⏳', 'sending': '📨', 'sent': '✅', 'failed': '❌'}
+    lines = ["📤 **Outbox** (latest 10)"]
+    for item in items:
+        line = f"{icons.get(item['status'], '•')} #{item['id']} {item['summary']} - {item['status']}"
+        if item['status'] != 'sent' and item['attempts']:
+            line += f" after {item['attempts']} attempt{'s' if item['attempts'] != 1 else ''}"
+        if item['status'] == 'failed' and item['last_error']:
+            line += f"\n   {item['last_error'][:120]}"
+        lines.append(line)
+    await ctx.send("\n".join(lines))
+
+@bot.command(name='context')
+async def context_command(ctx, action: str = ''):
+    """Show the size of your conversation thread, or '!context reset' to start a new one"""
+    if ctx.channel.name not in ALLOWED_CHANNELS:
+        return
+    
+    user_id = ctx.author.id
+    if action.lower() == 'reset':
+        user_conversations.pop(user_id, None)
+        await ctx.send("🧹 Conversation reset - your next message starts a fresh thread")
+        return
+    
+    thread_id = user_conversations.get(user_id)
+    if not thread_id:
+        await ctx.send("🧵 No conversation yet")
+        return
+    metadata = conversation_metadata.get(thread_id, {})
+    await ctx.send(
+        f"🧵 **Conversation context:** ~{metadata.get('tokens', 0):,} / {THREAD_TOKEN_BUDGET:,} tokens "
+        f"over {metadata.get('messages', 0)}/{THREAD_MAX_MESSAGES} messages | {metadata.get('rollovers', 0)} rollovers | "
+        f"runs read the last {THREAD_TRUNCATION_LAST_MESSAGES} messages"
+    )
 
 @bot.command(name='links')
 async def links_command(ctx):
@@ -3622,6 +6861,7 @@ async def help_command(ctx):
         "!briefing - Full detailed team reports",
         "!quickbriefing - Essential summary only",
         "!teambriefing [name] - Individual assistant reports",
+        "!teamask <question> - Ask the whole team at once",
         "!weather - Current weather & UV"
     ]
     
@@ -3635,15 +6875,21 @@ async def help_command(ctx):
         "!unread [count] - Unread only (default: 10)",
         "!emailstats - Email dashboard",
         "!emailcount - Just email counts",
-        "!cleansender <email> [count] - Delete from sender"
+        "!cleansender <email> [count] - Delete from sender",
+        "!outbox [retry <id>] - Outbound mail queue"
     ]
     
     system_commands = [
         "!status - System status",
         "!ping - Test response time",
+        "!context [reset] - Conversation thread size",
         "!testam - Test morning briefing",
         "!testnoon - Test midday briefing", 
         "!testpm - Test afternoon briefing",
+        "!briefingschedules - Automated briefing schedules",
+        "!reloadbriefings - Reload briefing schedule file",
+        "!mailrules - Local mail triage rules",
+        "!runrules [days] [dry] - Apply mail rules to recent mail",
         "!help - This message"
     ]
     
@@ -3705,6 +6951,99 @@ async def help_command(ctx):
     
     await ctx.send(embed=embed)
 
+# ============================================================================
+# STARTUP PHASES (BACKGROUND WARM-UP AFTER THE DISCORD HANDSHAKE)
+# ============================================================================
+
+# Longest a briefing waits on a still-starting Google connection
+STARTUP_WAIT_SECONDS = float(os.getenv('STARTUP_WAIT_SECONDS', '15'))
+
+# The one-shot warm-up task; on_ready fires again on every reconnect
+startup_task = None
+
+async def start_google_services():
+    """Phase: credentials + service objects, then the batched calendar probe"""
+    # connect() builds the calling thread's client, so this belongs on the Google pool too
+    ready = await run_google_call(initialize_google_services)
+    if not ready and gmail_service:
+        # A bad replacement token - keep serving with the connection we already have
+        print("⚠️ Keeping the current Google connection")
+        return
+    service_readiness['google'] = 'ready' if ready else 'unavailable'
+    if not ready:
+        service_readiness['calendars'] = 'unavailable'
+        return
+    
+    start_oauth_refresh_loop()
+    start_mail_index_sync()
+    start_outbox_worker()
+    
+    await run_google_call(test_calendar_access)
+    service_readiness['calendars'] = 'ready' if accessible_calendars else 'unavailable'
+
+async def check_weather_service():
+    """Phase: one weather fetch to confirm the API key and location work"""
+    if not WEATHER_API_KEY:
+        return
+    
+    print("🔧 Weather API Configuration Status:")
+    print(f" API Key: ✅ Configured")
+    print(f" City: ✅ {USER_CITY}")
+    if USER_LAT and USER_LON:
+        print(f" Coordinates: ✅ Precise location")
+    else:
+        print(f" Coordinates: ⚠️ Using city name")
+    
+    weather_test = await asyncio.to_thread(get_weather_briefing)
+    # Every failure path of get_weather_briefing returns a '🌤️ **Weather:** ...' notice
+    service_readiness['weather'] = 'unavailable' if weather_test.startswith('🌤️ **Weather:**') else 'ready'
+    print("=" * 50)
+    print("WEATHER BRIEFING TEST RESULT:")
+    print("=" * 50)
+    print(weather_test)
+    print("=" * 50)
+
+async def warm_openai_client():
+    """Phase: import the OpenAI SDK and build the client before the first mention needs it"""
+    await asyncio.to_thread(lambda: client.beta)
+    service_readiness['openai'] = 'ready'
+
+async def run_startup_phases():
+    """Bring external services up concurrently while the bot is already answering"""
+    started = time.perf_counter()
+    results = await asyncio.gather(start_google_services(), check_weather_service(), warm_openai_client(), return_exceptions=True)
+    # Also covers a bot that started without any token - the first reauthorization brings Google up
+    start_oauth_token_watch()
+    for phase, result in zip(('google', 'weather', 'openai'), results):
+        if isinstance(result, Exception):
+            print(f"❌ Startup phase {phase} failed: {result}")
+            service_readiness[phase] = 'unavailable'
+            if phase == 'google':
+                service_readiness['calendars'] = 'unavailable'
+    
+    print(f"📅 Calendar Service: {'✅ Ready' if calendar_service else '❌ Not available'}")
+    print(f"📧 Gmail Service: {'✅ Ready' if gmail_service else '❌ Not available'}")
+    print(f"⚡ Startup phases finished in {time.perf_counter() - started:.2f}s")
+
+async def wait_for_startup_services(timeout=STARTUP_WAIT_SECONDS):
+    """Wait (bounded) for the warm-up task - returns True once it has finished"""
+    if startup_task is None:
+        return False
+    if startup_task.done():
+        return True
+    try:
+        # shield: a caller timing out must not cancel the shared warm-up
+        await asyncio.wait_for(asyncio.shield(startup_task), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+def service_status_icon(name, available):
+    """✅ when up, ⏳ while still starting, ❌ otherwise"""
+    if available:
+        return '✅'
+    return '⏳' if service_readiness.get(name) == 'starting' else '❌'
+
 # ============================================================================
 # DISCORD EVENT HANDLERS (ALL PRESERVED)
 # ============================================================================
@@ -3714,71 +7053,19 @@ async def on_ready():
     """Bot startup sequence"""
     print(f"🚀 Starting {ASSISTANT_NAME}...")
     
-    # Weather API test
-    if WEATHER_API_KEY:
-        print("🔧 Weather API Configuration Status:")
-        print(f" API Key: ✅ Configured")
-        print(f" City: ✅ {USER_CITY}")
-        if USER_LAT and USER_LON:
-            print(f" Coordinates: ✅ Precise location")
-        else:
-            print(f" Coordinates: ⚠️ Using city name")
-        
-        print("🧪 Testing weather integration...")
-        weather_test = get_weather_briefing()
-        print("🧪 Testing WeatherAPI.com integration...")
-        print(f"🔑 API Key configured: ✅ Yes")
-        print(f"📍 Location: {USER_CITY}")
-        print("=" * 50)
-        print("WEATHER BRIEFING TEST RESULT:")
-        print("=" * 50)
-        print(weather_test)
-        print("=" * 50)
-    
-    # Initialize Google services
-    initialize_google_services()
+    # Google, calendar probes and the weather check run in the background;
+    # start it once, not again on every gateway reconnect
+    global startup_task
+    if startup_task is None:
+        startup_task = asyncio.create_task(run_startup_phases())
     
-    # Initialize scheduler for automated tasks
-    try:
-        # Schedule daily morning briefing at 7:15 AM Toronto time
-        scheduler.add_job(
-            send_automated_am,
-            CronTrigger(hour=7, minute=15, timezone=pytz.timezone('America/Toronto')),
-            id='daily_morning_briefing',
-            replace_existing=True
-        )
-        
-        # Schedule daily midday check-in at 12:00 PM Toronto time
-        scheduler.add_job(
-            send_automated_noon,
-            CronTrigger(hour=12, minute=0, timezone=pytz.timezone('America/Toronto')),
-            id='daily_midday_briefing',
-            replace_existing=True
-        )
-        
-        # Schedule daily afternoon focus at 3:00 PM Toronto time
-        scheduler.add_job(
-            send_automated_pm,
-            CronTrigger(hour=15, minute=0, timezone=pytz.timezone('America/Toronto')),
-            id='daily_afternoon_briefing',
-            replace_existing=True
-        )
-        
-        scheduler.start()
-        print("⏰ Automated briefings scheduled:")
-        print("  • Morning: 7:15 AM Toronto time")
-        print("  • Midday: 12:00 PM Toronto time")
-        print("  • Afternoon: 3:00 PM Toronto time")
-    except Exception as e:
-        print(f"⚠️ Failed to start scheduler: {e}")
+    # Initialize scheduler for automated tasks (safe to call again on reconnect)
+    start_briefing_scheduler()
     
     # Final status
-    print(f"📅 Calendar Service: {'✅ Ready' if calendar_service else '❌ Not available'}")
-    print(f"📧 Gmail Service: {'✅ Ready' if gmail_service else '❌ Not available'}")
     print(f"✅ {ASSISTANT_NAME} is online!")
     print(f"🤖 Connected as {bot.user.name}#{bot.user.discriminator} (ID: {bot.user.id})")
-    print(f"📅 Calendar Status: {'✅ Integrated' if calendar_service else '❌ Disabled'}")
-    print(f"🌤️ Weather Status: {'✅ Configured' if WEATHER_API_KEY else '❌ Disabled'}")
+    print(f"🔧 Services: {', '.join(f'{name} {state}' for name, state in service_readiness.items())}")
     print(f"🔍 Planning Search: {'✅ Available' if BRAVE_API_KEY else '⚠️ Limited'}")
     print(f"🎯 Allowed Channels: {', '.join(ALLOWED_CHANNELS)}")
 
@@ -3815,8 +7102,11 @@ async def on_message(message):
             
             # Show typing indicator
             async with message.channel.typing():
-                # Handle AI conversation
-                response = await handle_ai_conversation(message, user_id, message.channel.id)
+                # Simple lookups are answered directly; everything else gets an assistant run
+                response = await route_fast_path(message.content)
+                fast_path = response is not None
+                if not fast_path:
+                    response = await handle_ai_conversation(message, user_id, message.channel.id)
                 
                 # Split long responses
                 if len(response) > 2000:
@@ -3828,6 +7118,10 @@ async def on_message(message):
                             await message.channel.send(chunk)
                 else:
                     await message.reply(response)
+                
+                # Answered without a run - the thread still needs the exchange for follow-ups
+                if fast_path:
+                    await asyncio.to_thread(record_fast_path_exchange, user_id, message.channel.id, message.content, response)
         
         except Exception as e:
             print(f"❌ Message handling error: {e}")
@@ -3854,7 +7148,6 @@ async def on_command_error(ctx, error):
 # ============================================================================
 
 if __name__ == "__main__":
-    import time
     bot_start_time = time.time()  # Track bot start time for uptime monitoring
     
     try:
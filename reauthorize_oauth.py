@@ -2,10 +2,21 @@
 """
 OAuth2 Re-authorization Script for Gmail + Calendar
 This script will generate a new OAuth token with Calendar permissions
+
+Modes:
+  python3 reauthorize_oauth.py                  # browser on this machine
+  python3 reauthorize_oauth.py --console        # headless: open the URL anywhere, paste the redirect back
+  python3 reauthorize_oauth.py --print-url      # headless, step 1 of 2 (no prompts)
+  python3 reauthorize_oauth.py --auth-response URL   # headless, step 2 of 2
+  python3 reauthorize_oauth.py --validate       # check an existing token's scopes and refresh
+
+A running bot watches the token file and picks up the new token without a restart.
 """
 
 import os
+import sys
 import json
+import argparse
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -14,7 +25,7 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Scopes that include both Gmail and Calendar
+# Scopes that include both Gmail and Calendar (must match GMAIL_SCOPES in main.py)
 SCOPES = [
     'https://www.googleapis.com/auth/gmail.readonly',
     'https://www.googleapis.com/auth/gmail.send',
@@ -22,8 +33,13 @@ SCOPES = [
     'https://www.googleapis.com/auth/calendar'
 ]
 
-def reauthorize_oauth():
-    """Re-authorize OAuth with Calendar scope"""
+DEFAULT_TOKEN_FILE = os.getenv('GMAIL_TOKEN_FILE', 'gmail_token.json')
+
+# Headless redirect target - nothing needs to listen there, the user copies the URL back
+CONSOLE_REDIRECT_URI = 'http://localhost:8765/'
+
+def load_client_config():
+    """OAuth client config from GMAIL_OAUTH_JSON or a client_secret_*.json file"""
     
     # Try to get OAuth client config from environment first
     oauth_json = os.getenv('GMAIL_OAUTH_JSON')
@@ -33,7 +49,7 @@ def reauthorize_oauth():
         try:
             client_config = json.loads(oauth_json)
             print("✅ Using OAuth config from environment variable")
-        except:
+        except json.JSONDecodeError:
             print("❌ Failed to parse GMAIL_OAUTH_JSON environment variable")
     
     # If not in environment, try to find the OAuth client file
@@ -51,59 +67,210 @@ def reauthorize_oauth():
         else:
             print("❌ No OAuth client configuration found")
             print("Need either GMAIL_OAUTH_JSON environment variable or client_secret_*.json file")
-            return False
+    
+    return client_config
+
+def write_token_atomically(creds, token_file):
+    """Replace the token file in one step - a watching bot never reads half a token"""
+    temp_file = f"{token_file}.{os.getpid()}.tmp"
+    fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as token:
+        token.write(creds.to_json())
+        token.flush()
+        os.fsync(token.fileno())
+    os.replace(temp_file, token_file)
+
+def missing_scopes(granted):
+    """Required scopes the token was not granted"""
+    return [scope for scope in SCOPES if scope not in set(granted or [])]
+
+def validate_token(token_file):
+    """Check a saved token covers SCOPES and can still be refreshed"""
+    if not os.path.exists(token_file):
+        print(f"❌ {token_file} not found")
+        return False
+    
+    try:
+        with open(token_file, 'r') as f:
+            token_info = json.load(f)
+        creds = Credentials.from_authorized_user_info(token_info)
+    except Exception as e:
+        print(f"❌ {token_file} is not a valid OAuth token: {e}")
+        return False
+    
+    missing = missing_scopes(token_info.get('scopes'))
+    if missing:
+        print("❌ Token is missing required scopes:")
+        for scope in missing:
+            print(f"   • {scope}")
+        return False
+    
+    if not creds.refresh_token:
+        print("❌ Token has no refresh token - it will stop working when it expires")
+        return False
+    
+    try:
+        creds.refresh(Request())
+    except Exception as e:
+        print(f"❌ Token refresh failed: {e}")
+        return False
+    
+    print(f"✅ {token_file} is valid for all {len(SCOPES)} scopes (refreshed, expires {creds.expiry} UTC)")
+    return True
+
+def save_new_token(creds, token_file):
+    """Validate the freshly granted scopes, then save the token"""
+    missing = missing_scopes(creds.granted_scopes or creds.scopes)
+    if missing:
+        print("❌ Authorization did not grant every required scope - token NOT saved:")
+        for scope in missing:
+            print(f"   • {scope}")
+        return False
+    
+    # Save the credentials to the token file
+    write_token_atomically(creds, token_file)
+    
+    print(f"✅ OAuth2 re-authorization successful!")
+    print(f"📁 New token saved to: {token_file}")
+    print("🔄 A running bot watching this file reloads it automatically")
+    
+    # Show the token info for verification
+    token_info = json.loads(creds.to_json())
+    print(f"\n📋 Token includes scopes:")
+    for scope in token_info.get('scopes', []):
+        print(f"   • {scope}")
+    
+    return True
+
+def pending_file_for(token_file):
+    """Where --print-url keeps the state --auth-response needs"""
+    return f"{token_file}.pending"
+
+def console_flow(client_config, state=None):
+    """Flow whose redirect lands on localhost - the user pastes the resulting URL back"""
+    flow = InstalledAppFlow.from_client_config(client_config, SCOPES, state=state)
+    flow.redirect_uri = CONSOLE_REDIRECT_URI
+    # PKCE - the code in the pasted URL is useless without the verifier kept in the pending file
+    flow.autogenerate_code_verifier = True
+    return flow
+
+def print_authorization_url(client_config, token_file):
+    """Headless step 1: print the consent URL and remember the flow state"""
+    flow = console_flow(client_config)
+    auth_url, state = flow.authorization_url(access_type='offline', prompt='consent')
+    
+    fd = os.open(pending_file_for(token_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump({'state': state, 'code_verifier': flow.code_verifier}, f)
+    
+    print("🔗 Open this URL in any browser and approve access:\n")
+    print(auth_url)
+    print(f"\nThe browser then fails to load {CONSOLE_REDIRECT_URI} - that's expected.")
+    print("Copy the full URL from the address bar and run:")
+    print(f"   python3 reauthorize_oauth.py --auth-response '<URL>' --token-file {token_file}")
+    return auth_url
+
+def complete_authorization(client_config, token_file, auth_response):
+    """Headless step 2: exchange the pasted redirect URL for a token"""
+    pending_file = pending_file_for(token_file)
+    try:
+        with open(pending_file, 'r') as f:
+            pending = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        print(f"❌ No pending authorization - run with --print-url first")
+        return None
+    
+    flow = console_flow(client_config, state=pending['state'])
+    flow.code_verifier = pending['code_verifier']
+    
+    # The redirect is plain http://localhost - oauthlib only allows that when told to
+    os.environ.setdefault('OAUTHLIB_INSECURE_TRANSPORT', '1')
+    flow.fetch_token(authorization_response=auth_response.strip())
+    os.remove(pending_file)
+    return flow.credentials
+
+def reauthorize_oauth(token_file=DEFAULT_TOKEN_FILE, console=False):
+    """Re-authorize OAuth with Calendar scope"""
+    
+    client_config = load_client_config()
+    if not client_config:
+        return False
     
     try:
         
         print("🔧 Starting OAuth2 re-authorization...")
         print(f"📋 Scopes: {SCOPES}")
         
-        # Run the OAuth flow
-        flow = InstalledAppFlow.from_client_config(
-            client_config, SCOPES)
-        
-        # This will open a browser window for authorization
-        creds = flow.run_local_server(port=0)
-        
-        # Save the credentials to gmail_token.json
-        token_file = 'gmail_token.json'
-        with open(token_file, 'w') as token:
-            token.write(creds.to_json())
-        
-        print(f"✅ OAuth2 re-authorization successful!")
-        print(f"📁 New token saved to: {token_file}")
-        print("🔄 You can now restart your Discord bot")
-        
-        # Show the token info for verification
-        token_info = json.loads(creds.to_json())
-        print(f"\n📋 Token includes scopes:")
-        for scope in token_info.get('scopes', []):
-            print(f"   • {scope}")
-        
-        return True
+        if console:
+            print_authorization_url(client_config, token_file)
+            auth_response = input("\n📋 Paste the redirected URL here: ")
+            creds = complete_authorization(client_config, token_file, auth_response)
+            if not creds:
+                return False
+        else:
+            # Run the OAuth flow
+            flow = InstalledAppFlow.from_client_config(
+                client_config, SCOPES)
+            
+            # This will open a browser window for authorization
+            creds = flow.run_local_server(port=0)
         
+        return save_new_token(creds, token_file)
+    
     except Exception as e:
         print(f"❌ Error during re-authorization: {e}")
         return False
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Re-authorize the Gmail + Calendar OAuth token")
+    parser.add_argument('--token-file', default=DEFAULT_TOKEN_FILE, help="token file to write (default: GMAIL_TOKEN_FILE or gmail_token.json)")
+    parser.add_argument('--console', action='store_true', help="headless flow: print the URL, paste the redirect back")
+    parser.add_argument('--print-url', action='store_true', help="headless step 1: print the URL and exit (no prompts)")
+    parser.add_argument('--auth-response', metavar='URL', help="headless step 2: the redirected URL from --print-url")
+    parser.add_argument('--validate', action='store_true', help="only check the existing token's scopes and refresh")
+    parser.add_argument('-y', '--yes', action='store_true', help="replace an existing token without asking")
+    return parser.parse_args()
+
 if __name__ == '__main__':
+    args = parse_args()
+    
     print("🚀 Gmail + Calendar OAuth2 Re-authorization")
     print("=" * 50)
     
+    if args.validate:
+        sys.exit(0 if validate_token(args.token_file) else 1)
+    
+    if args.print_url:
+        client_config = load_client_config()
+        if not client_config:
+            sys.exit(1)
+        print_authorization_url(client_config, args.token_file)
+        sys.exit(0)
+    
     # Check if token file exists
-    if os.path.exists('gmail_token.json'):
-        response = input("📄 gmail_token.json exists. Replace it? (y/N): ")
+    if os.path.exists(args.token_file) and not args.yes and not args.auth_response:
+        response = input(f"📄 {args.token_file} exists. Replace it? (y/N): ")
         if response.lower() != 'y':
             print("❌ Re-authorization cancelled")
             exit(0)
     
-    success = reauthorize_oauth()
+    if args.auth_response:
+        client_config = load_client_config()
+        try:
+            creds = complete_authorization(client_config, args.token_file, args.auth_response) if client_config else None
+            success = bool(creds) and save_new_token(creds, args.token_file)
+        except Exception as e:
+            print(f"❌ Error during re-authorization: {e}")
+            success = False
+    else:
+        success = reauthorize_oauth(args.token_file, console=args.console)
     
     if success:
         print("\n🎉 Re-authorization complete!")
         print("Next steps:")
-        print("1. Restart your Discord bot")
+        print("1. A running bot reloads the token within a few seconds (or restart it)")
         print("2. Try creating a calendar event")
     else:
         print("\n❌ Re-authorization failed")
-        print("Check your GMAIL_OAUTH_JSON environment variable")
\ No newline at end of file
+        print("Check your GMAIL_OAUTH_JSON environment variable")
+        sys.exit(1)
@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for name in ('DISCORD_TOKEN', 'OPENAI_API_KEY', 'ROSE_ASSISTANT_ID'):
+    os.environ.setdefault(name, 'test')
+
+import main
+
+# (message, intent it must route to)
+MUST_ROUTE = [
+    ("what's the weather", 'weather'),
+    ("weather today", 'weather'),
+    ("do I need an umbrella?", 'weather'),
+    ("what’s the forecast", 'weather'),
+    ("check my unread emails", 'unread_emails'),
+    ("any unread mail", 'unread_emails'),
+    ("what's unread in my inbox", 'unread_emails'),
+    ("check my email", 'recent_emails'),
+    ("show my latest emails", 'recent_emails'),
+    ("anything new in my inbox", 'recent_emails'),
+    ("what's coming up this week", 'upcoming_events'),
+    ("upcoming events", 'upcoming_events'),
+    ("what's on my calendar this week", 'upcoming_events'),
+    ("what's my schedule today", 'today_schedule'),
+    ("<@123> Hey Rose, what's on my calendar today?", 'today_schedule'),
+    ("today's agenda", 'today_schedule'),
+    ("any meetings today", 'today_schedule'),
+]
+
+# Messages the helpers can't answer faithfully - these must reach the assistant
+MUST_NOT_ROUTE = [
+    "what emails did I get yesterday",
+    "what is in my inbox for the amazon order",
+    "get me the last email's attachments",
+    "what's the weather in paris tomorrow",
+    "what's the weather in paris",
+    "what meetings do I have next week",
+    "what's on my calendar friday",
+    "how many unread emails do I have",
+    "check my email from bob",
+    "any emails about the invoice",
+    "delete my unread emails",
+    "reply to the second one",
+    "should I bring an umbrella",
+    "schedule a meeting today",
+    "what's my schedule today and can you move the dentist",
+]
+
+
+class FastPathClassificationTest(unittest.TestCase):
+    def setUp(self):
+        # Pattern matching only - no embedding model in tests
+        self._embedding_intent = main._embedding_intent
+        main._embedding_intent = lambda text: (None, 0.0)
+
+    def tearDown(self):
+        main._embedding_intent = self._embedding_intent
+
+    def classify(self, message):
+        intent, _ = main.classify_fast_path(main.normalize_mention_text(message))
+        return intent.name if intent else None
+
+    def test_must_route(self):
+        for message, expected in MUST_ROUTE:
+            with self.subTest(message=message):
+                self.assertEqual(self.classify(message), expected)
+
+    def test_must_not_route(self):
+        for message in MUST_NOT_ROUTE:
+            with self.subTest(message=message):
+                self.assertIsNone(self.classify(message))
+
+
+if __name__ == '__main__':
+    unittest.main()